@@ -0,0 +1,206 @@
+#
+# backend.py
+#
+# Description:
+# Where the GUI's data-backed actions are answered: `LocalBackend` reads the data files
+# in this process, `DatabaseBackend` queries a SQLite import of them and `RemoteBackend`
+# asks a shared `server.py` instance over HTTP. All expose the same methods and raise
+# ValueError with the messages the screens show, so the screens do not know which one
+# they use. TOOLKIT_SERVER selects the remote one, TOOLKIT_DATABASE the SQLite one.
+#
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from typing import Iterable
+
+import functions
+from datastore import DataStore
+from functions import BatchOrder
+from lazy import lazy_import
+from sqlstore import SQLiteStore
+from watcher import SourceWatcher
+
+pd = lazy_import("pandas")
+
+SERVER_ENV_VAR = "TOOLKIT_SERVER"
+DATABASE_ENV_VAR = "TOOLKIT_DATABASE"
+
+
+class LocalBackend:
+    """
+    Answers queries from a DataStore in this process, following its files for changes.
+
+    Attributes:
+        store (DataStore): The data source.
+        watcher (SourceWatcher): Keeps the store in step with its files once started.
+    """
+    def __init__(self, store: DataStore | None = None):
+        """
+        Args:
+            store (DataStore, optional): The data source. Defaults to the shared store.
+        """
+        self.store = store or functions.get_default_store()
+        self.watcher = SourceWatcher(self.store)
+
+    def start(self) -> threading.Thread | None:
+        """
+        Loads the datasets in the background and starts watching their files.
+
+        Returns:
+            threading.Thread | None: The loading thread.
+        """
+        thread = self.store.warm()
+        self.watcher.start()
+        return thread
+
+    def stop(self) -> None:
+        """Stops watching the data files."""
+        self.watcher.stop()
+
+    def auto_work_log_sequences(self, os_number: str, plan_type: str = "") -> list[int]:
+        return functions.auto_work_log_sequences(os_number, plan_type, self.store)
+
+    def write_batch_work_logs(self, orders: Iterable[BatchOrder], output_path: str) -> tuple[int, list]:
+        return functions.write_batch_work_logs(orders, output_path, self.store)
+
+    def get_equipment_items(self, fleet: int) -> pd.DataFrame:
+        return functions.get_equipment_items(fleet, self.store)
+
+
+class DatabaseBackend:
+    """
+    Answers queries from a SQLite file written by `functions.import_database`.
+
+    Nothing is loaded up front: each query reads its rows from the file, which keeps the
+    process small. The file is only opened by the first query, so a missing one is
+    reported like a missing data file.
+
+    Attributes:
+        path (str): The database file.
+    """
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): The database file.
+        """
+        self.path = path
+        self._store: SQLiteStore | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def store(self) -> SQLiteStore:
+        with self._lock:
+            if self._store is None:
+                self._store = SQLiteStore(self.path)
+            return self._store
+
+    def start(self) -> threading.Thread | None:
+        """The data is read from the file per query; there is nothing to load here."""
+        return None
+
+    def stop(self) -> None:
+        pass
+
+    def auto_work_log_sequences(self, os_number: str, plan_type: str = "") -> list[int]:
+        return functions.auto_work_log_sequences(os_number, plan_type, self.store)
+
+    def write_batch_work_logs(self, orders: Iterable[BatchOrder], output_path: str) -> tuple[int, list]:
+        return functions.write_batch_work_logs(orders, output_path, self.store)
+
+    def get_equipment_items(self, fleet: int) -> pd.DataFrame:
+        return functions.get_equipment_items(fleet, self.store)
+
+
+class RemoteBackend:
+    """
+    Answers queries through a toolkit server (see server.py).
+
+    Attributes:
+        url (str): The server's base URL, e.g. "http://10.0.0.5:8765".
+        timeout (float): Seconds to wait for each response.
+    """
+    def __init__(self, url: str, timeout: float = 60.0):
+        """
+        Args:
+            url (str): The server's base URL.
+            timeout (float, optional): Seconds to wait for each response. Defaults to 60.
+        """
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _post(self, path: str, payload: dict) -> dict:
+        request = urllib.request.Request(
+            self.url + path, data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"}, method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.load(response)
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.load(e).get("error") or str(e)
+            except ValueError:
+                message = str(e)
+            raise ValueError(message) from None
+        except (urllib.error.URLError, OSError) as e:
+            raise ValueError(f"Servidor {self.url} indisponível: {getattr(e, 'reason', e)}") from None
+
+    def start(self) -> threading.Thread | None:
+        """The server holds the data; there is nothing to load here."""
+        return None
+
+    def stop(self) -> None:
+        pass
+
+    def auto_work_log_sequences(self, os_number: str, plan_type: str = "") -> list[int]:
+        return self._post("/sequences", {"os_number": os_number, "plan_type": plan_type})["sequences"]
+
+    def write_batch_work_logs(self, orders: Iterable[BatchOrder], output_path: str) -> tuple[int, list]:
+        orders = list(orders)
+        # Rows that failed to parse are reported here; only the others are sent.
+        results = iter(self._post("/batch_work_logs", {"orders": [
+            {"os_number": o.os_number, "date": o.date, "start": o.starting_time, "end": o.ending_time,
+             "plan_type": o.plan_type}
+            for o in orders if not o.error
+        ]})["results"])
+
+        written = 0
+        errors = []
+        with open(output_path, "w", encoding="utf-8", newline="") as output:
+            for order in orders:
+                result = {"logs": "", "error": order.error} if order.error else next(results)
+                if result["error"]:
+                    errors.append((order, result["error"]))
+                else:
+                    output.write(result["logs"])
+                    written += 1
+        return written, errors
+
+    def get_equipment_items(self, fleet: int) -> pd.DataFrame:
+        table = self._post("/equipment_items", {"fleet": fleet})
+        return pd.DataFrame(table["rows"], columns=table["columns"])
+
+
+def get_backend(url: str | None = None, database: str | None = None) -> LocalBackend | DatabaseBackend | RemoteBackend:
+    """
+    Returns the remote backend when a server URL is given (or set in TOOLKIT_SERVER),
+    the SQLite one when a database file is given (or set in TOOLKIT_DATABASE), and the
+    local one otherwise.
+
+    Args:
+        url (str, optional): The server's base URL. Defaults to `$TOOLKIT_SERVER`.
+        database (str, optional): The SQLite file. Defaults to `$TOOLKIT_DATABASE`.
+
+    Returns:
+        LocalBackend | DatabaseBackend | RemoteBackend: The backend.
+    """
+    url = url or os.environ.get(SERVER_ENV_VAR)
+    if url:
+        return RemoteBackend(url)
+    database = database or os.environ.get(DATABASE_ENV_VAR)
+    return DatabaseBackend(database) if database else LocalBackend()
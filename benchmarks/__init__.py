@@ -0,0 +1 @@
+# Performance benchmarks for the Apprentice Toolkit. Run each module with `python -m`.
@@ -0,0 +1,65 @@
+#
+# bench_classify_files.py
+#
+# Description:
+# Times `write_task_classification` over a folder of synthetic per-OS task exports (see
+# generators.make_pasted_tasks) with an increasing number of worker processes, and checks
+# that every worker count writes the same output. The speedup is relative to one worker;
+# it can only approach the worker count on a machine with that many free cores.
+#
+# Usage:
+#     python -m benchmarks.bench_classify_files [--files 2000] [--tasks 120] [--workers 1 2 4 8]
+#
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks import generators
+from functions import write_task_classification
+
+
+def write_task_files(directory: str, files: int, tasks: int) -> None:
+    """Writes `files` task exports named after consecutive service orders."""
+    for number in range(files):
+        path = os.path.join(directory, f"OS_{62100000 + number}.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(generators.make_pasted_tasks(tasks, seed=number))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark bulk classification of task files per worker count.")
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--tasks", type=int, default=120, help="task rows per file")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="bench_classify_")
+    try:
+        source = os.path.join(directory, "exports")
+        os.mkdir(source)
+        write_task_files(source, args.files, args.tasks)
+        print(f"{args.files} files x {args.tasks} tasks, {os.cpu_count()} CPUs")
+        print(f"{'workers':>8} {'seconds':>9} {'files/s':>9} {'speedup':>8}")
+
+        baseline = reference = None
+        for workers in args.workers:
+            output = os.path.join(directory, f"classes_{workers}.tsv")
+            start = time.perf_counter()
+            write_task_classification([source], output, workers)
+            elapsed = time.perf_counter() - start
+
+            with open(output, encoding="utf-8") as file:
+                content = file.read()
+            assert reference is None or content == reference, f"output differs with {workers} workers"
+            reference = content
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>9.3f} {args.files / elapsed:>9,.0f} {baseline / elapsed:>7.2f}x")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#
+# bench_process_text.py
+#
+# Description:
+# Shows that `join_text` scales linearly with the input size (constant ns/char), next to
+# the former character-by-character implementation of `process_text`, whose `+=` growth
+# depends on CPython's in-place resize optimization and degrades without it.
+#
+# Usage:
+#     python -m benchmarks.bench_process_text [--sizes 100000 1000000 4000000]
+#
+
+import argparse
+import random
+import time
+
+from functions import join_text
+
+
+def legacy_process_text(text: str, separator: str, space_choice: bool) -> str:
+    """The former `process_text` loop, kept only as a baseline for this benchmark."""
+    text = text.strip()
+    new_text = ""
+    last_is_space = False
+    for line in text.split("\n"):
+        line = line.strip()
+        for char in line:
+            if char == " " and not space_choice:
+                if not last_is_space:
+                    new_text += separator
+                    last_is_space = True
+            else:
+                new_text += char
+                last_is_space = False
+        new_text += separator
+    if new_text.endswith(separator):
+        new_text = new_text[: -len(separator)]
+    return new_text
+
+
+def make_text(size: int, seed: int = 0) -> str:
+    """Builds an equipment-list-like text of roughly `size` characters."""
+    rng = random.Random(seed)
+    words = ["TRATOR", "COLHEDORA 8800", "CAMINHÃO  PIPA", "62112345", "", "Frota 1024", "Pneu 18.4-34"]
+    parts = []
+    length = 0
+    while length < size:
+        word = rng.choice(words)
+        parts.append(word)
+        length += len(word) + 1
+    return "\n".join(parts)
+
+
+def best_of(func, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark join_text against the legacy process_text loop.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 500_000, 1_000_000, 4_000_000])
+    parser.add_argument("--legacy-limit", type=int, default=1_000_000,
+                        help="largest size for which the legacy loop is also timed")
+    args = parser.parse_args()
+
+    print(f"{'chars':>10} {'join_text s':>12} {'ns/char':>8} {'legacy s':>10} {'ns/char':>8}")
+    for size in args.sizes:
+        text = make_text(size)
+        lines = text.split("\n")
+        new = best_of(lambda: join_text(lines, ", ", False))
+        row = f"{len(text):>10} {new:>12.4f} {new / len(text) * 1e9:>8.1f}"
+        if size <= args.legacy_limit:
+            assert legacy_process_text(text, ", ", False) == join_text(lines, ", ", False)
+            old = best_of(lambda: legacy_process_text(text, ", ", False), repeat=1)
+            row += f" {old:>10.4f} {old / len(text) * 1e9:>8.1f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
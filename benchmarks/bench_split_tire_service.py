@@ -0,0 +1,118 @@
+#
+# bench_split_tire_service.py
+#
+# Description:
+# Times `split_tire_service` on large pasted task lists against the former implementation,
+# which ran eight separate `str.contains` passes over the descriptions and combined the
+# masks, and checks that both return exactly the same sequences. "cold" clears the shared
+# classification cache before each run; "warm" repeats the call with the cache filled.
+#
+# Usage:
+#     python -m benchmarks.bench_split_tire_service [--rows 100000 250000]
+#
+
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from functions import _normalize_and_rename_df, split_tire_service
+from tire_rules import _classification_cache
+
+
+def legacy_split_tire_service(df: pd.DataFrame) -> tuple[list[int], list[int]]:
+    """The former mask-based `split_tire_service`, kept only as a baseline for this benchmark."""
+    norm_df = _normalize_and_rename_df(df)
+    if norm_df.empty:
+        return [], []
+
+    description = norm_df['description']
+    is_pending = norm_df['status'].str.strip() == 'N'
+    is_tire_component = norm_df['component'].str.strip().isin(['Roda', 'Pneu'])
+    rule_borracharia = description.str.contains('borracharia', case=False, na=False)
+    rule_specific_integrity = description.str.contains(r'verificar a integridade \(trincas', case=False, na=False)
+    rule_pneu_keywords = description.str.contains(
+        r'pneus|pneu|verificar torque das porcas das rodas', case=False, na=False
+    )
+    is_pneumatic_system = description.str.contains('pneum', case=False, na=False)
+    exclusion_keywords = [
+        "suspensões", "Sistema de freio", "Verificar guias",
+        "Verificar porca e parafuso das rodas", "Quando houver espaçador, retirar rodas"
+    ]
+    rule_general_exclusions = description.str.contains('|'.join(exclusion_keywords), case=False, na=False)
+    rule_generic_integrity_exclusion = description.str.contains(
+        "Verificar a integridade", case=False, na=False
+    ) & ~rule_specific_integrity
+
+    is_tire_service = rule_borracharia | (is_tire_component & (rule_specific_integrity | rule_pneu_keywords))
+    is_tire_by_default = is_tire_component & ~rule_general_exclusions & ~rule_generic_integrity_exclusion
+    final_tire_mask = is_pending & (is_tire_service | is_tire_by_default) & ~is_pneumatic_system
+
+    return (
+        norm_df[final_tire_mask]['index'].tolist(),
+        norm_df[is_pending & ~final_tire_mask]['index'].tolist(),
+    )
+
+
+DESCRIPTIONS = [
+    "Verificar a integridade (trincas, desgastes acentuados, danos críticos) dos espelhos da roda",
+    "Verificar torque das porcas das rodas",
+    "Calibrar pneus conforme especificação",
+    "Verificar sistema pneumático de freio",
+    "Serviço de borracharia",
+    "Verificar a integridade das suspensões",
+    "Verificar guias",
+    "Quando houver espaçador, retirar rodas",
+    "Trocar óleo do motor",
+    "Lubrificar pinos e buchas",
+]
+COMPONENTS = ["Roda", "Pneu", "Motor", "Freio", "Chassi", "Transmissão"]
+
+
+def make_tasks(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Builds a task list shaped like `_parse_interval` reads it from the external software."""
+    rng = random.Random(seed)
+    df = pd.DataFrame({
+        0: [rng.choice("NNNS") for _ in range(rows)],
+        **{col: "x" for col in range(1, 6)},
+        6: [rng.choice(DESCRIPTIONS) + f" {rng.randrange(100)}" for _ in range(rows)],
+        **{col: "x" for col in range(7, 10)},
+        10: [rng.choice(COMPONENTS) for _ in range(rows)],
+    })
+    df = df.reset_index()
+    df["index"] = df["index"] + 1
+    return df
+
+
+def best_of(func, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark split_tire_service against the legacy mask passes.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 250_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'cold s':>10} {'warm s':>10} {'legacy s':>10} {'speedup':>8}")
+    for rows in args.rows:
+        df = make_tasks(rows)
+        assert split_tire_service(df) == legacy_split_tire_service(df)
+
+        def cold():
+            _classification_cache.clear()
+            split_tire_service(df)
+
+        cold_time = best_of(cold)
+        warm_time = best_of(lambda: split_tire_service(df))
+        old = best_of(lambda: legacy_split_tire_service(df))
+        print(f"{rows:>10} {cold_time:>10.4f} {warm_time:>10.4f} {old:>10.4f} {old / cold_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
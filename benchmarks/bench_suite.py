@@ -0,0 +1,327 @@
+#
+# bench_suite.py
+#
+# Description:
+# End-to-end benchmark of the data-backed features on synthetic data (see generators.py):
+# loading the sources, service order lookups, plan fetching, the tire-service splits,
+# work log generation, order search, the fleet filters query, and the same queries
+# against a SQLite import of the data. Each step reports its
+# best wall time, throughput and peak traced memory, and the run can be saved as a JSON
+# baseline and compared against later runs.
+#
+# Usage:
+#     python -m benchmarks.bench_suite [--rows 100000] [--data-dir DIR] [--repeat 3]
+#     python -m benchmarks.bench_suite --save-baseline baseline.json
+#     python -m benchmarks.bench_suite --baseline baseline.json [--threshold 1.25]
+#
+# The report is also written to bench_output.txt. With --baseline, the exit code is 1
+# when a step got slower than the threshold allows.
+#
+
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, NamedTuple
+
+import pandas as pd
+
+import functions
+from benchmarks import generators
+from datastore import DEFAULT_LOADERS, WORKBOOK_FILE, DataStore
+from sqlstore import DATABASE_FILE, SQLiteStore
+from tire_rules import _classification_cache
+
+WORKBOOK_SHEETS = ("bd_filters", "stock", "itens_prices")
+DATASET_INFO = "dataset.json"
+
+
+class StepResult(NamedTuple):
+    """The measurements of one benchmark step."""
+    name: str
+    items: int
+    seconds: float
+    peak_mib: float | None
+
+    @property
+    def per_second(self) -> float:
+        return self.items / self.seconds if self.seconds else float("inf")
+
+
+def measure(name: str, func: Callable[[], object], items: int, repeat: int, memory: bool,
+            setup: Callable[[], None] | None = None) -> StepResult:
+    """
+    Times a step (best of `repeat` runs) and, optionally, its peak traced memory.
+
+    Args:
+        name (str): The step name.
+        func (Callable[[], object]): The measured work.
+        items (int): Units of work done by one call, for the throughput.
+        repeat (int): Number of timed runs.
+        memory (bool): Whether to run once more under tracemalloc.
+        setup (Callable[[], None], optional): Untimed preparation before every run.
+
+    Returns:
+        StepResult: The measurements.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    peak_mib = None
+    if memory:
+        # A separate run: tracing slows allocations down and would distort the timings.
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            func()
+            peak_mib = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+
+    result = StepResult(name, items, min(timings), peak_mib)
+    print(f"  {name}: {result.seconds:.4f} s", file=sys.stderr)
+    return result
+
+
+def prepare_dataset(data_dir: str, rows: int, seed: int) -> None:
+    """Writes the synthetic files, unless the directory already holds the same dataset."""
+    info_path = os.path.join(data_dir, DATASET_INFO)
+    info = {"rows": rows, "seed": seed}
+    try:
+        with open(info_path, encoding="utf-8") as file:
+            if json.load(file) == info:
+                return
+    except (OSError, ValueError):
+        pass
+
+    start = time.perf_counter()
+    written = generators.write_dataset(data_dir, rows, seed)
+    with open(info_path, "w", encoding="utf-8") as file:
+        json.dump(info, file)
+    print(f"  generated {', '.join(sorted(written))} in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+
+
+def run_suite(data_dir: str, rows: int, seed: int, repeat: int, memory: bool) -> list[StepResult]:
+    """
+    Runs every benchmark step against the dataset in `data_dir`.
+
+    Snapshots are written next to the data, so the working directory must be `data_dir`.
+
+    Returns:
+        list[StepResult]: The measurements, in execution order.
+    """
+    results = []
+
+    def step(name: str, func: Callable[[], object], items: int, setup: Callable[[], None] | None = None) -> None:
+        results.append(measure(name, func, items, repeat, memory, setup))
+
+    # --- Loading ---
+
+    def load(name: str, refresh: bool) -> pd.DataFrame:
+        return DEFAULT_LOADERS[name](data_dir, refresh)
+
+    step("load matrix (csv)", lambda: load("matrix", True), rows, setup=_classification_cache.clear)
+    step("load matrix (snapshot)", lambda: load("matrix", False), rows)
+    frames = {"matrix": load("matrix", False), "os": load("os", False)}
+    os_rows = len(frames["os"])
+    step("load os (csv)", lambda: load("os", True), os_rows)
+    step("load os (snapshot)", lambda: load("os", False), os_rows)
+
+    if os.path.exists(os.path.join(data_dir, WORKBOOK_FILE)):
+        step("load workbook (xlsx)", lambda: [load(name, True) for name in WORKBOOK_SHEETS], rows)
+        step("load workbook (snapshot)", lambda: [load(name, False) for name in WORKBOOK_SHEETS], rows)
+        frames.update({name: load(name, False) for name in WORKBOOK_SHEETS})
+    else:
+        print("  planilha.xlsx not available (openpyxl missing); using in-memory sheets", file=sys.stderr)
+        sheets = generators.make_workbook(min(max(100, rows // 10), generators.EXCEL_MAX_ROWS), seed)
+        frames.update(zip(WORKBOOK_SHEETS, sheets.values()))
+
+    def fresh_store() -> DataStore:
+        # A new store has no derived indexes or caches, like the first query after a launch.
+        return DataStore(data_dir, **frames)
+
+    # --- Service order lookups and plans ---
+
+    orders = frames["os"]["O.S"].astype(str).tolist()[:10_000]
+    store = fresh_store()
+
+    def lookups() -> None:
+        lookup_store = fresh_store()
+        for order in orders:
+            functions.get_equipment_and_plan(order, lookup_store)
+
+    step("get_equipment_and_plan", lookups, len(orders))
+
+    queries = [functions.get_equipment_and_plan(order, store) for order in orders[:500]]
+
+    def fetch_all(fetch_store: DataStore) -> list[pd.DataFrame]:
+        return [functions.fetch_plans(equipment, plans, fetch_store) for equipment, plans in queries]
+
+    step("fetch_plans (first queries)", lambda: fetch_all(fresh_store()), len(queries))
+    fetch_all(store)
+    step("fetch_plans (cached)", lambda: fetch_all(store), len(queries))
+
+    # --- Tire-service splits ---
+
+    plan_frames = fetch_all(store)
+    plan_rows = sum(len(df) for df in plan_frames)
+    step("split_auto_tire_service", lambda: [functions.split_auto_tire_service(df) for df in plan_frames], plan_rows)
+
+    pasted_rows = min(rows, 1_000_000)
+    pasted = generators.make_pasted_tasks(pasted_rows, seed)
+    step("split_pasted_tire_service", lambda: functions.split_pasted_tire_service(pasted), pasted_rows,
+         setup=_classification_cache.clear)
+
+    tasks = pd.read_csv(io.StringIO(pasted), sep="\t", header=None).reset_index()
+    tasks["index"] = tasks["index"] + 1
+    step("split_tire_service", lambda: functions.split_tire_service(tasks), pasted_rows,
+         setup=_classification_cache.clear)
+
+    # --- Text features ---
+
+    def write_logs() -> None:
+        for order in orders[:1000]:
+            functions.work_logs(order, "1-60", "01/01/2025", "07:00", "17:00", end_date="02/01/2025")
+
+    step("work_logs", write_logs, 60 * len(orders[:1000]))
+
+    text = generators.make_order_text(min(rows * 20, 50_000_000), seed)
+    step("search_orders", lambda: " ".join(functions.extract_orders(text)), len(text))
+
+    # --- Fleet filters ---
+
+    fleets = frames["bd_filters"]["FROTA"].drop_duplicates().tolist()[:200]
+
+    def fleet_queries() -> None:
+        fleet_store = fresh_store()
+        for fleet in fleets:
+            functions.get_equipment_items(fleet, fleet_store)
+
+    step("get_equipment_items", fleet_queries, len(fleets))
+
+    # --- SQLite import ---
+
+    database = os.path.join(data_dir, DATABASE_FILE)
+    step("import_database", lambda: functions.import_database(database, fresh_store()), rows)
+    sql_store = SQLiteStore(database)
+    step("get_equipment_and_plan (sqlite)",
+         lambda: [functions.get_equipment_and_plan(order, sql_store) for order in orders], len(orders))
+    step("fetch_plans (sqlite)",
+         lambda: [functions.fetch_plans(equipment, plans, sql_store) for equipment, plans in queries], len(queries))
+    step("get_equipment_items (sqlite)",
+         lambda: [functions.get_equipment_items(fleet, sql_store) for fleet in fleets], len(fleets))
+    return results
+
+
+def compare(results: list[StepResult], baseline: dict, threshold: float) -> tuple[dict[str, str], int]:
+    """
+    Compares step timings against a baseline.
+
+    Returns:
+        tuple[dict[str, str], int]: Step name -> comparison note, and the number of steps
+                                    slower than `threshold` times their baseline.
+    """
+    notes = {}
+    regressions = 0
+    previous = baseline.get("results", {})
+    for result in results:
+        entry = previous.get(result.name)
+        if not entry:
+            notes[result.name] = "new"
+            continue
+        ratio = result.seconds / entry["seconds"] if entry["seconds"] else float("inf")
+        note = f"{ratio:.2f}x of {entry['seconds']:.4f} s"
+        if ratio > threshold:
+            note += "  SLOWER"
+            regressions += 1
+        elif ratio < 1 / threshold:
+            note += "  faster"
+        notes[result.name] = note
+    return notes, regressions
+
+
+def format_report(results: list[StepResult], rows: int, notes: dict[str, str] | None = None) -> str:
+    """Formats the results as a plain-text table."""
+    lines = [
+        f"bench_suite  {datetime.datetime.now():%Y-%m-%d %H:%M}  rows={rows}  "
+        f"python {platform.python_version()}  pandas {pd.__version__}",
+        "",
+        f"{'step':<30} {'items':>10} {'best s':>10} {'items/s':>14} {'peak MiB':>9}" + ("  baseline" if notes else ""),
+    ]
+    for result in results:
+        peak = f"{result.peak_mib:>9.1f}" if result.peak_mib is not None else f"{'-':>9}"
+        line = f"{result.name:<30} {result.items:>10} {result.seconds:>10.4f} {result.per_second:>14,.0f} {peak}"
+        if notes:
+            line += f"  {notes.get(result.name, '')}"
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the data-backed features on synthetic data.")
+    parser.add_argument("--rows", type=int, default=100_000, help="matrix rows (10k to 10M)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", help="where to write (and reuse) the dataset; a temporary dir if omitted")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per step; the best one is reported")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc runs")
+    parser.add_argument("--output", default="bench_output.txt")
+    parser.add_argument("--save-baseline", metavar="FILE", help="store the results as a JSON baseline")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio above which a step counts as a regression")
+    args = parser.parse_args(argv)
+
+    # Resolve the output paths before moving into the data directory.
+    output = os.path.abspath(args.output)
+    save_baseline = os.path.abspath(args.save_baseline) if args.save_baseline else None
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline.get("rows") != args.rows:
+            print(f"warning: the baseline was recorded with rows={baseline.get('rows')}", file=sys.stderr)
+
+    data_dir = os.path.abspath(args.data_dir) if args.data_dir else tempfile.mkdtemp(prefix="bench_suite_")
+    os.makedirs(data_dir, exist_ok=True)
+    cwd = os.getcwd()
+    try:
+        prepare_dataset(data_dir, args.rows, args.seed)
+        os.chdir(data_dir)
+        results = run_suite(data_dir, args.rows, args.seed, args.repeat, not args.no_memory)
+    finally:
+        os.chdir(cwd)
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    notes, regressions = compare(results, baseline, args.threshold) if baseline else (None, 0)
+    report = format_report(results, args.rows, notes)
+    print(report, end="")
+    with open(output, "w", encoding="utf-8") as file:
+        file.write(report)
+
+    if save_baseline:
+        with open(save_baseline, "w", encoding="utf-8") as file:
+            json.dump({
+                "rows": args.rows,
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "results": {r.name: {"items": r.items, "seconds": r.seconds, "peak_mib": r.peak_mib} for r in results},
+            }, file, indent=2)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
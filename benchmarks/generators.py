@@ -0,0 +1,244 @@
+#
+# generators.py
+#
+# Description:
+# Synthetic, realistic stand-ins for the toolkit's data sources (matriz.csv, os.csv and
+# planilha.xlsx), with the real column names, at any scale. The real exports cannot be
+# shared, so benchmarks and profiling sessions run on these instead. Everything is
+# generated with NumPy from a seed, so the same arguments always give the same data.
+#
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from datastore import MATRIX_FILE, OS_FILE, WORKBOOK_FILE
+
+# Excel's row limit; larger workbook sheets are truncated to it.
+EXCEL_MAX_ROWS = 1_048_575
+
+PLAN_NUMBERS = [250, 365, 500, 750, 1000, 1500, 2000]
+
+MODEL_PREFIXES = ["TRATOR", "COLHEDORA", "CAMINHÃO PIPA", "TRANSBORDO", "PLANTADORA", "PULVERIZADOR"]
+
+# (de_operacao, de_tarefa, de_sist_veic, de_sub_sist, de_compo); a few are tire services.
+TASK_CATALOG = [
+    ("Calibrar", "Calibrar pneus e verificar vazamentos.", "Transmissão/Cubos Red.", "Pneu", "SERVIÇO"),
+    ("Verificar", "Verificar torque das porcas das rodas", "Rodante", "Roda", "SERVIÇO"),
+    ("Verificar", "Verificar a integridade (trincas, desgastes acentuados, danos críticos) dos espelhos da roda",
+     "Rodante", "Roda", "Roda"),
+    ("Trocar", "Serviço de borracharia: trocar câmara", "Rodante", "Pneu", "Câmara"),
+    ("Verificar", "Verificar sistema pneumático dos freios", "Freios", "Sistema pneumático", "Válvula"),
+    ("Engraxar / Lubrificar", "Lubrificar os pontos de graxa (quinta-roda, catracas, etc).", "Lab.Lub / Comboio",
+     "Lubrificação", "Graxa"),
+    ("Trocar", "Trocar óleo do motor", "Motor", "Lubrificação", "Óleo"),
+    ("Trocar", "Trocar filtro de ar", "Motor", "Admissão", "Filtro"),
+    ("Trocar", "Trocar filtro de combustível", "Motor", "Combustível", "Filtro"),
+    ("Verificar", "Verificar a integridade das suspensões", "Chassi", "Suspensão", "Mola"),
+    ("Verificar", "Verificar guias", "Chassi", "Estrutura", "Guia"),
+    ("Reparar", "Reparar helicoides dos divisores de linha", "Divisor de linha", "Estrutura", "SERVIÇO"),
+    ("Revisar", "Fazer embuchamento do corte de pontas", "Despontador/Triturador", "Estrutura", "Bucha"),
+    ("Limpar", "Limpar radiador", "Motor", "Arrefecimento", "Radiador"),
+    ("Inspecionar", "Inspecionar correias", "Motor", "Transmissão", "Correia"),
+]
+
+POSITIONS = ["", " DIANTEIRO", " TRASEIRO", " LE", " LD", " EIXO 1", " EIXO 2", " EIXO 3"]
+
+MAINTENANCE_TYPES = ["PREVENTIVA", "PREVENTIVA", "PREVENTIVA", "LUBRIFICAÇÃO", "INSPEÇÃO", "HIBERNAÇÃO"]
+
+PART_TYPES = ["Filtro\nde ar", "Filtro de óleo", "Filtro de combustível", "Óleo", "Correia", "Graxa", "Rolamento"]
+
+
+def _models(count: int) -> np.ndarray:
+    return np.array([f"{MODEL_PREFIXES[i % len(MODEL_PREFIXES)]} {i:04d}" for i in range(count)], dtype=object)
+
+
+def make_matrix(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Builds a maintenance matrix (`matriz.csv`) with `rows` task rows.
+
+    Tasks are grouped by `Chave` (model + plan + warranty flag) and numbered by `no_seq`
+    within each key, like the real export.
+
+    Args:
+        rows (int): Number of rows.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: The matrix.
+    """
+    rng = np.random.default_rng(seed)
+    models = _models(max(5, rows // 2000))
+    model_idx = rng.integers(0, len(models), rows)
+    plan = np.array(PLAN_NUMBERS)[rng.integers(0, len(PLAN_NUMBERS), rows)]
+    warranty = np.where(rng.random(rows) < 0.05, "S", "N").astype(object)
+    task_idx = rng.integers(0, len(TASK_CATALOG), rows)
+    catalog = np.array(TASK_CATALOG, dtype=object)
+
+    df = pd.DataFrame({
+        "Chave": models[model_idx] + plan.astype(str).astype(object) + warranty,
+        "no_ref_prog": plan.astype(str),
+        "no_seq": 0,
+        "de_operacao": catalog[task_idx, 0],
+        "de_tarefa": catalog[task_idx, 1],
+        "de_sist_veic": catalog[task_idx, 2],
+        "de_sub_sist": catalog[task_idx, 3],
+        # Positions make the tasks distinct after `fetch_plans` drops repeated rows.
+        "de_compo": catalog[task_idx, 4] + np.array(POSITIONS, dtype=object)[rng.integers(0, len(POSITIONS), rows)],
+        "de_tp_manut": np.array(MAINTENANCE_TYPES, dtype=object)[rng.integers(0, len(MAINTENANCE_TYPES), rows)],
+        "fg_garantia": warranty,
+    })
+    df = df.sort_values("Chave", kind="stable").reset_index(drop=True)
+    df["no_seq"] = df.groupby("Chave", sort=False).cumcount() + 1
+    return df
+
+
+def make_os(rows: int, matrix: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    """
+    Builds a service order table (`os.csv`) whose orders point at models and plans of a matrix.
+
+    Args:
+        rows (int): Number of service orders.
+        matrix (pd.DataFrame): The matrix the orders refer to.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: The table, with the columns "O.S", "MODELO" and "PLANO".
+    """
+    rng = np.random.default_rng(seed + 1)
+    pairs = matrix.loc[matrix["fg_garantia"] == "N", ["Chave", "no_ref_prog"]].drop_duplicates()
+    # Chave = model + plan + warranty flag.
+    models = np.array([key[:-1 - len(plan)] for key, plan in zip(pairs["Chave"], pairs["no_ref_prog"])], dtype=object)
+    plans = pairs["no_ref_prog"].to_numpy(dtype=object)
+    picked = rng.integers(0, len(pairs), rows)
+    second = rng.integers(0, len(pairs), rows)
+    # About a third of the orders combine two plans of the same model, e.g. "250/500".
+    combined = (rng.random(rows) < 0.33) & (models[second] == models[picked]) & (plans[second] != plans[picked])
+    plan_text = np.where(combined, plans[picked] + "/" + plans[second], plans[picked])
+    return pd.DataFrame({
+        "O.S": np.arange(62100000, 62100000 + rows),
+        "MODELO": models[picked],
+        "PLANO": plan_text,
+    })
+
+
+def make_workbook(rows: int, seed: int = 0) -> dict[str, pd.DataFrame]:
+    """
+    Builds the three sheets of `planilha.xlsx` used by the fleet filters query.
+
+    Args:
+        rows (int): Number of rows of "BD_FILTROS" (fleet x part).
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        dict[str, pd.DataFrame]: Sheet name -> frame, for "BD_FILTROS", "Saldo Almoxarifado"
+                                 and "Valor das peças".
+    """
+    rng = np.random.default_rng(seed + 2)
+    materials = np.arange(10_000_000, 10_000_000 + max(50, rows // 20))
+    bd_filters = pd.DataFrame({
+        "FROTA": rng.integers(1000, 1000 + max(10, rows // 30), rows),
+        "PLANO REAL": np.array(PLAN_NUMBERS)[rng.integers(0, len(PLAN_NUMBERS), rows)].astype(str),
+        "Tipo da peça": np.array(PART_TYPES, dtype=object)[rng.integers(0, len(PART_TYPES), rows)],
+        "Cod. Sap": rng.choice(materials, rows),
+        "QNTD.": np.where(rng.random(rows) < 0.1, np.nan, rng.integers(1, 6, rows)),
+    })
+    prices = pd.DataFrame({
+        "Material": materials,
+        "Texto breve material": [f"PECA {m}" for m in materials],
+        "Tipo de MRP": np.array(["ZB", "PD", "ND"], dtype=object)[rng.integers(0, 3, len(materials))],
+    })
+    in_stock = materials[rng.random(len(materials)) < 0.7]
+    stock = pd.DataFrame({"Material": in_stock, "Utilização livre": rng.integers(0, 50, len(in_stock))})
+    return {"BD_FILTROS": bd_filters, "Saldo Almoxarifado": stock, "Valor das peças": prices}
+
+
+def make_pasted_tasks(rows: int, seed: int = 0) -> str:
+    """
+    Builds a task list as pasted from the external software, in the usual export layout
+    (status in column 0, description in column 8, sub-system in column 12).
+
+    Args:
+        rows (int): Number of task rows.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        str: Tab-separated rows.
+    """
+    rng = np.random.default_rng(seed + 3)
+    task_idx = rng.integers(0, len(TASK_CATALOG), rows)
+    status = np.where(rng.random(rows) < 0.8, "N", "S")
+    lines = []
+    for i, (task, state) in enumerate(zip(task_idx, status), start=1):
+        operation, description, system, sub_system, component = TASK_CATALOG[task]
+        lines.append("\t".join([
+            state, "S", "", "15", "15", str(i), "11", operation, description,
+            "700", system, "773", sub_system, "1", component,
+        ]))
+    return "\n".join(lines)
+
+
+def make_order_text(chars: int, seed: int = 0) -> str:
+    """
+    Builds report-like text of about `chars` characters with service orders spread in it.
+
+    Args:
+        chars (int): Approximate length of the text.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        str: The text.
+    """
+    rng = np.random.default_rng(seed + 4)
+    words = np.array(["OS", "TRATOR", "frota", "1024", "Pneu", "18.4-34", "manutenção", "6211234", "521000000"])
+    pieces = []
+    length = 0
+    while length < chars:
+        block = rng.choice(words, 64)
+        orders = rng.integers(62100000, 62200000, 4).astype(str)
+        line = " ".join(block[:30]) + " " + " ".join(orders) + "\n" + " ".join(block[30:]) + "\n"
+        pieces.append(line)
+        length += len(line)
+    return "".join(pieces)
+
+
+def write_dataset(data_dir: str, rows: int, seed: int = 0, excel: bool = True) -> dict[str, str]:
+    """
+    Writes matriz.csv, os.csv and (optionally) planilha.xlsx to a directory.
+
+    The CSVs use the export format (";" separated, latin-1). The workbook needs openpyxl;
+    without it, or with `excel=False`, it is skipped.
+
+    Args:
+        data_dir (str): The target directory; created if missing.
+        rows (int): Matrix rows. The OS table and workbook are scaled from it.
+        seed (int, optional): Random seed. Defaults to 0.
+        excel (bool, optional): Whether to write the workbook. Defaults to True.
+
+    Returns:
+        dict[str, str]: Dataset name ("matrix", "os", "workbook") -> written path.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    matrix = make_matrix(rows, seed)
+    written = {}
+
+    path = os.path.join(data_dir, MATRIX_FILE)
+    matrix.to_csv(path, sep=";", encoding="latin1", errors="replace", index=False)
+    written["matrix"] = path
+
+    path = os.path.join(data_dir, OS_FILE)
+    make_os(max(100, rows // 20), matrix, seed).to_csv(path, sep=";", encoding="latin1", errors="replace", index=False)
+    written["os"] = path
+
+    if excel:
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            return written
+        path = os.path.join(data_dir, WORKBOOK_FILE)
+        with pd.ExcelWriter(path) as writer:
+            for sheet, frame in make_workbook(min(max(100, rows // 10), EXCEL_MAX_ROWS), seed).items():
+                frame.to_excel(writer, sheet_name=sheet, index=False)
+        written["workbook"] = path
+    return written
@@ -0,0 +1,156 @@
+#
+# load_test.py
+#
+# Description:
+# Load test for the toolkit server (server.py): several client threads send a mix of
+# requests over keep-alive connections and the run reports requests per second and
+# latency percentiles per endpoint. By default it starts a local server on synthetic
+# data (see generators.py); --url targets an instance that is already running.
+#
+# Usage:
+#     python -m benchmarks.load_test [--rows 100000] [--clients 8] [--requests 4000]
+#     python -m benchmarks.load_test --url http://127.0.0.1:8765 --orders 62100001 62100002
+#
+
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from collections import defaultdict
+
+from benchmarks import generators
+from datastore import DataStore
+from server import ToolkitServer
+
+
+def make_requests(orders: list[str], fleets: list[int], count: int, seed: int = 0) -> list[tuple[str, dict]]:
+    """
+    Builds a mix of (path, payload) requests resembling a working day.
+
+    Plan and sequence queries need known service orders and fleet queries known fleets;
+    without them only the text endpoints are exercised.
+    """
+    rng = random.Random(seed)
+    text = generators.make_order_text(5_000, seed)
+    kinds = ["orders", "work_logs"] + ["plan", "sequences"] * bool(orders) + ["equipment_items"] * bool(fleets)
+    requests = []
+    for _ in range(count):
+        kind = rng.choice(kinds)
+        if kind == "orders":
+            requests.append(("/orders", {"text": text}))
+        elif kind == "work_logs":
+            requests.append(("/work_logs", {
+                "service_order": "62112345", "interval": "1-40", "date": "01/01/2025", "start": "07:00", "end": "17:00",
+            }))
+        elif kind == "plan":
+            requests.append(("/plan", {"os_number": rng.choice(orders)}))
+        elif kind == "sequences":
+            requests.append(("/sequences", {"os_number": rng.choice(orders), "plan_type": rng.choice(["", "tire_service"])}))
+        else:
+            requests.append(("/equipment_items", {"fleet": rng.choice(fleets)}))
+    return requests
+
+
+def run_client(url: str, requests: list[tuple[str, dict]], latencies: dict, errors: dict, lock: threading.Lock) -> None:
+    """Sends requests one after the other over a single keep-alive connection."""
+    parsed = urllib.parse.urlsplit(url)
+    connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=60)
+    local_latencies = defaultdict(list)
+    local_errors = defaultdict(int)
+    for path, payload in requests:
+        body = json.dumps(payload).encode("utf-8")
+        start = time.perf_counter()
+        try:
+            connection.request("POST", path, body, {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=60)
+            status = None
+        local_latencies[path].append(time.perf_counter() - start)
+        # A 400 for an order without tire sequences is a valid answer, not a failure.
+        if status is None or status >= 500:
+            local_errors[path] += 1
+    connection.close()
+    with lock:
+        for path, values in local_latencies.items():
+            latencies[path].extend(values)
+        for path, count in local_errors.items():
+            errors[path] += count
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test the toolkit server.")
+    parser.add_argument("--url", help="server to test; a local one on synthetic data is started if omitted")
+    parser.add_argument("--rows", type=int, default=100_000, help="matrix rows of the synthetic data")
+    parser.add_argument("--workers", type=int, default=8, help="request threads of the local server")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent client connections")
+    parser.add_argument("--requests", type=int, default=4000, help="total number of requests")
+    parser.add_argument("--orders", nargs="*", default=[], help="service orders to query (with --url)")
+    parser.add_argument("--fleets", nargs="*", type=int, default=[], help="fleets to query (with --url)")
+    args = parser.parse_args()
+
+    server = data_dir = None
+    orders, fleets = args.orders, args.fleets
+    url = args.url
+    if not url:
+        data_dir = tempfile.mkdtemp(prefix="load_test_")
+        generators.write_dataset(data_dir, args.rows, excel=False)
+        cwd = os.getcwd()
+        os.chdir(data_dir)
+        workbook = generators.make_workbook(max(100, args.rows // 10))
+        store = DataStore(data_dir, bd_filters=workbook["BD_FILTROS"], stock=workbook["Saldo Almoxarifado"],
+                          itens_prices=workbook["Valor das peças"])
+        store.warm(background=False)
+        os.chdir(cwd)
+        orders = store.os["O.S"].astype(str).tolist()[:2000]
+        fleets = workbook["BD_FILTROS"]["FROTA"].drop_duplicates().tolist()[:200]
+        server = ToolkitServer(("127.0.0.1", 0), store, args.workers)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = server.url
+
+    requests = make_requests(orders, fleets, args.requests)
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    lock = threading.Lock()
+    clients = [
+        threading.Thread(target=run_client, args=(url, requests[i::args.clients], latencies, errors, lock))
+        for i in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - start
+
+    if server:
+        server.shutdown()
+        server.server_close()
+    if data_dir:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    print(f"{len(requests)} requests, {args.clients} clients, {elapsed:.2f} s: {len(requests) / elapsed:,.0f} req/s")
+    print(f"{'endpoint':<18} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for path, values in sorted(latencies.items()):
+        print(f"{path:<18} {len(values):>7} {errors[path]:>7} {percentile(values, 0.5) * 1000:>9.2f} "
+              f"{percentile(values, 0.9) * 1000:>9.2f} {percentile(values, 0.99) * 1000:>9.2f} {max(values) * 1000:>9.2f}")
+    return 1 if sum(errors.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#
+# cache.py
+#
+# Description:
+# A small, thread-safe, bounded LRU cache with hit/miss counters. It is used to memoize
+# results that repeat all day long (task lists per equipment/plan, classifications of
+# task descriptions) without letting memory grow without limit.
+#
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    A bounded mapping that evicts the least recently used entry when full.
+
+    Attributes:
+        maxsize (int): The maximum number of entries kept.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to compute a value.
+    """
+    def __init__(self, maxsize: int = 128):
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxsize (int, optional): The maximum number of entries. Defaults to 128.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: object = None) -> object:
+        """
+        Returns the value stored for a key, counting the lookup as a hit or a miss.
+
+        Args:
+            key (Hashable): The key to look up.
+            default (object, optional): Returned when the key is not cached.
+
+        Returns:
+            object: The cached value or `default`.
+        """
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: object) -> None:
+        """
+        Stores a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (Hashable): The key to store.
+            value (object): The value to store.
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], object]) -> object:
+        """
+        Returns the cached value for a key, computing and storing it on a miss.
+
+        Args:
+            key (Hashable): The key to look up.
+            compute (Callable[[], object]): Produces the value when it is not cached.
+
+        Returns:
+            object: The cached or freshly computed value.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Removes every entry and resets the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        """
+        Returns the cache statistics, in the spirit of `functools.lru_cache.cache_info`.
+
+        Returns:
+            dict: The keys "hits", "misses", "size" and "maxsize".
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,244 @@
+#
+# cli.py
+#
+# Description:
+# Command line interface for the toolkit's core functions, for scripts and shell
+# pipelines on machines without a display. It never imports tkinter.
+#
+# Usage:
+#     python -m cli orders [FILE ...] [--separator SEP] [--workers N] [--count]
+#     python -m cli join [FILE] [--separator SEP] [--keep-spaces]
+#     python -m cli worklogs OS INTERVAL DATE START END [--end-date DATE] [--tire]
+#     python -m cli autologs OS DATE START END [--tire]
+#     python -m cli batch TABLE --output FILE
+#     python -m cli classify PATH [PATH ...] --output FILE [--workers N]
+#     python -m cli fleet FROTA [--csv]
+#     python -m cli rebuild-snapshot
+#     python -m cli import-db [--output toolkit.db]
+#     python -m cli memory [matrix] [os]
+#
+# Data-backed commands read matriz.csv, os.csv and planilha.xlsx from --data-dir, or
+# query the SQLite file given with --database (written by import-db).
+# --stats FILE records call statistics during the command and saves them as JSON.
+#
+
+import argparse
+import contextlib
+import re
+import sys
+
+import functions
+import instrumentation
+from datastore import TYPED_SOURCES, DataStore, source_memory_report
+from sqlstore import DATABASE_FILE, SQLiteStore
+
+
+def _open_text(path: str | None):
+    """Opens a path as text for a `with` block, or stdin for None/"-" (left open afterwards)."""
+    if not path or path == "-":
+        return contextlib.nullcontext(sys.stdin)
+    return open(path, encoding="utf-8", errors="replace", newline="")
+
+
+# Escape sequences understood in --separator; anything else is taken literally.
+_SEPARATOR_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\"}
+
+
+def _separator(value: str) -> str:
+    """Decodes the `\\n`, `\\t` and `\\\\` escapes of a command-line separator; other text is kept as typed."""
+    return re.sub(r"\\([nt\\])", lambda match: _SEPARATOR_ESCAPES[match.group(1)], value)
+
+
+def _store(args: argparse.Namespace) -> DataStore | SQLiteStore:
+    """Returns the data source of data-backed commands."""
+    return SQLiteStore(args.database) if args.database else DataStore(args.data_dir)
+
+
+def cmd_orders(args: argparse.Namespace) -> int:
+    separator = _separator(args.separator)
+    if args.files:
+        orders = (match.order for match in functions.scan_orders(args.files, workers=args.workers))
+    else:
+        orders = functions.iter_orders_in_stream(sys.stdin)
+
+    count = 0
+    for order in orders:
+        sys.stdout.write(order if count == 0 else separator + order)
+        count += 1
+    if count:
+        sys.stdout.write("\n")
+    if args.count:
+        print(f"Quantidade de ordens encontradas: {count}", file=sys.stderr)
+    return 0 if count else 1
+
+
+def cmd_join(args: argparse.Namespace) -> int:
+    separator = _separator(args.separator)
+    with _open_text(args.file) as source:
+        for piece in functions.iter_joined_text(source, separator, args.keep_spaces):
+            sys.stdout.write(piece)
+    sys.stdout.write("\n")
+    return 0
+
+
+def cmd_worklogs(args: argparse.Namespace) -> int:
+    sys.stdout.write(functions.work_logs(
+        args.os, args.interval, args.date, args.start, args.end,
+        "tire_service" if args.tire else "", args.end_date,
+    ))
+    return 0
+
+
+def cmd_autologs(args: argparse.Namespace) -> int:
+    store = _store(args)
+    sequences = functions.auto_work_log_sequences(args.os, "tire_service" if args.tire else "", store)
+    interval_str = " ".join(str(i) for i in sequences)
+    sys.stdout.write(functions.work_logs(args.os, interval_str, args.date, args.start, args.end))
+    return 0
+
+
+def cmd_batch(args: argparse.Namespace) -> int:
+    store = _store(args)
+    with _open_text(args.table) as table:
+        written, errors = functions.write_batch_work_logs(functions.parse_batch_orders(table), args.output, store)
+    for order, error in errors:
+        print(f"Linha {order.line} ({order.os_number}): {error}", file=sys.stderr)
+    print(f"{written} ordens salvas em {args.output}", file=sys.stderr)
+    return 0 if not errors else 1
+
+
+def cmd_classify(args: argparse.Namespace) -> int:
+    files, lines, errors = functions.write_task_classification(args.paths, args.output, args.workers)
+    for result in errors:
+        print(f"{result.path}: {result.error}", file=sys.stderr)
+    print(f"{files} arquivos ({lines} tarefas) salvos em {args.output}", file=sys.stderr)
+    return 0 if not errors else 1
+
+
+def cmd_fleet(args: argparse.Namespace) -> int:
+    items = functions.get_equipment_items(args.fleet, _store(args))
+    items.to_csv(sys.stdout, sep="," if args.csv else "\t", index=False)
+    return 0
+
+
+def cmd_rebuild_snapshot(args: argparse.Namespace) -> int:
+    DataStore(args.data_dir).rebuild_snapshots()
+    return 0
+
+
+def cmd_import_db(args: argparse.Namespace) -> int:
+    counts = functions.import_database(args.output, DataStore(args.data_dir))
+    for table, rows in counts.items():
+        print(f"{table}: {rows} linhas", file=sys.stderr)
+    print(f"Dados importados em {args.output}", file=sys.stderr)
+    return 0
+
+
+def cmd_memory(args: argparse.Namespace) -> int:
+    for name in args.datasets or sorted(TYPED_SOURCES):
+        if name not in TYPED_SOURCES:
+            raise ValueError(f"Fonte desconhecida: {name}")
+        report = source_memory_report(args.data_dir, name)
+        print(f"{name}: {report.loc['total', 'bytes_before'] / 2**20:.1f} MiB sem esquema, "
+              f"{report.loc['total', 'bytes_after'] / 2**20:.1f} MiB como carregada")
+        print(report.to_string(float_format="{:.1f}".format))
+        print()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Apprentice Toolkit sem interface gráfica.")
+    parser.add_argument("--data-dir", default=".", help="pasta com matriz.csv, os.csv e planilha.xlsx")
+    parser.add_argument("--database", metavar="FILE", help="consulta um banco SQLite criado com import-db")
+    parser.add_argument("--stats", metavar="FILE", help="salva estatísticas de tempo das funções em JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    orders = commands.add_parser("orders", help="extrai ordens de serviço (621xxxxx) de arquivos ou stdin")
+    orders.add_argument("files", nargs="*", help="arquivos ou pastas; stdin se omitido")
+    orders.add_argument("--separator", default="\\n", help="separador de saída (padrão: uma por linha)")
+    orders.add_argument("--workers", type=int, default=1, help="processos para varrer arquivos em paralelo")
+    orders.add_argument("--count", action="store_true", help="mostra a quantidade encontrada em stderr")
+    orders.set_defaults(handler=cmd_orders)
+
+    join = commands.add_parser("join", help="une linhas de texto com um separador")
+    join.add_argument("file", nargs="?", help="arquivo de entrada; stdin se omitido ou '-'")
+    join.add_argument("--separator", default=", ")
+    join.add_argument("--keep-spaces", action="store_true", help="aplica o separador só nas quebras de linha")
+    join.set_defaults(handler=cmd_join)
+
+    worklogs = commands.add_parser("worklogs", help="gera apontamentos manuais")
+    worklogs.add_argument("os")
+    worklogs.add_argument("interval", help='sequências, ex.: "1-5" ou "1 3 7-9"')
+    worklogs.add_argument("date")
+    worklogs.add_argument("start")
+    worklogs.add_argument("end")
+    worklogs.add_argument("--end-date", default="", help="data final para intervalos de vários dias")
+    worklogs.add_argument("--tire", action="store_true", help="somente borracharia (para tarefas coladas)")
+    worklogs.set_defaults(handler=cmd_worklogs)
+
+    autologs = commands.add_parser("autologs", help="gera apontamentos automáticos a partir da OS")
+    autologs.add_argument("os")
+    autologs.add_argument("date")
+    autologs.add_argument("start")
+    autologs.add_argument("end")
+    autologs.add_argument("--tire", action="store_true", help="sequências de borracharia")
+    autologs.set_defaults(handler=cmd_autologs)
+
+    batch = commands.add_parser("batch", help="gera apontamentos automáticos em lote")
+    batch.add_argument("table", help="tabela TSV/CSV: OS, data, hora inicial, hora final, tipo")
+    batch.add_argument("--output", required=True, help="arquivo de saída")
+    batch.set_defaults(handler=cmd_batch)
+
+    classify = commands.add_parser("classify", help="separa borracharia e geral de arquivos de tarefas exportados")
+    classify.add_argument("paths", nargs="+", help="arquivos ou pastas com uma OS por arquivo")
+    classify.add_argument("--output", required=True, help="arquivo TSV de saída: OS, sequência, classe")
+    classify.add_argument("--workers", type=int, default=1, help="processos para classificar em paralelo")
+    classify.set_defaults(handler=cmd_classify)
+
+    fleet = commands.add_parser("fleet", help="consulta filtros x frota")
+    fleet.add_argument("fleet", type=int)
+    fleet.add_argument("--csv", action="store_true", help="saída separada por vírgulas em vez de tabs")
+    fleet.set_defaults(handler=cmd_fleet)
+
+    rebuild = commands.add_parser("rebuild-snapshot", help="reprocessa as fontes de dados e regrava os snapshots")
+    rebuild.set_defaults(handler=cmd_rebuild_snapshot)
+
+    import_db = commands.add_parser("import-db", help="importa as fontes de dados para um banco SQLite indexado")
+    import_db.add_argument("--output", default=DATABASE_FILE, help=f"arquivo do banco (padrão: {DATABASE_FILE})")
+    import_db.set_defaults(handler=cmd_import_db)
+
+    memory = commands.add_parser("memory", help="compara a memória das fontes CSV lidas sem esquema e como carregadas")
+    memory.add_argument("datasets", nargs="*", help=f"{', '.join(sorted(TYPED_SOURCES))} (padrão: todas)")
+    memory.set_defaults(handler=cmd_memory)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Runs the command line interface.
+
+    Args:
+        argv (list[str], optional): The arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: The process exit code.
+    """
+    args = build_parser().parse_args(argv)
+    if args.stats:
+        instrumentation.enable()
+    try:
+        return args.handler(args)
+    except ValueError as e:
+        print(f"Atenção: {e}", file=sys.stderr)
+        return 1
+    except FileNotFoundError as e:
+        print(f"Arquivo de dados não encontrado: {e.filename}", file=sys.stderr)
+        return 1
+    finally:
+        if args.stats:
+            instrumentation.dump_json(args.stats)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,507 @@
+#
+# datastore.py
+#
+# Description:
+# Lazy, on-demand access to the toolkit's data sources. A `DataStore` loads each dataset
+# the first time it is requested (through the snapshot cache) instead of at import time,
+# so text-only features never pay for the CSV/Excel parsing. Structures derived from the
+# data (indexes, joined tables) are memoized per load and dropped when their source changes.
+#
+
+from __future__ import annotations
+
+import io
+import os
+import threading
+from typing import Callable
+
+from lazy import lazy_import
+from schema import MATRIX_SCHEMA, OS_SCHEMA, append_typed, concat_typed, iter_csv_typed, memory_report, read_csv_typed
+from snapshot import file_fingerprint, load_excel, load_snapshot
+from tire_rules import AUTO_RULES, TIRE_SERVICE_COLUMN
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+
+MATRIX_FILE = "matriz.csv"
+OS_FILE = "os.csv"
+WORKBOOK_FILE = "planilha.xlsx"
+
+_CSV_OPTIONS = {"sep": ";", "encoding": "latin1", "low_memory": False}
+
+# `DataFrame.attrs` key of the bytes of an append-only source (os.csv) a loaded frame
+# holds; the watcher merges the lines after it.
+SOURCE_OFFSET = "source_offset"
+
+# Bytes read at a time when looking back for the end of the last complete line.
+_LINE_SCAN_SIZE = 1 << 16
+
+# Maintenance types that never generate work logs.
+BLACKLIST_PATTERN = "INSPEÇÃO|INS |HIBERNAÇÃO|ATIVAÇÃO DA HIBERNAÇÃO"
+# Matrix columns kept once the rows are filtered: those `fetch_plans` reads.
+MATRIX_COLUMNS = ["Chave", "no_ref_prog", "no_seq", "de_operacao", "de_tarefa", "de_sist_veic", "de_sub_sist", "de_compo"]
+# Rows of matriz.csv parsed at a time; only the rows kept by `filter_matrix` accumulate.
+MATRIX_CHUNK_ROWS = 100_000
+
+
+def add_tire_service_flag(df_matrix: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adds the `AUTO_RULES` verdict of every matrix row as a boolean column.
+
+    Whether a task is a tire service only depends on its `de_tarefa` and `de_sub_sist`,
+    so it is computed once per matrix load instead of on every request. Each distinct
+    pair is classified once, outside the shared classification cache, which this pass
+    over the whole catalog would otherwise flush.
+
+    Args:
+        df_matrix (pd.DataFrame): The maintenance matrix. It is modified in place.
+
+    Returns:
+        pd.DataFrame: The same frame, with the `fg_borracharia` column.
+    """
+    df_matrix[TIRE_SERVICE_COLUMN] = pd.array(
+        AUTO_RULES.classify_many(
+            df_matrix["de_tarefa"].tolist(), df_matrix["de_sub_sist"].tolist(), shared_cache=False
+        ),
+        dtype=bool,
+    )
+    return df_matrix
+
+
+def filter_matrix(df_matrix: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keeps the matrix rows `fetch_plans` can return, and the columns it reads.
+
+    Warranty rows (`fg_garantia` other than "N"), blacklisted maintenance types and rows
+    whose `no_ref_prog` is not a number never generate work logs; `no_ref_prog` is
+    converted to numbers. Each filter applies when its column is present, and a filtered
+    frame passes through unchanged.
+
+    Args:
+        df_matrix (pd.DataFrame): Matrix rows, e.g. one chunk of matriz.csv.
+
+    Returns:
+        pd.DataFrame: The kept rows with `MATRIX_COLUMNS` (and the tire-service flag, if
+                      present), keeping their row labels.
+    """
+    keep = pd.Series(True, index=df_matrix.index)
+    if "fg_garantia" in df_matrix.columns:
+        keep &= df_matrix["fg_garantia"] == "N"
+    if "de_tp_manut" in df_matrix.columns:
+        keep &= ~_by_value(
+            df_matrix["de_tp_manut"], lambda values: values.str.upper().str.contains(BLACKLIST_PATTERN, na=False)
+        ).astype(bool)
+    if "no_ref_prog" in df_matrix.columns:
+        plan_numbers = _by_value(df_matrix["no_ref_prog"], lambda values: pd.to_numeric(values, errors="coerce"))
+        keep &= plan_numbers.notna()
+
+    columns = [column for column in [*MATRIX_COLUMNS, TIRE_SERVICE_COLUMN] if column in df_matrix.columns]
+    filtered = df_matrix.loc[keep, columns]
+    if "no_ref_prog" in columns:
+        filtered = filtered.assign(no_ref_prog=pd.to_numeric(plan_numbers[keep], downcast="integer"))
+    return filtered
+
+
+def _by_value(series: pd.Series, func) -> pd.Series:
+    """Applies a vectorized function to a column, once per distinct value if it is categorical."""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return func(series)
+    mapped = func(pd.Series(series.cat.categories)).to_numpy()
+    codes = series.cat.codes.to_numpy()
+    # Code -1 (missing) takes the function's value for a missing input.
+    missing = func(pd.Series([None], dtype=series.cat.categories.dtype)).to_numpy()
+    return pd.Series(np.append(mapped, missing)[codes], index=series.index)
+
+
+def matrix_keys(df_matrix: pd.DataFrame) -> set:
+    """
+    Returns every `Chave` of a matrix, including keys all of whose rows were filtered out.
+
+    `read_matrix` keeps those in the categories of the `Chave` column, so `fetch_plans`
+    can still tell an unknown equipment from one without valid tasks.
+    """
+    keys = df_matrix["Chave"]
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        return set(keys.cat.categories)
+    return set(keys.unique())
+
+
+def read_matrix(path: str, chunk_rows: int | None = None) -> pd.DataFrame:
+    """
+    Reads matriz.csv in chunks, keeping only the rows and columns of `filter_matrix`.
+
+    Rows are filtered as each chunk is parsed, so the peak memory follows the useful part
+    of the file rather than its size. The tire-service flag is added to the kept rows.
+
+    Args:
+        path (str): The CSV file.
+        chunk_rows (int, optional): Rows parsed at a time. Defaults to `MATRIX_CHUNK_ROWS`.
+
+    Returns:
+        pd.DataFrame: The kept rows, in file order, indexed from 0.
+    """
+    chunks = []
+    keys = None
+    for chunk in iter_csv_typed(path, MATRIX_SCHEMA, chunk_rows or MATRIX_CHUNK_ROWS, **_CSV_OPTIONS):
+        if "Chave" in chunk.columns:
+            categories = chunk["Chave"].cat.categories
+            keys = categories if keys is None else keys.union(categories)
+        chunks.append(filter_matrix(chunk))
+
+    df_matrix = concat_typed(chunks)
+    if keys is not None:
+        df_matrix["Chave"] = df_matrix["Chave"].cat.set_categories(keys)
+    return add_tire_service_flag(df_matrix)
+
+
+def _read_os(path: str, size: int | None = None) -> pd.DataFrame:
+    if size is None:
+        return read_csv_typed(path, OS_SCHEMA, **_CSV_OPTIONS)
+    # Only the first `size` bytes: lines appended meanwhile are left to the watcher.
+    with open(path, "rb") as file:
+        data = file.read(size)
+    return read_csv_typed(io.BytesIO(data), OS_SCHEMA, **_CSV_OPTIONS)
+
+
+def _complete_lines_end(path: str, size: int) -> int:
+    """
+    Returns the offset just past the last newline within the first `size` bytes of a file.
+
+    A last line without its newline may still be being written, so loaders stop before
+    it and the watcher reads it once complete, like `read_appended_rows`. A file with no
+    newline at all (a lone header) is taken whole.
+    """
+    with open(path, "rb") as file:
+        end = size
+        while end > 0:
+            start = max(0, end - _LINE_SCAN_SIZE)
+            file.seek(start)
+            position = file.read(end - start).rfind(b"\n")
+            if position >= 0:
+                return start + position + 1
+            end = start
+    return size
+
+
+def _load_matrix(data_dir: str, refresh: bool) -> pd.DataFrame:
+    path = os.path.join(data_dir, MATRIX_FILE)
+    # The flag is stored in the snapshot; the rules signature rebuilds it when a rule changes.
+    variant = (
+        f"matrix|{sorted(_CSV_OPTIONS.items())!r}|{sorted(MATRIX_SCHEMA.items())!r}|"
+        f"{BLACKLIST_PATTERN}|{MATRIX_COLUMNS!r}|{AUTO_RULES.signature}"
+    )
+    return load_snapshot(path, lambda: read_matrix(path), variant, refresh=refresh)
+
+
+def _load_os(data_dir: str, refresh: bool) -> pd.DataFrame:
+    path = os.path.join(data_dir, OS_FILE)
+    variant = f"os|{sorted(_CSV_OPTIONS.items())!r}|{sorted(OS_SCHEMA.items())!r}"
+    # The frame (parsed or from the snapshot) holds the complete lines of the bytes this
+    # fingerprint describes; a half-written last line is left to the watcher.
+    fingerprint = file_fingerprint(path)
+    offset = _complete_lines_end(path, fingerprint["size"])
+    df = load_snapshot(path, lambda: _read_os(path, offset), variant, refresh=refresh, fingerprint=fingerprint)
+    df.attrs[SOURCE_OFFSET] = offset
+    return df
+
+
+# Dataset -> (source file, reader) of the CSV sources, which are read with a declared schema.
+TYPED_SOURCES = {
+    "matrix": (MATRIX_FILE, read_matrix),
+    "os": (OS_FILE, _read_os),
+}
+
+
+def source_memory_report(data_dir: str, name: str) -> pd.DataFrame:
+    """
+    Reads a CSV source twice, as a plain `pd.read_csv` and as its loader does, and
+    compares their memory.
+
+    Both reads bypass the snapshot cache, so this takes as long as two cold loads.
+
+    Args:
+        data_dir (str): Directory containing the source files.
+        name (str): The dataset name, "matrix" or "os".
+
+    Returns:
+        pd.DataFrame: The per-column comparison (see `schema.memory_report`).
+    """
+    file_name, reader = TYPED_SOURCES[name]
+    path = os.path.join(data_dir, file_name)
+    return memory_report(pd.read_csv(path, **_CSV_OPTIONS), reader(path))
+
+
+def read_appended_rows(path: str, offset: int, columns: list[str]) -> tuple[pd.DataFrame, int]:
+    """
+    Parses the complete lines added to a CSV source (e.g. os.csv) after `offset` bytes.
+
+    A last line without its newline is still being written; it is left for the next call.
+
+    Args:
+        path (str): The CSV file.
+        offset (int): Bytes already parsed; must be at the start of a line.
+        columns (list[str]): The columns to keep, e.g. those of the loaded frame. The new
+                             lines are matched to them through the file's header.
+
+    Returns:
+        tuple[pd.DataFrame, int]: The new rows and the offset just past the last complete line.
+    """
+    with open(path, "rb") as file:
+        header = pd.read_csv(file, nrows=0, **_CSV_OPTIONS).columns.tolist()
+        file.seek(offset)
+        data = file.read()
+    end = data.rfind(b"\n") + 1
+    if not data[:end].strip():
+        return pd.DataFrame(columns=columns), offset + end
+    rows = pd.read_csv(
+        io.BytesIO(data[:end]), header=None, names=header, usecols=lambda column: column in columns, **_CSV_OPTIONS
+    )
+    return rows.reindex(columns=columns), offset + end
+
+
+def _sheet_loader(sheet_name: str) -> Callable[[str, bool], pd.DataFrame]:
+    def loader(data_dir: str, refresh: bool) -> pd.DataFrame:
+        return load_excel(os.path.join(data_dir, WORKBOOK_FILE), sheet_name, refresh=refresh)
+    return loader
+
+
+# Dataset name -> loader(data_dir, refresh). The names match the former module globals.
+DEFAULT_LOADERS: dict[str, Callable[[str, bool], pd.DataFrame]] = {
+    "matrix": _load_matrix,
+    "os": _load_os,
+    "bd_filters": _sheet_loader("BD_FILTROS"),
+    "stock": _sheet_loader("Saldo Almoxarifado"),
+    "itens_prices": _sheet_loader("Valor das peças"),
+}
+
+
+class DataStore:
+    """
+    Holds the toolkit's dataframes and loads each of them on first access.
+
+    Frames can be injected through keyword arguments (e.g. `DataStore(os=small_df)`),
+    which is how tests provide small datasets without touching the disk.
+
+    Attributes:
+        data_dir (str): Directory containing the source files.
+    """
+    def __init__(self, data_dir: str = ".", loaders: dict | None = None, **frames: pd.DataFrame):
+        """
+        Initializes an empty store.
+
+        Args:
+            data_dir (str, optional): Directory containing the source files. Defaults to ".".
+            loaders (dict, optional): Dataset name -> loader(data_dir, refresh) overrides.
+            **frames (pd.DataFrame): Preloaded datasets, keyed by dataset name.
+        """
+        unknown = set(frames) - set(DEFAULT_LOADERS) - set(loaders or {})
+        if unknown:
+            raise ValueError(f"Unknown datasets: {', '.join(sorted(unknown))}")
+
+        self.data_dir = data_dir
+        self._loaders = {**DEFAULT_LOADERS, **(loaders or {})}
+        self._frames: dict[str, pd.DataFrame] = dict(frames)
+        self._derived: dict[str, tuple[tuple[str, ...], object, Callable | None]] = {}
+        self._lock = threading.RLock()
+        self._load_locks = {name: threading.Lock() for name in self._loaders}
+        self._derived_locks: dict[str, threading.Lock] = {}
+        self._warm_thread: threading.Thread | None = None
+
+    # --- Datasets ---
+
+    def get(self, name: str) -> pd.DataFrame:
+        """
+        Returns a dataset, loading it on first access.
+
+        Args:
+            name (str): The dataset name, e.g. "matrix" or "os".
+
+        Returns:
+            pd.DataFrame: The loaded dataset.
+
+        Raises:
+            KeyError: If the dataset name is unknown.
+            FileNotFoundError: If the dataset's source file does not exist.
+        """
+        frame = self._frames.get(name)
+        if frame is not None:
+            return frame
+
+        # One lock per dataset: concurrent callers wait for a single load instead of
+        # parsing the same file twice, while other datasets can load in parallel.
+        with self._load_locks[name]:
+            frame = self._frames.get(name)
+            if frame is None:
+                frame = self._loaders[name](self.data_dir, False)
+                self._frames[name] = frame
+        return frame
+
+    def is_loaded(self, name: str) -> bool:
+        """Returns True if a dataset is already in memory."""
+        return name in self._frames
+
+    @property
+    def matrix(self) -> pd.DataFrame:
+        return self.get("matrix")
+
+    @property
+    def os(self) -> pd.DataFrame:
+        return self.get("os")
+
+    @property
+    def bd_filters(self) -> pd.DataFrame:
+        return self.get("bd_filters")
+
+    @property
+    def stock(self) -> pd.DataFrame:
+        return self.get("stock")
+
+    @property
+    def itens_prices(self) -> pd.DataFrame:
+        return self.get("itens_prices")
+
+    def reload(self, name: str) -> pd.DataFrame:
+        """
+        Reads a dataset again from its source, without swapping it in (see `replace`).
+
+        The snapshot cache is still used, so an unchanged source is not re-parsed.
+
+        Args:
+            name (str): The dataset name.
+
+        Returns:
+            pd.DataFrame: The freshly loaded dataset.
+        """
+        return self._loaders[name](self.data_dir, False)
+
+    def replace(self, **frames: pd.DataFrame) -> None:
+        """
+        Swaps in new versions of one or more datasets.
+
+        Derived structures built from the replaced datasets are dropped in the same step,
+        so readers never combine a new frame with a stale index.
+
+        Args:
+            **frames (pd.DataFrame): New datasets, keyed by dataset name.
+        """
+        with self._lock:
+            self._frames.update(frames)
+            for key, (depends_on, _, _) in list(self._derived.items()):
+                if set(depends_on) & set(frames):
+                    del self._derived[key]
+
+    def append(self, name: str, rows: pd.DataFrame) -> None:
+        """
+        Appends rows to a loaded dataset, e.g. the lines added to os.csv since it was read.
+
+        Derived structures built only from that dataset and registered with an `extend`
+        function are updated with the new rows; the others are dropped. The new frame and
+        the updated structures are published in the same step.
+
+        Args:
+            name (str): The dataset name.
+            rows (pd.DataFrame): The new rows, with the dataset's columns.
+        """
+        with self._lock:
+            frame = append_typed(self.get(name), rows)
+            for key, (depends_on, value, extend) in list(self._derived.items()):
+                if name not in depends_on:
+                    continue
+                if extend is None or len(depends_on) > 1:
+                    del self._derived[key]
+                else:
+                    extend(value, rows)
+            self._frames[name] = frame
+
+    def warm(self, names: list[str] | None = None, background: bool = True) -> threading.Thread | None:
+        """
+        Loads datasets ahead of time, optionally on a daemon thread.
+
+        Missing files are ignored here; they surface as FileNotFoundError when the
+        dataset is actually requested.
+
+        Args:
+            names (list[str], optional): Datasets to load. Defaults to all of them.
+            background (bool, optional): If True, loads on a background thread and returns it.
+
+        Returns:
+            threading.Thread | None: The warming thread, or None when loading synchronously.
+        """
+        names = list(names or self._loaders)
+
+        def run() -> None:
+            for name in names:
+                try:
+                    self.get(name)
+                except (FileNotFoundError, ValueError):
+                    pass
+
+        if not background:
+            run()
+            return None
+        self._warm_thread = threading.Thread(target=run, name="datastore-warm", daemon=True)
+        self._warm_thread.start()
+        return self._warm_thread
+
+    def rebuild_snapshots(self) -> None:
+        """
+        Re-parses every file-backed dataset, rewriting its binary snapshot.
+        """
+        frames = {}
+        for name, loader in self._loaders.items():
+            try:
+                frames[name] = loader(self.data_dir, True)
+            except FileNotFoundError:
+                pass
+        self.replace(**frames)
+
+    # --- Derived structures ---
+
+    def peek(self, key: str) -> object | None:
+        """
+        Returns a derived structure if it was already built, without building it.
+
+        Args:
+            key (str): The name passed to `derived`.
+
+        Returns:
+            object | None: The structure, or None if it was not built for the current data.
+        """
+        entry = self._derived.get(key)
+        return entry[1] if entry is not None else None
+
+    def derived(self, key: str, builder: Callable[["DataStore"], object], depends_on: tuple[str, ...],
+                extend: Callable[[object, pd.DataFrame], None] | None = None) -> object:
+        """
+        Returns a structure computed from the store, building it once per data load.
+
+        Args:
+            key (str): Unique name of the derived structure.
+            builder (Callable[[DataStore], object]): Builds the structure from this store.
+            depends_on (tuple[str, ...]): Datasets the structure is built from. Replacing
+                                          any of them discards the cached structure.
+            extend (Callable[[object, pd.DataFrame], None], optional): Updates the structure
+                in place with rows appended to its single dataset (see `append`), instead
+                of discarding it.
+
+        Returns:
+            object: The cached or freshly built structure.
+        """
+        entry = self._derived.get(key)
+        if entry is not None:
+            return entry[1]
+
+        with self._lock:
+            lock = self._derived_locks.setdefault(key, threading.Lock())
+        with lock:
+            entry = self._derived.get(key)
+            if entry is not None:
+                return entry[1]
+            frames = {name: self.get(name) for name in depends_on}
+            value = builder(self)
+            with self._lock:
+                # Only publish if no dataset was replaced while building.
+                if all(self._frames.get(name) is frame for name, frame in frames.items()):
+                    self._derived[key] = (tuple(depends_on), value, extend)
+        return value
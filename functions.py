@@ -1,121 +1,147 @@
-import tkinter as tk
-from tkinter import messagebox
-import pandas as pd
+from __future__ import annotations
+
+import datetime
+import os
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from io import StringIO
+from typing import Iterable, Iterator, NamedTuple, TextIO
+from cache import LRUCache
+from datastore import DataStore, add_tire_service_flag, filter_matrix, matrix_keys
+from instrumentation import instrumented, register_cache
+from lazy import lazy_import
+from sqlstore import DATABASE_FILE, SQLiteStore, quote, write_database
+from tire_rules import AUTO_RULES, MANUAL_RULES, TIRE_SERVICE_COLUMN, RuleSet, classification_cache_info
+
+# pandas and numpy are only imported when a data-backed function first needs them.
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
 
 
-# --- Global Data Loading ---
-# NOTE: Loading dataframes globally is generally not recommended as it creates hidden dependencies
-# and makes functions harder to test independently. This section is kept for compatibility with the
-# original project structure, but a refactor to pass dataframes as arguments or use a dedicated
-# data loading class would be a significant improvement.
-# I will do my best to refactor this in a more secure/clean way later, i just need the time to do so.
+# --- Data Access ---
+# Dataframes are no longer loaded at import time. Data-backed functions receive a
+# `DataStore`, which loads each source on first access, so text-only features start
+# immediately. When no store is given, a shared module-level store is used.
 
-try:
-    # Attempt to load CSV and Excel files required by various functions.
-    df_matrix = pd.read_csv("matriz.csv", sep=";", encoding="latin1", low_memory=False)
-    df_os = pd.read_csv("os.csv", sep=";", encoding="latin1", low_memory=False)
-    bd_filters = pd.read_excel("planilha.xlsx", sheet_name="BD_FILTROS")
-    stock = pd.read_excel("planilha.xlsx", sheet_name="Saldo Almoxarifado")
-    itens_prices = pd.read_excel("planilha.xlsx", sheet_name="Valor das peças")
-except FileNotFoundError:
-    # This pass is intended to allow the application to run in environments where
-    # these specific data files are not present (e.g., for third-party testing).
-    # However, functions depending on these dataframes will fail if called.
-    pass
+_default_store = DataStore()
 
 
-def process_orders(input_text: tk.Text, separator_entry: tk.Entry, output_text: tk.Text) -> None:
+def get_default_store() -> DataStore:
+    """
+    Returns the shared DataStore used when a function is called without one.
+
+    Returns:
+        DataStore: The module-level store, reading sources from the working directory.
     """
-    Finds all valid service order numbers from an input widget, joins them with a
-    specified separator, and displays the result in an output widget.
+    return _default_store
+
+
+# --- Core API ---
+# Everything in this module works on plain data (strings, lists, dataframes) and reports
+# problems by raising ValueError with a user-facing message. Tkinter adapters live in
+# `main.py` and the command line interface in `cli.py`.
+
+
+# A valid service order starts with 621 followed by 5 digits.
+ORDER_PATTERN = re.compile(r"\b621\d{5}\b")
+_ORDER_LENGTH = 8
+SCAN_CHUNK_SIZE = 1 << 20
+
+
+@instrumented(size="text", unit="chars")
+def extract_orders(text: str) -> list[str]:
+    """
+    Finds all valid service order numbers in a text.
 
     A valid service order is defined by the regex pattern `\\b621\\d{5}\\b`.
 
     Args:
-        input_text (tk.Text): The Tkinter Text widget containing the raw text with service orders.
-        separator_entry (tk.Entry): The Tkinter Entry widget for the desired separator.
-                                      If empty, a comma "," is used by default.
-        output_text (tk.Text): The Tkinter Text widget where the formatted string of
-                               service orders will be displayed.
+        text (str): The raw text with service orders.
+
+    Returns:
+        list[str]: The service orders, in the order they appear.
+    """
+    return ORDER_PATTERN.findall(text)
+
+
+@instrumented(size="text", unit="chars")
+def join_orders(text: str, separator: str = ",") -> str:
     """
-    # Define the regex pattern for a valid service order (starts with 621 followed by 5 digits).
-    orders_pattern = r"\b621\d{5}\b"
+    Finds all valid service order numbers in a text and joins them with a separator.
 
-    # Get text from the input widget and find all matching orders.
-    text_content = input_text.get("1.0", tk.END)
-    orders = re.findall(orders_pattern, text_content)
+    Args:
+        text (str): The raw text with service orders.
+        separator (str, optional): The desired separator. If empty, a comma "," is used.
 
-    # Get the user-defined separator, defaulting to "," if empty.
-    separator = separator_entry.get()
-    if not separator:
-        separator = ","
+    Returns:
+        str: The joined service orders.
 
+    Raises:
+        ValueError: If no service order was found.
+    """
     # Join the found orders into a single string.
-    new_orders = separator.join(orders)
+    new_orders = (separator or ",").join(extract_orders(text))
 
-    # If no orders were found, show a warning and exit.
     if not new_orders:
-        messagebox.showwarning("Atenção", "Não existe nenhuma ordem a ser processada")
-        return
-
-    # Clear the output widget and insert the processed orders.
-    output_text.delete("1.0", tk.END)
-    output_text.insert(tk.END, new_orders)
+        raise ValueError("Não existe nenhuma ordem a ser processada")
+    return new_orders
 
 
-def process_text(ptext_input: tk.Text, separator_entry: tk.Entry, space_choice: bool, output_text: tk.Text) -> None:
+@instrumented(unit="pieces")
+def iter_joined_text(lines: Iterable[str], separator: str = ", ", space_choice: bool = False) -> Iterator[str]:
     """
-    Processes a block of text by joining its content with a specified separator.
-    It can either replace all whitespace with the separator or only newlines,
-    based on the `space_choice` flag.
+    Lazily joins lines of text with a separator, yielding the output piece by piece.
 
-    Args:
-        ptext_input (tk.Text): The Tkinter Text widget with the text to process.
-        separator_entry (tk.Entry): The Tkinter Entry widget for the separator.
-                                      Defaults to ", " if empty.
-        space_choice (bool): If True, preserves spaces within lines and only replaces
-                             newlines with the separator. If False, replaces all
-                             whitespace (spaces and newlines) with the separator.
-        output_text (tk.Text): The Tkinter Text widget to display the result.
-    """
-    text = ptext_input.get("1.0", tk.END).strip()
-    lines = text.split("\n")
+    Each line is stripped. Blank lines at the start and end are dropped, while blank lines
+    in the middle still produce a separator each. Unless `space_choice` is True, every run
+    of spaces inside a line is also replaced by a single separator.
 
-    separator = separator_entry.get()
-    if separator == "":
-        separator = ", "
+    Args:
+        lines (Iterable[str]): The source lines, e.g. `text.split("\\n")`, an open file or stdin.
+        separator (str, optional): The separator. Defaults to ", ".
+        space_choice (bool, optional): If True, preserves spaces within lines. Defaults to False.
 
-    new_text = ""
-    last_is_space = False  # Flag to prevent multiple separators for consecutive spaces.
+    Yields:
+        str: Consecutive pieces of the joined text.
+    """
+    started = False
+    pending_blank_lines = 0
 
     for line in lines:
         line = line.strip()
-        for char in line:
-            # If space replacement is enabled and the character is a space...
-            if char == " " and not space_choice:
-                # Add separator only if the previous character wasn't also a space.
-                if not last_is_space:
-                    new_text += separator
-                    last_is_space = True
-            else:
-                new_text += char
-                last_is_space = False
+        if not line:
+            if started:
+                pending_blank_lines += 1
+            continue
 
-        # Add a separator after each processed line (which originally was a newline).
-        new_text += separator
+        if started:
+            yield separator * (pending_blank_lines + 1)
+        if not space_choice:
+            # Consecutive spaces collapse into a single separator.
+            line = separator.join(part for part in line.split(" ") if part)
+        yield line
 
-    if not text:
-        messagebox.showwarning("Atenção", "Nenhum texto inserido")
-        return
+        started = True
+        pending_blank_lines = 0
+
+
+@instrumented(size="lines", unit="lines")
+def join_text(lines: Iterable[str], separator: str = ", ", space_choice: bool = False) -> str:
+    """
+    Joins lines of text with a separator in linear time.
+
+    See `iter_joined_text` for the rules; the pieces are assembled with a single join.
 
-    # Clean up any trailing separator at the end of the final string.
-    if new_text.endswith(separator):
-        new_text = new_text[: -len(separator)]
+    Args:
+        lines (Iterable[str]): The source lines, e.g. `text.split("\\n")`, an open file or stdin.
+        separator (str, optional): The separator. Defaults to ", ".
+        space_choice (bool, optional): If True, preserves spaces within lines. Defaults to False.
 
-    output_text.delete("1.0", tk.END)
-    output_text.insert(tk.END, new_text)
+    Returns:
+        str: The joined text, or an empty string if there was nothing to join.
+    """
+    return "".join(iter_joined_text(lines, separator, space_choice))
 
 
 def increase_time(time_str: str, minutes_to_add: int) -> str:
@@ -184,10 +210,7 @@ def _parse_interval(interval_str: str, choice: str = "") -> list:
                 raise ValueError("Insira um intervalo de sequência válido.")
         # Case 3: Tab-separated data from external software
         except ValueError:
-            df = pd.read_csv(StringIO(interval_str), sep="\t", header=None, engine="python")
-            df = df.reset_index()
-            df["index"] = df["index"] + 1
-            tire_service, general = split_tire_service(df)
+            tire_service, general = split_pasted_tire_service(interval_str)
 
             if choice == "tire_service":
                 if not tire_service:
@@ -203,9 +226,86 @@ def _parse_interval(interval_str: str, choice: str = "") -> list:
     return total_interval
 
 
-def work_logs(service_order: str, interval_str: str, date: str, starting_time: str, ending_time: str, choice: str = "") -> str:
+MINUTES_PER_DAY = 24 * 60
+
+
+# "HH:MM" for every minute of a day, so formatting a time is a list lookup.
+_CLOCK = [f"{hour:02d}:{minute:02d}" for hour in range(24) for minute in range(60)]
+
+
+@instrumented(size="count", unit="sequences")
+def schedule_minutes(total_minutes: int, count: int) -> np.ndarray:
+    """
+    Splits a window of `total_minutes` into `count` consecutive slices, all at once.
+
+    Slice boundaries are `total_minutes * i // count`, computed in exact integer
+    arithmetic, so durations differ by at most one minute and always add up to the window.
+
+    Args:
+        total_minutes (int): The length of the window in minutes.
+        count (int): The number of slices.
+
+    Returns:
+        np.ndarray: The `count + 1` boundaries, in minutes from the start of the window.
+                    Slice `i` runs from `bounds[i]` to `bounds[i + 1]`.
+    """
+    return np.arange(count + 1, dtype=np.int64) * total_minutes // count
+
+
+def _format_log_lines(service_order: str, sequences: list, first_day: datetime.date, start_minute: int,
+                      bounds: np.ndarray) -> str:
+    """
+    Formats one log line per sequence from precomputed slice boundaries.
+
+    Each boundary is converted to a "date<TAB>time" stamp once (it is the end of one slice
+    and the start of the next), and dates and durations are formatted once per distinct value.
+    """
+    days, minute_of_day = np.divmod(bounds + start_minute, MINUTES_PER_DAY)
+    durations = np.diff(bounds)
+
+    dates = {
+        day: (first_day + datetime.timedelta(days=day)).strftime("%d/%m/%Y")
+        for day in np.unique(days).tolist()
+    }
+    hours_worked = {
+        minutes_worked: f"{minutes_worked / 60:.2f}".replace(".", ",")
+        for minutes_worked in np.unique(durations).tolist()
+    }
+    stamps = [f"{dates[day]}\t{_CLOCK[minute]}" for day, minute in zip(days.tolist(), minute_of_day.tolist())]
+
+    prefix = f"{service_order}\t\t\t"
+    padding = "\t" * 10
+    return "".join([
+        f"{prefix}{sequence}{padding}{start}\t{end}\t{hours_worked[worked]}\n"
+        for sequence, start, end, worked in zip(sequences, stamps, stamps[1:], durations.tolist())
+    ])
+
+
+@instrumented(size=lambda logs: logs.count("\n"), unit="sequences")
+def work_logs(service_order: str, interval_str: str, date: str, starting_time: str, ending_time: str,
+              choice: str = "", end_date: str = "") -> str:
     """
     Generates formatted work log entries for a given time period and sequence intervals.
+
+    The window is split in integer minutes for all sequences at once. If the ending time is
+    earlier than the starting time, the window crosses midnight; `end_date` allows windows
+    spanning several days. Each line carries its own start and end date.
+
+    Args:
+        service_order (str): The service order number.
+        interval_str (str): The sequences, as accepted by `_parse_interval`.
+        date (str): The starting date (dd/mm/yyyy).
+        starting_time (str): The starting time (hh:mm).
+        ending_time (str): The ending time (hh:mm).
+        choice (str, optional): "tire_service" to keep only tire sequences of pasted tasks.
+        end_date (str, optional): The ending date (dd/mm/yyyy). Defaults to `date`, or the
+                                  next day when the window crosses midnight.
+
+    Returns:
+        str: One tab-separated line per sequence.
+
+    Raises:
+        ValueError: If any input is invalid or the window is too short.
     """
     # --- Input Validation and Sanitization ---
     date_pattern = r"^(\d{2})[\/]?(\d{2})[\/]?(\d{4})$"
@@ -217,17 +317,23 @@ def work_logs(service_order: str, interval_str: str, date: str, starting_time: s
     service_order = service_order.strip()
 
     r_date = re.search(date_pattern, date.strip())
+    r_end_date = re.search(date_pattern, end_date.strip()) if end_date.strip() else None
     s_time = re.search(time_pattern, starting_time.strip())
     e_time = re.search(time_pattern, ending_time.strip())
 
-    if not r_date:
+    if not r_date or (end_date.strip() and not r_end_date):
         raise ValueError("Por favor, insira uma data válida.")
     if not s_time or not e_time:
         raise ValueError("Por favor, insira um intervalo de tempo válido.")
 
-    # Reformat date to ensure it has slashes for consistency.
-    day, month, year = r_date.groups()
-    date = f"{day}/{month}/{year}"
+    try:
+        day, month, year = map(int, r_date.groups())
+        first_day = datetime.date(year, month, day)
+        if r_end_date:
+            day, month, year = map(int, r_end_date.groups())
+            last_day = datetime.date(year, month, day)
+    except ValueError:
+        raise ValueError("Por favor, insira uma data válida.")
 
     # --- Interval Parsing ---
     total_interval = _parse_interval(interval_str, choice)
@@ -235,94 +341,171 @@ def work_logs(service_order: str, interval_str: str, date: str, starting_time: s
     # --- Time Calculation ---
     starting_hours, starting_minutes = map(int, s_time.groups())
     ending_hours, ending_minutes = map(int, e_time.groups())
+    if starting_hours > 23 or ending_hours > 23 or starting_minutes > 59 or ending_minutes > 59:
+        raise ValueError("Por favor, insira um intervalo de tempo válido.")
 
-    total_minutes_available = (ending_hours - starting_hours) * 60 + (ending_minutes - starting_minutes)
+    start_minute = starting_hours * 60 + starting_minutes
+    end_minute = ending_hours * 60 + ending_minutes
+
+    if r_end_date:
+        end_minute += (last_day - first_day).days * MINUTES_PER_DAY
+    elif end_minute < start_minute:
+        # Without an explicit end date, an earlier ending time means the next day.
+        end_minute += MINUTES_PER_DAY
+
+    total_minutes_available = end_minute - start_minute
 
     if total_minutes_available < 0:
         raise ValueError("Conserte o horário inserido e pare de fazer cagada!.")
 
-    try:
-        time_per_interval = total_minutes_available / len(total_interval)
-    except ZeroDivisionError:
+    if not total_interval:
         raise ValueError("O intervalo de sequências não pode estar vazio.")
 
-    if time_per_interval < 1:
+    if total_minutes_available < len(total_interval):
         raise ValueError("O tempo mínimo necessário para cada sequência é de um minuto, por favor, aumente o intervalo de tempo ou diminua a quantidade de sequências.")
 
     # --- Log Generation ---
-    output_text = ""
-    for idx, interval_num in enumerate(total_interval):
-        start_offset = int(time_per_interval * idx)
-        end_offset = int(time_per_interval * (idx + 1))
+    bounds = schedule_minutes(total_minutes_available, len(total_interval))
+    return _format_log_lines(service_order, total_interval, first_day, start_minute, bounds)
 
-        log_start_time = increase_time(starting_time, start_offset)
-        log_end_time = increase_time(starting_time, end_offset)
 
-        total_hours = time_str_to_decimal(log_end_time) - time_str_to_decimal(log_start_time)
-        formatted_total_hours = f"{total_hours:.2f}".replace(".", ",")
+class OrderMatch(NamedTuple):
+    """One service order found by `scan_orders`, with the running count so far."""
+    count: int
+    path: str
+    order: str
 
-        output_text += f"{service_order}\t\t\t{interval_num}\t\t\t\t\t\t\t\t\t\t{date}\t{log_start_time}\t{date}\t{log_end_time}\t{formatted_total_hours}\n"
 
-    return output_text
+@instrumented(unit="orders")
+def iter_orders_in_stream(stream: TextIO, chunk_size: int = SCAN_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Finds service orders in a text stream of any size, reading it in fixed-size chunks.
+
+    The last characters of each chunk are carried over to the next one, so orders that
+    straddle a chunk boundary are found exactly once and word boundaries are checked
+    against the real neighbouring characters. Memory use depends only on `chunk_size`.
 
+    Args:
+        stream (TextIO): An open text stream, e.g. a file or `sys.stdin`.
+        chunk_size (int, optional): Number of characters read at a time. Defaults to 1 MiB.
 
-def search_orders(search_input: tk.Text, search_output: tk.Text, number_of_lines_label: tk.Label) -> None:
+    Yields:
+        str: Each service order, in stream order.
+    """
+    buffer = ""
+    start = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        buffer += chunk
+        if not chunk:
+            for match in ORDER_PATTERN.finditer(buffer, start):
+                yield match.group()
+            return
+
+        # Matches starting at `cut` or later may continue in the next chunk, and need
+        # at least one following character to confirm the closing word boundary.
+        cut = max(start, len(buffer) - _ORDER_LENGTH)
+        for match in ORDER_PATTERN.finditer(buffer, start):
+            if match.start() >= cut:
+                break
+            yield match.group()
+
+        # Keep one character before `cut` so the opening word boundary stays correct.
+        context = max(cut - 1, 0)
+        buffer = buffer[context:]
+        start = cut - context
+
+
+@instrumented(unit="orders")
+def iter_orders_in_file(path: str, chunk_size: int = SCAN_CHUNK_SIZE, encoding: str = "utf-8") -> Iterator[str]:
     """
-    Searches for valid service order numbers within a text widget and displays the
-    results in another widget, along with a count of found orders.
+    Finds service orders in a file of any size. See `iter_orders_in_stream`.
 
     Args:
-        search_input (tk.Text): The widget containing the text to search through.
-        search_output (tk.Text): The widget where the found orders will be displayed.
-        number_of_lines_label (tk.Label): The label to update with the count of found orders.
+        path (str): The file to scan.
+        chunk_size (int, optional): Number of characters read at a time. Defaults to 1 MiB.
+        encoding (str, optional): The file encoding. Undecodable bytes are replaced.
+
+    Yields:
+        str: Each service order, in file order.
     """
-    text = search_input.get("1.0", tk.END).replace("\n", " ")
-    pattern = r"\b621\d{5}\b"
-    found_orders = re.findall(pattern, text)
+    with open(path, encoding=encoding, errors="replace", newline="") as file:
+        yield from iter_orders_in_stream(file, chunk_size)
 
-    search_output.delete("1.0", tk.END)
 
-    if found_orders:
-        result = " ".join(found_orders)
-        search_output.insert(tk.END, result)
-        number_of_lines_label.config(text=f"Quantidade de ordens encontradas: {len(found_orders)}")
-    else:
-        messagebox.showwarning("Atenção", "Nenhuma ordem encontrada")
-        number_of_lines_label.config(text="Quantidade de ordens encontradas: 0")
+def _orders_in_file(args: tuple[str, int, str]) -> list[str]:
+    """Worker entry point: returns all orders of one file."""
+    path, chunk_size, encoding = args
+    return list(iter_orders_in_file(path, chunk_size, encoding))
 
 
-def get_equipment_items(choice: int) -> pd.DataFrame:
-    """
-    Fetches and merges data related to equipment items based on a fleet number.
+def _expand_paths(paths: Iterable[str]) -> Iterator[str]:
+    """Yields the given files, and every file below the given directories, in sorted order."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    yield os.path.join(root, name)
+        else:
+            yield path
 
-    This function queries several pre-loaded pandas DataFrames (bd_filters, stock, itens_prices)
-    to compile a final DataFrame with details about parts, stock, and prices for a given
-    equipment fleet number.
 
-    Args:
-        choice (int): The fleet number of the equipment.
+@instrumented(unit="orders")
+def scan_orders(paths: Iterable[str], workers: int = 1, chunk_size: int = SCAN_CHUNK_SIZE,
+                encoding: str = "utf-8") -> Iterator[OrderMatch]:
+    """
+    Extracts service orders from files and directories without loading them whole.
 
-    Returns:
-        pd.DataFrame: A DataFrame containing the filtered and merged information about
-                      the equipment's items. Returns an empty DataFrame or None on error.
+    Args:
+        paths (Iterable[str]): Files and/or directories (scanned recursively).
+        workers (int, optional): Number of worker processes. With more than one, files are
+                                 scanned in parallel and results still come back in file order.
+        chunk_size (int, optional): Number of characters read at a time per file.
+        encoding (str, optional): The file encoding. Undecodable bytes are replaced.
+
+    Yields:
+        OrderMatch: Each order found, with its file and the running count.
     """
-    if not choice:
-        messagebox.showwarning("Atenção", "Por favor, insira uma frota")
-        return pd.DataFrame()
+    files = list(_expand_paths(paths))
+    count = 0
+
+    if workers <= 1 or len(files) <= 1:
+        for path in files:
+            for order in iter_orders_in_file(path, chunk_size, encoding):
+                count += 1
+                yield OrderMatch(count, path, order)
+        return
 
-    # Create copies to avoid modifying the global dataframes
-    local_bd_filters = bd_filters.set_index("FROTA")
-    local_stock = stock.set_index("Material")
-    local_itens_prices = itens_prices.set_index("Material")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_orders_in_file, [(path, chunk_size, encoding) for path in files])
+        for path, orders in zip(files, results):
+            for order in orders:
+                count += 1
+                yield OrderMatch(count, path, order)
 
-    try:
-        # Filter items for the selected fleet number.
-        equipment_items = local_bd_filters.loc[choice]
-    except KeyError:
-        messagebox.showwarning("Atenção", "Por favor, insira uma frota válida")
-        return pd.DataFrame()
 
-    equipment_items = equipment_items.reset_index()
+# Columns shown by the "Consulta filtros x frota" screen.
+_FLEET_COLUMNS = [
+    "PLANO REAL", "Tipo da peça", "Cod. Sap", "Texto breve material",
+    "Tipo de MRP", "QNTD."
+]
+
+
+def _build_fleet_table(store: DataStore) -> tuple[pd.DataFrame, dict]:
+    """
+    Joins bd_filters with prices and stock for every fleet at once.
+
+    The join is row-wise, so computing it over the whole sheet and slicing by fleet gives
+    the same rows, in the same order, as joining each fleet's items separately.
+
+    Returns:
+        tuple[pd.DataFrame, dict]: The cleaned table with `_FLEET_COLUMNS`, and a mapping
+                                   from fleet number to the positions of its rows.
+    """
+    local_itens_prices = store.itens_prices.set_index("Material")
+    local_stock = store.stock.set_index("Material")
+    equipment_items = store.bd_filters
 
     # Merge equipment items with their prices.
     final_df = pd.merge(
@@ -336,118 +519,275 @@ def get_equipment_items(choice: int) -> pd.DataFrame:
     # Join the result with stock quantity information.
     stock_quantity = local_stock[["Utilização livre"]]
     final_df = final_df.set_index("Cod. Sap").join(stock_quantity, how="left").reset_index()
+    fleet_positions = final_df.groupby("FROTA", sort=False).indices
 
-    # Define and filter for the columns required for the final output.
-    desired_columns = [
-        "PLANO REAL", "Tipo da peça", "Cod. Sap", "Texto breve material",
-        "Tipo de MRP", "QNTD."
-    ]
     # Ensure all desired columns exist, adding missing ones with default values if necessary.
-    for col in desired_columns:
+    for col in _FLEET_COLUMNS:
         if col not in final_df.columns:
             final_df[col] = None
 
-    final_df = final_df[desired_columns]
+    final_df = final_df[_FLEET_COLUMNS].copy()
 
-    # Clean up newline characters from string columns.
+    # Clean up newline characters from string columns (object, or "str" on pandas >= 3).
     for column in final_df.columns:
-        if final_df[column].dtype == "object":
+        if pd.api.types.is_string_dtype(final_df[column].dtype):
             final_df[column] = final_df[column].astype(str).str.replace("\n", "")
 
     # Sanitize quantity column.
     final_df["QNTD."] = final_df["QNTD."].fillna(0).astype(int)
 
-    return final_df
+    return final_df, fleet_positions
 
 
-def copy_text(widget: tk.Text, window: tk.Tk) -> None:
+@instrumented(size=len, unit="rows")
+def get_equipment_items(choice: int, store: DataStore | SQLiteStore | None = None) -> pd.DataFrame:
     """
-    Copies the entire content of a Tkinter Text widget to the clipboard.
+    Fetches data related to equipment items based on a fleet number.
+
+    The bd_filters x prices x stock join is materialized once per workbook load (see
+    `_build_fleet_table`), so each query is a single indexed slice of that table. A
+    SQLiteStore holds the same table, indexed by fleet.
 
     Args:
-        widget (tk.Text): The Text widget from which to copy the content.
-        window (tk.Tk): The root Tkinter window, used to access the clipboard.
-    """
-    text = widget.get("1.0", tk.END).strip()
-    if text:
-        window.clipboard_clear()
-        window.clipboard_append(text)
-        window.update()  # Required to make the clipboard content available immediately.
-    else:
-        messagebox.showwarning("Atenção", "Nada a ser copiado")
+        choice (int): The fleet number of the equipment.
+        store (DataStore | SQLiteStore, optional): The data source. Defaults to the shared store.
+
+    Returns:
+        pd.DataFrame: A DataFrame containing the filtered and merged information about
+                      the equipment's items.
+
+    Raises:
+        ValueError: If no fleet number is given or the fleet is unknown.
+    """
+    if not choice:
+        raise ValueError("Por favor, insira uma frota")
+
+    store = store or _default_store
+    if isinstance(store, SQLiteStore):
+        items = store.read_frame(
+            f"SELECT {', '.join(map(quote, _FLEET_COLUMNS))} FROM fleet_items WHERE frota = ? ORDER BY position",
+            (choice,),
+        )
+        if items.empty:
+            raise ValueError("Por favor, insira uma frota válida")
+        return items
+
+    fleet_table, fleet_positions = store.derived(
+        "fleet_table", _build_fleet_table, ("bd_filters", "stock", "itens_prices")
+    )
+
+    positions = fleet_positions.get(choice)
+    if positions is None:
+        raise ValueError("Por favor, insira uma frota válida")
+
+    return fleet_table.iloc[positions].reset_index(drop=True)
+
 
+def _os_index_columns(df_os: pd.DataFrame) -> tuple[list[str], list[str], list[str]]:
+    """Returns the stripped O.S, MODELO and PLANO columns of os.csv rows as lists."""
+    return tuple(df_os[column].astype(str).str.strip().tolist() for column in ("O.S", "MODELO", "PLANO"))
 
-def get_equipment_and_plan(os_number: str) -> tuple[str, list] | tuple[bool, bool]:
+
+def _build_os_index(store: DataStore) -> dict[str, tuple[str, list[str]]]:
+    """
+    Builds the O.S -> (MODELO, PLANO list) index for a store's os.csv.
+
+    The first row of a repeated service order wins, matching the former row scan.
+    """
+    keys, models, plans = _os_index_columns(store.os)
+
+    # Iterate backwards so that earlier rows overwrite later duplicates.
+    return {
+        key: (model, plan.split("/"))
+        for key, model, plan in zip(reversed(keys), reversed(models), reversed(plans))
+    }
+
+
+def _extend_os_index(os_index: dict[str, tuple[str, list[str]]], rows: pd.DataFrame) -> None:
+    """Adds rows appended to os.csv to its index; orders already indexed keep their first row."""
+    for key, model, plan in zip(*_os_index_columns(rows)):
+        os_index.setdefault(key, (model, plan.split("/")))
+
+
+@instrumented()
+def get_equipment_and_plan(os_number: str,
+                           store: DataStore | SQLiteStore | None = None) -> tuple[str, list] | tuple[bool, bool]:
     """
     Retrieves the equipment model and maintenance plan(s) for a given service order number.
 
+    Lookups go through an O.S index built once per load of os.csv (a table in a SQLiteStore).
+
     Args:
         os_number (str): The service order number.
+        store (DataStore | SQLiteStore, optional): The data source. Defaults to the shared store.
 
     Returns:
         tuple[str, list]: A tuple containing the equipment model (str) and a list of plan
                           numbers (list of strings).
         tuple[bool, bool]: Returns (False, False) if the service order is not found.
     """
-    os_number_str = str(os_number).strip()
-    os_line = df_os[df_os["O.S"].astype(str).str.strip() == os_number_str]
-
-    if os_line.empty:
+    store = store or _default_store
+    key = str(os_number).strip()
+    if isinstance(store, SQLiteStore):
+        rows = store.query("SELECT modelo, plano FROM os_index WHERE os = ?", (key,))
+        if not rows:
+            return False, False
+        equipment, plan = rows[0]
+        return equipment, plan.split("/")
+
+    os_index = store.derived("os_index", _build_os_index, ("os",), extend=_extend_os_index)
+    entry = os_index.get(key)
+    if entry is None:
         return False, False
 
-    equipment = str(os_line.iloc[0]["MODELO"]).strip()
-    plan_str = str(os_line.iloc[0]["PLANO"]).strip()
+    equipment, plan_list = entry
+    # Return a copy so callers cannot alter the shared index.
+    return equipment, list(plan_list)
+
+
+_PLAN_COLUMNS = ["no_seq", "de_operacao", "de_tarefa", "de_sist_veic", "de_sub_sist", "de_compo", TIRE_SERVICE_COLUMN]
+_PLAN_SUBSET_COLUMNS = ["de_operacao", "de_sist_veic", "de_sub_sist", "de_compo"]
+PLAN_CACHE_SIZE = 256
+
+
+def _build_plan_groups(store: DataStore) -> tuple[set, dict[str, pd.DataFrame]]:
+    """
+    Prepares the maintenance matrix once per load for `fetch_plans`.
+
+    Warranty and blacklisted rows are removed and plan numbers converted (see
+    `datastore.filter_matrix`; a matrix read from disk was already filtered while loading),
+    and the surviving rows are grouped by `Chave`. The original row labels are kept so
+    that groups can be recombined in matrix order. Matrices that were not loaded from disk
+    (and so lack the precomputed tire-service flag) get it computed here.
+
+    Returns:
+        tuple[set, dict[str, pd.DataFrame]]: Every `Chave` present in the raw matrix, and
+                                             the prepared rows of each valid `Chave`.
+    """
+    df_matrix = store.matrix
+    prepared = filter_matrix(df_matrix)
+    if TIRE_SERVICE_COLUMN not in prepared.columns:
+        add_tire_service_flag(prepared)
+    keys = prepared["Chave"]
+    groups = {key: group for key, group in prepared.drop(columns="Chave").groupby(keys, sort=False, observed=True)}
+    return matrix_keys(df_matrix), groups
+
+
+def _plan_cache(store: DataStore) -> LRUCache:
+    return LRUCache(PLAN_CACHE_SIZE)
 
-    plan_list = plan_str.split("/")
-    return equipment, plan_list
 
+def _default_plan_cache_info() -> dict | None:
+    # Reported without building the cache, which would load the matrix.
+    cache = _default_store.peek("plan_cache")
+    return cache.info() if cache is not None else None
 
-def fetch_plans(equipment: str, plans: list[str]) -> pd.DataFrame:
+
+register_cache("classificação de tarefas", classification_cache_info)
+register_cache("fetch_plans", _default_plan_cache_info)
+
+
+def fetch_plans_cache_info(store: DataStore | None = None) -> dict:
+    """
+    Returns the hit/miss statistics of the `fetch_plans` result cache.
+
+    Args:
+        store (DataStore, optional): The data source. Defaults to the shared store.
+
+    Returns:
+        dict: The keys "hits", "misses", "size" and "maxsize".
+    """
+    store = store or _default_store
+    return store.derived("plan_cache", _plan_cache, ("matrix",)).info()
+
+
+@instrumented(size=len, unit="rows")
+def fetch_plans(equipment: str, plans: list[str], store: DataStore | SQLiteStore | None = None) -> pd.DataFrame:
     """
     Fetches maintenance tasks from the matrix based on equipment and plan numbers.
 
+    The matrix is prepared and grouped by `Chave` once per load, and final task lists are
+    kept in a bounded LRU cache keyed by `(equipment, tuple(plans))`. A SQLiteStore holds
+    the prepared rows indexed by `Chave` and plan, and is queried directly.
+
     Args:
         equipment (str): The equipment model identifier.
         plans (list[str]): A list of maintenance plan numbers.
+        store (DataStore | SQLiteStore, optional): The data source. Defaults to the shared store.
 
     Returns:
         pd.DataFrame: A DataFrame containing the filtered and cleaned maintenance tasks.
                       Returns an empty DataFrame if no matching tasks are found.
     """
-    # Ensure plan numbers are integers for correct filtering.
-    df_matrix["no_ref_prog"] = pd.to_numeric(df_matrix["no_ref_prog"], errors="coerce")
-    valid_plans = [int(p.strip()) for p in plans if p.strip().isdigit()]
+    store = store or _default_store
+    if isinstance(store, SQLiteStore):
+        return _fetch_plans_sqlite(equipment, plans, store)
 
-    # Create unique keys to filter the matrix dataframe.
-    keys = [f"{equipment}{p}N" for p in valid_plans]
-    df_equipment = df_matrix[df_matrix["Chave"].isin(keys)]
+    cache = store.derived("plan_cache", _plan_cache, ("matrix",))
+    key = (equipment, tuple(plans))
 
-    if df_equipment.empty:
-        return pd.DataFrame()
+    cached = cache.get(key)
+    if cached is None:
+        cached = _fetch_plans_uncached(equipment, plans, store)
+        cache.put(key, cached)
 
-    # Define a blacklist of maintenance types to exclude.
-    blacklist_pattern = "INSPEÇÃO|INS |HIBERNAÇÃO|ATIVAÇÃO DA HIBERNAÇÃO"
-    mask_blacklist = df_equipment["de_tp_manut"].str.upper().str.contains(blacklist_pattern, na=False)
+    # Callers may modify the returned frame; the cached one must stay intact.
+    return cached.copy()
 
-    # Apply all filters.
-    filtered_df = df_equipment[
-        (df_equipment["no_ref_prog"].isin(valid_plans)) &
-        (df_equipment["fg_garantia"] == "N") &
-        (~mask_blacklist)
-    ]
 
-    # Select and clean the final columns.
-    final_columns = ["no_seq", "de_operacao", "de_tarefa", "de_sist_veic", "de_sub_sist", "de_compo"]
-    filtered_df = filtered_df[final_columns]
+def _plan_keys(equipment: str, plans: list[str]) -> tuple[list[int], list[str]]:
+    """Returns the valid plan numbers and the unique `Chave` values they select."""
+    # Ensure plan numbers are integers for correct filtering.
+    valid_plans = [int(p.strip()) for p in plans if p.strip().isdigit()]
+
+    # Create unique keys to select the prepared groups of the matrix.
+    keys = list(dict.fromkeys(f"{equipment}{p}N" for p in valid_plans))
+    return valid_plans, keys
 
+
+def _finish_plan_rows(df_equipment: pd.DataFrame) -> pd.DataFrame:
+    """Removes duplicate tasks from rows in matrix order and renumbers their sequences."""
+    filtered_df = df_equipment[_PLAN_COLUMNS]
     # Remove duplicates and re-generate sequence numbers to ensure they are consecutive.
-    subset_cols = ["de_operacao", "de_sist_veic", "de_sub_sist", "de_compo"]
-    filtered_df = filtered_df.drop_duplicates(subset=subset_cols).reset_index(drop=True)
+    filtered_df = filtered_df.drop_duplicates(subset=_PLAN_SUBSET_COLUMNS).reset_index(drop=True)
     filtered_df["no_seq"] = range(1, len(filtered_df) + 1)
 
     return filtered_df
 
 
+def _fetch_plans_uncached(equipment: str, plans: list[str], store: DataStore) -> pd.DataFrame:
+    known_keys, groups = store.derived("plan_groups", _build_plan_groups, ("matrix",))
+    valid_plans, keys = _plan_keys(equipment, plans)
+    if not any(k in known_keys for k in keys):
+        return pd.DataFrame()
+
+    frames = [groups[k] for k in keys if k in groups]
+    if not frames:
+        return pd.DataFrame(columns=_PLAN_COLUMNS)
+
+    # Recombine groups in matrix order, as a full scan of the matrix would return them.
+    df_equipment = pd.concat(frames).sort_index(kind="stable")
+    return _finish_plan_rows(df_equipment.loc[df_equipment["no_ref_prog"].isin(valid_plans)])
+
+
+def _fetch_plans_sqlite(equipment: str, plans: list[str], store: SQLiteStore) -> pd.DataFrame:
+    valid_plans, keys = _plan_keys(equipment, plans)
+    marks = ", ".join("?" * len(keys))
+    if not keys or not store.query(f"SELECT 1 FROM plan_keys WHERE chave IN ({marks}) LIMIT 1", tuple(keys)):
+        return pd.DataFrame()
+
+    df_equipment = store.read_frame(
+        f"SELECT {', '.join(map(quote, _PLAN_COLUMNS))} FROM plan_tasks "
+        f"WHERE chave IN ({marks}) AND no_ref_prog IN ({', '.join('?' * len(valid_plans))}) ORDER BY position",
+        (*keys, *valid_plans),
+    )
+    if df_equipment.empty:
+        return pd.DataFrame(columns=_PLAN_COLUMNS)
+    # SQLite stores booleans as integers.
+    df_equipment[TIRE_SERVICE_COLUMN] = df_equipment[TIRE_SERVICE_COLUMN].astype(bool)
+    return _finish_plan_rows(df_equipment)
+
+
 def _normalize_and_rename_df(df: pd.DataFrame) -> pd.DataFrame:
     """
     Normalizes the input DataFrame to a consistent format with named columns.
@@ -481,86 +821,142 @@ def _normalize_and_rename_df(df: pd.DataFrame) -> pd.DataFrame:
     return renamed_df
 
 
-def split_tire_service(df: pd.DataFrame) -> tuple[list[int], list[int]]:
+def _split_task_rows(sequences: list, statuses: list, descriptions: list, components: list,
+                     rules: RuleSet | None = None) -> tuple[list[int], list[int]]:
     """
-    Separates tire service tasks from general tasks using a set of clear, maintainable rules.
+    Splits the pending tasks of a pasted list into tire and general service sequences.
+
+    Args:
+        sequences (list): The sequence number of each row.
+        statuses (list): The status of each row; only "N" (pending) rows are kept.
+        descriptions (list): The task description of each row.
+        components (list): The component of each row.
+        rules (RuleSet, optional): The classification rules. Defaults to `MANUAL_RULES`.
+
+    Returns:
+        tuple[list[int], list[int]]: The tire service and the general service sequences.
+    """
+    verdicts = (rules or MANUAL_RULES).classify_many(descriptions, components)
+    tire_service_sequences = []
+    general_service_sequences = []
+    for sequence, status, is_tire_service in zip(sequences, statuses, verdicts):
+        if not (isinstance(status, str) and status.strip() == 'N'):
+            continue
+        if is_tire_service:
+            tire_service_sequences.append(sequence)
+        else:
+            general_service_sequences.append(sequence)
+    return tire_service_sequences, general_service_sequences
+
+
+@instrumented(size="df", unit="rows")
+def split_tire_service(df: pd.DataFrame, rules: RuleSet | None = None) -> tuple[list[int], list[int]]:
+    """
+    Separates tire service tasks from general tasks of a pasted task list.
+
+    The inclusion, exclusion and precedence rules are declared in `tire_rules.MANUAL_RULES`
+    (or the given `rules`) and compiled into a single regex, so each description is scanned
+    only once.
     """
     norm_df = _normalize_and_rename_df(df)
 
     if norm_df.empty:
         return [], []
 
-    # --- Base Conditions ---
-    is_pending = norm_df['status'].str.strip() == 'N'
-    is_tire_component = norm_df['component'].str.strip().isin(['Roda', 'Pneu'])
-
-    # --- Inclusion Rules (conditions that identify a tire service) ---
+    return _split_task_rows(
+        norm_df['index'].tolist(), norm_df['status'].tolist(),
+        norm_df['description'].tolist(), norm_df['component'].tolist(), rules,
+    )
 
-    # Rule 2.3: Description contains "borracharia"
-    rule_borracharia = norm_df['description'].str.contains('borracharia', case=False, na=False)
 
-    # Rule 2.4 & 2.5: Description contains a specific integrity check for "(trincas..."
-    rule_specific_integrity = norm_df['description'].str.contains(
-        r'verificar a integridade \(trincas', case=False, na=False, regex=True
-    )
+# Strings that `pd.read_csv` reads as missing values by default.
+_NA_STRINGS = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
 
-    # Rule 2.1: Description contains general tire-related keywords
-    rule_pneu_keywords = norm_df['description'].str.contains(
-        r'pneus|pneu|verificar torque das porcas das rodas', case=False, na=False, regex=True
-    )
+# (status, description, component) columns of the two known export layouts.
+_STANDARD_LAYOUT = (0, 6, 10)
+_SPARSE_LAYOUT = (0, 8, 12)
 
-    # --- Exclusion Rules (conditions that disqualify a tire service) ---
 
-    # Rule 2.2: Description contains "pneum" (for pneumatic), which is not a tire service
-    is_pneumatic_system = norm_df['description'].str.contains('pneum', case=False, na=False)
+def _parse_pasted_rows(text: str) -> list[list[str]] | None:
+    """
+    Splits pasted tab-separated text into rows, skipping blank lines like `pd.read_csv`.
 
-    # Rule 2 & 2.5: General integrity checks or other specific non-tire tasks
-    # are excluded unless a more specific inclusion rule (like for "trincas") matches.
-    exclusion_keywords = [
-        "suspensões", "Sistema de freio", "Verificar guias",
-        "Verificar porca e parafuso das rodas", "Quando houver espaçador, retirar rodas"
-    ]
-    rule_general_exclusions = norm_df['description'].str.contains(
-        '|'.join(exclusion_keywords), case=False, na=False
-    )
-    # A generic "Verificar a integridade" is only an exclusion if the specific one didn't match
-    rule_generic_integrity_exclusion = norm_df['description'].str.contains(
-        "Verificar a integridade", case=False, na=False
-    ) & ~rule_specific_integrity
+    Returns None for input the plain split cannot reproduce exactly (a row wider than the
+    first one, or a bare carriage return), which is then left to pandas.
+    """
+    rows = []
+    for line in text.split("\n"):
+        if line.endswith("\r"):
+            line = line[:-1]
+        if "\r" in line:
+            return None
+        fields = line.split("\t")
+        # Lines without a tab that are empty or whitespace-only are not rows.
+        if len(fields) == 1 and not fields[0].strip():
+            continue
+        rows.append(fields)
+
+    if rows and any(len(fields) > len(rows[0]) for fields in rows):
+        return None
+    return rows
+
+
+@instrumented(size="text", unit="chars")
+def split_pasted_tire_service(text: str, rules: RuleSet | None = None) -> tuple[list[int], list[int]]:
+    """
+    Separates tire service tasks from general tasks of a task list pasted as text.
 
-    # --- Combine Logic ---
+    Produces the same result as reading the text with `pd.read_csv(sep="\\t")` and calling
+    `split_tire_service`, but only splits the lines and picks the three needed fields. The
+    layout is the sparse one (0/8/12) when column 2 is empty in every row, like in
+    `_normalize_and_rename_df`, and the standard one (0/6/10) otherwise.
 
-    # A service is a tire service if it meets any of the primary inclusion rules.
-    is_tire_service = (
-        rule_borracharia |
-        (is_tire_component & (rule_specific_integrity | rule_pneu_keywords))
-    )
+    Args:
+        text (str): The tab-separated rows copied from the external software.
+        rules (RuleSet, optional): The classification rules. Defaults to `MANUAL_RULES`.
 
-    # A service is also a tire service by default if it's a tire component
-    # and not explicitly excluded.
-    is_tire_by_default = (
-        is_tire_component &
-        ~rule_general_exclusions &
-        ~rule_generic_integrity_exclusion
-    )
+    Returns:
+        tuple[list[int], list[int]]: The tire service and the general service sequences,
+                                     numbered by row (blank lines do not count).
+    """
+    rows = _parse_pasted_rows(text)
+    if rows is None:
+        df = pd.read_csv(StringIO(text), sep="\t", header=None, engine="python")
+        df = df.reset_index()
+        df["index"] = df["index"] + 1
+        return split_tire_service(df, rules)
+    if not rows:
+        return [], []
 
-    is_tire_service = is_tire_service | is_tire_by_default
+    width = len(rows[0])
+    is_sparse = width > 2 and all(len(fields) <= 2 or fields[2] in _NA_STRINGS for fields in rows)
+    layout = _SPARSE_LAYOUT if is_sparse else _STANDARD_LAYOUT
+    if layout[-1] >= width:
+        return [], []
 
-    # Final mask: must be pending, a tire service, and not pneumatic.
-    final_tire_mask = is_pending & is_tire_service & ~is_pneumatic_system
+    status_col, description_col, component_col = layout
 
-    tire_service_sequences = norm_df[final_tire_mask]['index'].tolist()
-    general_service_sequences = norm_df[is_pending & ~final_tire_mask]['index'].tolist()
+    def column(col: int) -> list[str]:
+        # Short rows are padded with missing values, which never match a rule.
+        return [fields[col] if col < len(fields) and fields[col] not in _NA_STRINGS else "" for fields in rows]
 
-    return tire_service_sequences, general_service_sequences
+    return _split_task_rows(
+        list(range(1, len(rows) + 1)), column(status_col), column(description_col), column(component_col), rules
+    )
 
 
+@instrumented(size="df", unit="rows")
 def split_auto_tire_service(df: pd.DataFrame) -> tuple[list[int], list[int]]:
     """
     Separates tire service tasks from general tasks in a DataFrame from `fetch_plans`.
 
     This function is similar to `split_tire_service` but operates on a structured
     DataFrame with named columns ('de_sub_sist', 'de_tarefa') as returned by `fetch_plans`.
+    Both classify through the same engine, with the rules in `tire_rules.AUTO_RULES`; frames
+    from `fetch_plans` already carry the verdict in `fg_borracharia`, so they are only partitioned.
 
     Args:
         df (pd.DataFrame): The DataFrame with maintenance tasks.
@@ -569,28 +965,383 @@ def split_auto_tire_service(df: pd.DataFrame) -> tuple[list[int], list[int]]:
         tuple[list[int], list[int]]: A tuple containing two lists of sequence numbers ('no_seq'):
                                      - The first list is for tire services.
                                      - The second list is for general services.
+                                     Both are empty for an empty frame, e.g. the column-less
+                                     one `fetch_plans` returns for an unknown equipment.
     """
-    # Ensure columns exist and have the correct type for string operations.
-    df["de_sub_sist"] = df["de_sub_sist"].astype(str)
-    df["de_tarefa"] = df["de_tarefa"].astype(str)
-
-    # Heuristic mask to identify tire-related services based on keywords.
-    tire_service_mask = (
-        (df["de_sub_sist"].str.contains(r"Verificar a integridade \(trincas, desgastes acentuados, danos críticos\) dos espelhos da roda|Verificar integridade \(trincas, desgastes acentuados, danos críticos\) dos espelhos da roda", case=False, na=False))|
-        (df["de_sub_sist"].str.strip().isin(["Roda", "Pneu"])) &
-        (~df["de_tarefa"].str.contains("Verificar integridade|Verificar a integridade", case=False, na=False)) &
-        (~df["de_tarefa"].str.contains("Quando houver espaçador, retirar rodas", case=False, na=False)) |
-        (df["de_tarefa"].str.contains("pneus|pneu", case=False, na=False)) &
-        (~df["de_tarefa"].str.contains("pneum", case=False, na=False)) |
-        (df["de_tarefa"].str.contains("borracharia", case=False, na=False)) &
-        (~df["de_tarefa"].str.contains("Verificar integridade|Verificar a integridade", case=False, na=False))|
-        (df["de_tarefa"].str.contains(r"Verificar a integridade \(trincas, desgastes acentuados, danos críticos\) dos espelhos da roda|Verificar integridade \(trincas, desgastes acentuados, danos críticos\) dos espelhos da roda", case=False, na=False))
-    )
-
-    tire_service_df = df[tire_service_mask]
-    general_service_df = df[~tire_service_mask]
+    if df.empty:
+        return [], []
+    if TIRE_SERVICE_COLUMN in df.columns:
+        # Frames from `fetch_plans` carry the verdict computed when the matrix was loaded.
+        tire_service_mask = df[TIRE_SERVICE_COLUMN].astype(bool)
+    else:
+        tire_service_mask = pd.Series(
+            AUTO_RULES.classify_many(df["de_tarefa"].tolist(), df["de_sub_sist"].tolist()), index=df.index, dtype=bool
+        )
 
-    tire_service_sequences = tire_service_df["no_seq"].tolist()
-    general_service_sequences = general_service_df["no_seq"].tolist()
+    # Only the sequences are needed; filtering the whole frame would copy every column.
+    sequences = df["no_seq"]
+    tire_service_sequences = sequences[tire_service_mask].tolist()
+    general_service_sequences = sequences[~tire_service_mask].tolist()
 
     return tire_service_sequences, general_service_sequences
+
+
+@instrumented(size=len, unit="sequences")
+def auto_work_log_sequences(os_number: str, plan_type: str = "", store: DataStore | SQLiteStore | None = None,
+                            task_lists: dict | None = None) -> list[int]:
+    """
+    Resolves the sequences of a service order for automatic work log generation.
+
+    Args:
+        os_number (str): The service order number.
+        plan_type (str, optional): "tire_service" for tire sequences, anything else for
+                                   general sequences. Defaults to "".
+        store (DataStore | SQLiteStore, optional): The data source. Defaults to the shared store.
+        task_lists (dict, optional): A memo of (equipment, plans) -> (tire, general)
+                                     sequences shared across several calls.
+
+    Returns:
+        list[int]: The sequence numbers of the requested service type.
+
+    Raises:
+        ValueError: If the service order, or its equipment and plans in the matrix, are
+                    unknown, or if it has no tire sequences.
+    """
+    store = store or _default_store
+    equipment, plan = get_equipment_and_plan(os_number, store)
+    if not equipment or not plan:
+        raise ValueError("Ordem de serviço não encontrada!")
+
+    key = (equipment, tuple(plan))
+    split = task_lists.get(key) if task_lists is not None else None
+    if split is None:
+        df_tasks = fetch_plans(equipment, plan, store)
+        if df_tasks.columns.empty:
+            # No `Chave` of the matrix matches the equipment and plans.
+            raise ValueError("Ordem de serviço não encontrada!")
+        # Separate tire service tasks from general mechanical tasks.
+        split = split_auto_tire_service(df_tasks)
+        if task_lists is not None:
+            task_lists[key] = split
+
+    borracharia_list, mecanica_list = split
+    if plan_type == "tire_service":
+        if not borracharia_list:
+            raise ValueError("Essa OS não possui nenhuma sequência de borracharia.")
+        return borracharia_list
+    return mecanica_list
+
+
+# --- Bulk classification of exported task files ---
+# Folders of per-OS task exports (one file per service order) are split into tire and
+# general sequences with the rules above, in batches of files spread over worker
+# processes. Results come back in input order.
+
+
+class TaskFileSplit(NamedTuple):
+    """The tire/general split of one exported task file (see `classify_task_files`)."""
+    path: str
+    os_number: str
+    tire_service: list[int]
+    general_service: list[int]
+    error: str | None
+
+
+# Files a worker process classifies per task; batching amortizes the inter-process traffic
+# of the thousands of small exports in a folder.
+CLASSIFY_BATCH_SIZE = 32
+
+# A service order in a file name, where it is often glued to a prefix ("OS_62112345.txt").
+_FILE_ORDER_PATTERN = re.compile(r"(?<!\d)621\d{5}(?!\d)")
+
+# The rule set of a worker process, received once from `_init_classification_worker`.
+_worker_rules: RuleSet | None = None
+
+
+def _init_classification_worker(rules: RuleSet) -> None:
+    """Worker initializer: keeps the rule set shipped by the parent for every batch."""
+    global _worker_rules
+    _worker_rules = rules
+
+
+def _task_file_os_number(path: str) -> str:
+    """Returns the service order in a file name, or the name without extension."""
+    name = os.path.basename(path)
+    match = _FILE_ORDER_PATTERN.search(name)
+    return match.group() if match else os.path.splitext(name)[0]
+
+
+def _split_task_file(path: str, rules: RuleSet, encoding: str) -> TaskFileSplit:
+    os_number = _task_file_os_number(path)
+    try:
+        with open(path, encoding=encoding, errors="replace") as file:
+            tire_service, general_service = split_pasted_tire_service(file.read(), rules)
+    except (OSError, ValueError) as e:
+        # A file that cannot be read or parsed is reported without stopping the others.
+        return TaskFileSplit(path, os_number, [], [], str(e))
+    return TaskFileSplit(path, os_number, tire_service, general_service, None)
+
+
+def _split_task_batch(args: tuple[list[str], str]) -> list[TaskFileSplit]:
+    """Worker entry point: splits a batch of files with the worker's rule set."""
+    paths, encoding = args
+    return [_split_task_file(path, _worker_rules, encoding) for path in paths]
+
+
+@instrumented(unit="files")
+def classify_task_files(paths: Iterable[str], workers: int = 1, batch_size: int = CLASSIFY_BATCH_SIZE,
+                        encoding: str = "utf-8", rules: RuleSet | None = None) -> Iterator[TaskFileSplit]:
+    """
+    Splits exported task files (one OS per file, in the format `split_pasted_tire_service`
+    reads) into tire and general service sequences.
+
+    With several workers, the files are sent to worker processes in batches. The rule set
+    is shipped to each worker once, when it starts, and reused for all its batches together
+    with the worker's own classification cache. Only a few batches per worker are in flight
+    at a time, so results stream out in file order whatever the number of files.
+
+    Args:
+        paths (Iterable[str]): Files and/or directories (read recursively).
+        workers (int, optional): Number of worker processes. Defaults to 1 (this process).
+        batch_size (int, optional): Largest number of files per batch. Defaults to 32.
+        encoding (str, optional): The file encoding. Undecodable bytes are replaced.
+        rules (RuleSet, optional): The classification rules. Defaults to `MANUAL_RULES`.
+
+    Yields:
+        TaskFileSplit: The split of each file, in file order. The OS number is taken from
+                       the file name; files that could not be read carry an `error`.
+    """
+    files = list(_expand_paths(paths))
+    rules = rules or MANUAL_RULES
+
+    if workers <= 1 or len(files) <= 1:
+        for path in files:
+            yield _split_task_file(path, rules, encoding)
+        return
+
+    # Smaller batches for small folders, so every worker gets some.
+    size = max(1, min(batch_size, len(files) // (workers * 4)))
+    batches = [files[i:i + size] for i in range(0, len(files), size)]
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_classification_worker, initargs=(rules,))
+    try:
+        pending = deque()
+        for batch in batches:
+            pending.append(executor.submit(_split_task_batch, (batch, encoding)))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+@instrumented(unit="files")
+def write_task_classification(paths: Iterable[str], output_path: str, workers: int = 1,
+                              encoding: str = "utf-8") -> tuple[int, int, list[TaskFileSplit]]:
+    """
+    Classifies exported task files and writes one line per pending task to a TSV file.
+
+    The output has the columns OS, sequence and class ("borracharia" or "geral"), with each
+    file's tasks in sequence order. Lines are written as each file's result arrives.
+
+    Args:
+        paths (Iterable[str]): Files and/or directories (read recursively).
+        output_path (str): The file to write.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+        encoding (str, optional): The encoding of the input files.
+
+    Returns:
+        tuple[int, int, list[TaskFileSplit]]: The number of files classified, the number
+                                              of lines written and the files that failed.
+    """
+    files = 0
+    lines = 0
+    errors = []
+    with open(output_path, "w", encoding="utf-8", newline="") as output:
+        output.write("OS\tsequencia\tclasse\n")
+        for result in classify_task_files(paths, workers, encoding=encoding):
+            if result.error is not None:
+                errors.append(result)
+                continue
+            classes = dict.fromkeys(result.general_service, "geral")
+            classes.update(dict.fromkeys(result.tire_service, "borracharia"))
+            output.writelines(
+                f"{result.os_number}\t{sequence}\t{classes[sequence]}\n" for sequence in sorted(classes)
+            )
+            files += 1
+            lines += len(classes)
+    return files, lines, errors
+
+
+class BatchOrder(NamedTuple):
+    """One row of a batch work log table. `error` is set for rows that could not be parsed."""
+    line: int
+    os_number: str
+    date: str
+    starting_time: str
+    ending_time: str
+    plan_type: str
+    error: str = ""
+
+
+# Service type labels accepted in batch tables; anything else means general service.
+_TIRE_SERVICE_LABELS = {"tire_service", "borracharia", "pneu", "pneus", "b"}
+
+
+@instrumented(unit="orders")
+def parse_batch_orders(lines: Iterable[str]) -> Iterator[BatchOrder]:
+    """
+    Parses a batch work log table (TSV or CSV) into BatchOrder rows.
+
+    Columns are: service order, date, starting time, ending time and an optional service
+    type ("borracharia" for tire services, empty or "geral" otherwise). The delimiter is
+    detected per line (tab, then ";", then ","). Blank lines and "#" comments are skipped,
+    and so is a header in place of the first row.
+
+    Args:
+        lines (Iterable[str]): The table lines, e.g. an open file.
+
+    Yields:
+        BatchOrder: One row per data line. A row with fewer than four columns is yielded
+                    with its `error` set, so it is reported without stopping the batch.
+    """
+    first_row = True
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        delimiter = next((d for d in ("\t", ";", ",") if d in line), None)
+        fields = [field.strip().strip('"') for field in line.split(delimiter)] if delimiter else [line]
+
+        is_header = first_row and not fields[0].isdigit()
+        first_row = False
+        if is_header:
+            continue
+        if len(fields) < 4:
+            yield BatchOrder(line_number, fields[0], "", "", "", "", "Esperado OS, data, hora inicial e hora final.")
+            continue
+
+        plan_type = "tire_service" if len(fields) > 4 and fields[4].lower() in _TIRE_SERVICE_LABELS else ""
+        yield BatchOrder(line_number, fields[0], fields[1], fields[2], fields[3], plan_type)
+
+
+@instrumented(unit="orders")
+def batch_work_logs(orders: Iterable[BatchOrder],
+                    store: DataStore | SQLiteStore | None = None) -> Iterator[tuple[BatchOrder, str, str]]:
+    """
+    Generates automatic work logs for many service orders in one pass.
+
+    Orders sharing the same equipment and plans resolve their task list only once.
+    Errors are reported per order instead of aborting the batch.
+
+    Args:
+        orders (Iterable[BatchOrder]): The orders to process, e.g. from `parse_batch_orders`.
+                                       Rows that failed to parse are reported as they are.
+        store (DataStore | SQLiteStore, optional): The data source. Defaults to the shared store.
+
+    Yields:
+        tuple[BatchOrder, str, str]: The order, its logs and an error message. Exactly one
+                                     of logs or error is non-empty.
+    """
+    store = store or _default_store
+    task_lists: dict = {}
+
+    for order in orders:
+        if order.error:
+            yield order, "", order.error
+            continue
+        try:
+            sequences = auto_work_log_sequences(order.os_number, order.plan_type, store, task_lists)
+            interval_str = " ".join(str(i) for i in sequences)
+            logs = work_logs(order.os_number, interval_str, order.date, order.starting_time, order.ending_time)
+        except ValueError as e:
+            yield order, "", str(e)
+        else:
+            yield order, logs, ""
+
+
+@instrumented(size=lambda result: result[0], unit="orders")
+def write_batch_work_logs(orders: Iterable[BatchOrder], output_path: str,
+                          store: DataStore | SQLiteStore | None = None) -> tuple[int, list[tuple[BatchOrder, str]]]:
+    """
+    Streams batch work logs to a file as each order is generated.
+
+    Args:
+        orders (Iterable[BatchOrder]): The orders to process.
+        output_path (str): The file that receives the concatenated logs.
+        store (DataStore | SQLiteStore, optional): The data source. Defaults to the shared store.
+
+    Returns:
+        tuple[int, list[tuple[BatchOrder, str]]]: The number of orders written and the
+                                                  orders that failed with their messages.
+    """
+    written = 0
+    errors = []
+    with open(output_path, "w", encoding="utf-8", newline="") as output:
+        for order, logs, error in batch_work_logs(orders, store):
+            if error:
+                errors.append((order, error))
+            else:
+                output.write(logs)
+                written += 1
+    return written, errors
+
+
+# --- SQLite import ---
+# The lookup tables behind `get_equipment_and_plan`, `fetch_plans` and
+# `get_equipment_items` are built by the same functions as the in-memory indexes and
+# written to a SQLite file, which a `SQLiteStore` then answers from.
+
+# Table -> indexed column groups.
+_DATABASE_INDEXES = {
+    "os_index": [("os",)],
+    "plan_keys": [("chave",)],
+    "plan_tasks": [("chave", "no_ref_prog")],
+    "fleet_items": [("frota", "position"), ("Cod. Sap",)],
+}
+
+
+@instrumented(size=lambda counts: sum(counts.values()), unit="rows")
+def import_database(path: str = DATABASE_FILE, store: DataStore | None = None) -> dict[str, int]:
+    """
+    Loads every data source and writes the lookup tables to a SQLite file.
+
+    The sources are read through the store (and its snapshots) once; afterwards a
+    `SQLiteStore` on the file answers the same queries, returning the same frames,
+    without keeping the sources in memory. Import again whenever a source changes.
+
+    Args:
+        path (str, optional): The database file. Defaults to "toolkit.db".
+        store (DataStore, optional): The data source. Defaults to the shared store.
+
+    Returns:
+        dict[str, int]: The number of rows written per table.
+    """
+    store = store or _default_store
+
+    os_index = _build_os_index(store)
+    os_table = pd.DataFrame(
+        [(key, model, "/".join(plans)) for key, (model, plans) in os_index.items()],
+        columns=["os", "modelo", "plano"],
+    )
+
+    known_keys, groups = _build_plan_groups(store)
+    keys_table = pd.DataFrame({"chave": [key for key in known_keys if isinstance(key, str)]})
+    if groups:
+        # The matrix row labels become `position`, to return rows in matrix order.
+        plan_table = pd.concat(groups, names=["chave", "position"]).reset_index()
+    else:
+        plan_table = pd.DataFrame(columns=["chave", "position", *_PLAN_COLUMNS, "no_ref_prog"])
+
+    fleet_table, fleet_positions = _build_fleet_table(store)
+    fleets = np.full(len(fleet_table), None, dtype=object)
+    for fleet, positions in fleet_positions.items():
+        fleets[positions] = fleet
+    # Rows without a fleet can never be queried.
+    has_fleet = pd.notna(fleets)
+    fleet_table = fleet_table.assign(position=range(len(fleet_table)))[has_fleet]
+    fleet_table["frota"] = pd.Series(fleets[has_fleet], index=fleet_table.index).infer_objects()
+
+    tables = {"os_index": os_table, "plan_keys": keys_table, "plan_tasks": plan_table, "fleet_items": fleet_table}
+    write_database(path, tables, _DATABASE_INDEXES)
+    return {name: len(table) for name, table in tables.items()}
@@ -0,0 +1,344 @@
+#
+# instrumentation.py
+#
+# Description:
+# Opt-in call statistics for the toolkit's functions: call counts, wall time percentiles,
+# input sizes, cache hit rates and a ring buffer of the slowest recent calls with their
+# arguments. It answers "which step is slow?" when a coworker reports a slow screen.
+#
+# Collection is off by default. Set TOOLKIT_INSTRUMENT=1 (or call `enable()`) to turn it
+# on; while it is off, an instrumented function costs one flag check per call. The data
+# can be viewed on the GUI's diagnostics screen (Ctrl+Shift+D) or saved with `dump_json`.
+#
+
+import datetime
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+ENV_VAR = "TOOLKIT_INSTRUMENT"
+
+# Most recent durations kept per function to compute percentiles.
+SAMPLE_SIZE = 1000
+# Calls at least this slow go to the slow-call ring buffer...
+SLOW_CALL_SECONDS = 0.01
+# ...which keeps this many of the most recent ones.
+SLOW_CALLS = 100
+# Longest argument representation stored with a slow call.
+ARG_REPR_LIMIT = 80
+
+_enabled = os.environ.get(ENV_VAR, "") not in ("", "0")
+_lock = threading.Lock()
+
+
+class CallStats:
+    """
+    The statistics collected for one function.
+
+    Attributes:
+        unit (str): What the recorded sizes count, e.g. "rows" or "chars".
+        count (int): Number of calls.
+        errors (int): Number of calls that raised.
+        total (float): Total wall time, in seconds.
+        max (float): Slowest call, in seconds.
+        samples (deque): The most recent durations, in seconds.
+        size_total (int): Sum of the recorded input sizes.
+        size_max (int): Largest recorded input size.
+    """
+    __slots__ = ("unit", "count", "errors", "total", "max", "samples", "size_total", "size_max")
+
+    def __init__(self, unit: str):
+        self.unit = unit
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: deque = deque(maxlen=SAMPLE_SIZE)
+        self.size_total = 0
+        self.size_max = 0
+
+    def percentile(self, fraction: float) -> float:
+        """Returns a percentile (nearest rank) of the recent durations, in seconds."""
+        ordered = sorted(self.samples)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_s": self.total,
+            "mean_s": self.total / self.count if self.count else 0.0,
+            "p50_s": self.percentile(0.50),
+            "p90_s": self.percentile(0.90),
+            "p99_s": self.percentile(0.99),
+            "max_s": self.max,
+            "size_unit": self.unit,
+            "size_total": self.size_total,
+            "size_max": self.size_max,
+        }
+
+
+_stats: dict[str, CallStats] = {}
+_slow_calls: deque = deque(maxlen=SLOW_CALLS)
+_caches: dict[str, Callable[[], dict | None]] = {}
+
+
+def enable() -> None:
+    """Starts collecting statistics."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Stops collecting statistics. What was collected is kept."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Returns True while statistics are being collected."""
+    return _enabled
+
+
+def reset() -> None:
+    """Discards every collected statistic and slow call."""
+    with _lock:
+        _stats.clear()
+        _slow_calls.clear()
+
+
+def register_cache(name: str, info: Callable[[], dict | None]) -> None:
+    """
+    Adds a cache to the report.
+
+    Args:
+        name (str): The name shown in the report.
+        info (Callable[[], dict | None]): Returns the cache's "hits"/"misses" counters, or
+                                          None while the cache does not exist yet.
+    """
+    _caches[name] = info
+
+
+def _short_repr(value: object) -> str:
+    shape = getattr(value, "shape", None)
+    if shape is not None:
+        return f"<{type(value).__name__} {'x'.join(str(n) for n in shape)}>"
+    text = repr(value)
+    return text if len(text) <= ARG_REPR_LIMIT else text[:ARG_REPR_LIMIT - 3] + "..."
+
+
+def record(name: str, seconds: float, size: int | None = None, unit: str = "items", failed: bool = False,
+           args: tuple = (), kwargs: dict | None = None) -> None:
+    """
+    Records one call. Used by `instrumented`; also usable for code that is not a function.
+
+    Args:
+        name (str): The name the call is reported under.
+        seconds (float): The call's wall time.
+        size (int, optional): The input size, in `unit`s.
+        unit (str, optional): What `size` counts. Defaults to "items".
+        failed (bool, optional): Whether the call raised.
+        args (tuple, optional): Positional arguments, stored if the call was slow.
+        kwargs (dict, optional): Keyword arguments, stored if the call was slow.
+    """
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = CallStats(unit)
+        stats.count += 1
+        stats.errors += failed
+        stats.total += seconds
+        stats.max = max(stats.max, seconds)
+        stats.samples.append(seconds)
+        if size is not None:
+            stats.size_total += size
+            stats.size_max = max(stats.size_max, size)
+
+    if seconds >= SLOW_CALL_SECONDS:
+        arguments = [_short_repr(arg) for arg in args]
+        arguments += [f"{key}={_short_repr(value)}" for key, value in (kwargs or {}).items()]
+        call = {
+            "name": name,
+            "seconds": seconds,
+            "size": size,
+            "args": arguments,
+            "failed": failed,
+            "at": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+        with _lock:
+            _slow_calls.append(call)
+
+
+def _measure(value: object) -> int | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def instrumented(name: str | None = None, size: str | Callable[[object], int] | None = None,
+                 unit: str = "items") -> Callable:
+    """
+    Decorates a function so its calls are recorded while instrumentation is enabled.
+
+    Generator functions are timed while they run (not while the consumer works between
+    items), and their size defaults to the number of items produced.
+
+    Args:
+        name (str, optional): The reported name. Defaults to the function's qualified name.
+        size (str | Callable, optional): How to measure the input size: the name of a
+                                         parameter (its `len()`, or its value for integers),
+                                         or a callable applied to the result.
+        unit (str, optional): What the size counts, e.g. "rows". Defaults to "items".
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__qualname__
+        position = None
+        if isinstance(size, str):
+            position = list(inspect.signature(func).parameters).index(size)
+
+        def input_size(args: tuple, kwargs: dict) -> int | None:
+            if position is None:
+                return None
+            if size in kwargs:
+                return _measure(kwargs[size])
+            if position < len(args):
+                return _measure(args[position])
+            return None
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not _enabled:
+                    return func(*args, **kwargs)
+                return _timed_generator(func(*args, **kwargs), args, kwargs)
+
+            def _timed_generator(generator, args, kwargs):
+                elapsed = 0.0
+                produced = 0
+                failed = False
+                try:
+                    while True:
+                        start = time.perf_counter()
+                        try:
+                            item = next(generator)
+                        except StopIteration:
+                            return
+                        except Exception:
+                            failed = True
+                            raise
+                        finally:
+                            elapsed += time.perf_counter() - start
+                        produced += 1
+                        yield item
+                finally:
+                    generator.close()
+                    measured = input_size(args, kwargs) if position is not None else produced
+                    record(label, elapsed, measured, unit, failed, args, kwargs)
+            return wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                record(label, time.perf_counter() - start, input_size(args, kwargs), unit, True, args, kwargs)
+                raise
+            seconds = time.perf_counter() - start
+            measured = _measure(size(result)) if callable(size) else input_size(args, kwargs)
+            record(label, seconds, measured, unit, False, args, kwargs)
+            return result
+        return wrapper
+    return decorator
+
+
+def _cache_report() -> dict:
+    report = {}
+    for cache_name, info in _caches.items():
+        counters = info()
+        if counters is None:
+            continue
+        lookups = counters["hits"] + counters["misses"]
+        report[cache_name] = {**counters, "hit_rate": counters["hits"] / lookups if lookups else None}
+    return report
+
+
+def snapshot() -> dict:
+    """
+    Returns everything collected so far as plain, JSON-serializable data.
+
+    Returns:
+        dict: The keys "enabled", "functions" (name -> statistics), "caches"
+              (name -> counters and hit rate) and "slow_calls" (slowest first).
+    """
+    with _lock:
+        functions = {name: stats.as_dict() for name, stats in sorted(_stats.items())}
+        slow_calls = sorted(_slow_calls, key=lambda call: call["seconds"], reverse=True)
+    return {"enabled": _enabled, "functions": functions, "caches": _cache_report(), "slow_calls": slow_calls}
+
+
+def dump_json(path: str) -> None:
+    """
+    Writes `snapshot()` to a JSON file.
+
+    Args:
+        path (str): The output file.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(snapshot(), file, indent=2, ensure_ascii=False)
+
+
+def format_report(slow_calls: int = 20) -> str:
+    """
+    Formats the collected statistics as a plain-text report.
+
+    Args:
+        slow_calls (int, optional): How many of the slowest calls to list. Defaults to 20.
+
+    Returns:
+        str: The report.
+    """
+    data = snapshot()
+    lines = [
+        f"Coleta {'ativa' if data['enabled'] else 'desativada'} (variável {ENV_VAR}=1 ativa ao iniciar)",
+        "",
+        f"{'função':<36} {'chamadas':>8} {'erros':>5} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} "
+        f"{'máx ms':>9} {'total s':>8}  tamanho médio",
+    ]
+    for name, stats in sorted(data["functions"].items(), key=lambda item: item[1]["total_s"], reverse=True):
+        mean_size = f"{stats['size_total'] / stats['count']:,.0f} {stats['size_unit']}" if stats["size_total"] else ""
+        lines.append(
+            f"{name:<36} {stats['count']:>8} {stats['errors']:>5} {stats['p50_s'] * 1000:>9.2f} "
+            f"{stats['p90_s'] * 1000:>9.2f} {stats['p99_s'] * 1000:>9.2f} {stats['max_s'] * 1000:>9.2f} "
+            f"{stats['total_s']:>8.3f}  {mean_size}"
+        )
+
+    if data["caches"]:
+        lines += ["", "Caches:"]
+        for cache_name, counters in data["caches"].items():
+            rate = f"{counters['hit_rate']:.0%}" if counters["hit_rate"] is not None else "-"
+            lines.append(f"  {cache_name}: {counters['hits']} acertos, {counters['misses']} faltas ({rate}), "
+                         f"{counters['size']}/{counters['maxsize']} entradas")
+
+    if data["slow_calls"]:
+        lines += ["", "Chamadas mais lentas:"]
+        for call in data["slow_calls"][:slow_calls]:
+            lines.append(f"  {call['seconds'] * 1000:9.1f} ms  {call['at']}  {call['name']}({', '.join(call['args'])})")
+    return "\n".join(lines) + "\n"
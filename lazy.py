@@ -0,0 +1,58 @@
+#
+# lazy.py
+#
+# Description:
+# Deferred imports for heavy dependencies (pandas, numpy). Importing pandas takes a large
+# part of the GUI's cold start, yet the text tools never use it; modules bind it through
+# `lazy_import` so the real import happens on first use instead of at startup.
+#
+
+import importlib
+import sys
+from types import ModuleType
+
+
+class LazyModule:
+    """
+    A stand-in for a module that imports it on first attribute access.
+
+    Unlike `importlib.util.LazyLoader` (before Python 3.12), loading is safe when several
+    threads touch the module at once, since it goes through the regular import lock.
+    After loading, the module's attributes are copied onto the proxy, so later lookups
+    cost the same as on the module itself.
+    """
+    def __init__(self, name: str):
+        self.__dict__["_lazy_name"] = name
+
+    def _load(self) -> ModuleType:
+        module = importlib.import_module(self._lazy_name)
+        self.__dict__.update(module.__dict__)
+        return module
+
+    def __getattr__(self, attr: str):
+        # Only called for names not copied yet: the first access, or names the module
+        # itself resolves lazily.
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module {self._lazy_name!r} ({state})>"
+
+    @property
+    def is_loaded(self) -> bool:
+        """True once the module was imported (by this proxy or elsewhere)."""
+        return self._lazy_name in sys.modules
+
+
+def lazy_import(name: str) -> ModuleType | LazyModule:
+    """
+    Returns a module, deferring its import until an attribute is first used.
+
+    Args:
+        name (str): The module name, e.g. "pandas".
+
+    Returns:
+        ModuleType | LazyModule: The module itself if it is already imported, or a proxy.
+    """
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
@@ -5,22 +5,563 @@
 # This script contains the main user interface (UI) for the "Apprentice Toolkit" application.
 # It is built using Tkinter and organizes the UI into a single class, `App`.
 # The application's core logic is imported from the `functions.py` module, ensuring a clear
-# separation between the presentation layer (this file) and the business logic.
+# separation between the presentation layer (this file) and the business logic. The
+# widget adapters below are the only place where widgets meet the core functions.
 #
 
+import time
+
+# Measured before any other import, so the startup report includes import time.
+_PROCESS_STARTED = time.perf_counter()
+
+import datetime
+import queue
 import tkinter as tk
-from tkinter import ttk, messagebox
+from concurrent.futures import Future, ThreadPoolExecutor
+from tkinter import ttk, messagebox, filedialog
+from typing import Callable
+
+import instrumentation
 from functions import (
-    process_orders,
-    process_text,
-    search_orders,
-    copy_text,
+    extract_orders,
+    join_orders,
+    join_text,
     work_logs,
-    fetch_plans,
-    get_equipment_and_plan,
-    split_auto_tire_service,
-    get_equipment_items,
+    parse_batch_orders,
+    scan_orders,
 )
+from backend import get_backend
+from instrumentation import instrumented
+
+# Appended with one line per launch, to track cold start over time.
+STARTUP_LOG = "startup.log"
+
+
+# --- Widget Adapters ---
+# Thin wrappers that read Tkinter widgets, call the pure functions of `functions.py`
+# and show their ValueError messages as warnings.
+
+def process_orders(input_text: tk.Text, separator_entry: tk.Entry, output_text: tk.Text) -> None:
+    """
+    Finds all valid service order numbers from an input widget, joins them with a
+    specified separator, and displays the result in an output widget.
+
+    Args:
+        input_text (tk.Text): The Tkinter Text widget containing the raw text with service orders.
+        separator_entry (tk.Entry): The Tkinter Entry widget for the desired separator.
+                                      If empty, a comma "," is used by default.
+        output_text (tk.Text): The Tkinter Text widget where the formatted string of
+                               service orders will be displayed.
+    """
+    try:
+        new_orders = join_orders(input_text.get("1.0", tk.END), separator_entry.get())
+    except ValueError as e:
+        messagebox.showwarning("Atenção", str(e))
+        return
+
+    # Clear the output widget and insert the processed orders.
+    output_text.delete("1.0", tk.END)
+    output_text.insert(tk.END, new_orders)
+
+
+def process_text(ptext_input: tk.Text, separator_entry: tk.Entry, space_choice: bool, output_text: tk.Text) -> None:
+    """
+    Processes a block of text by joining its content with a specified separator.
+    It can either replace all whitespace with the separator or only newlines,
+    based on the `space_choice` flag.
+
+    Args:
+        ptext_input (tk.Text): The Tkinter Text widget with the text to process.
+        separator_entry (tk.Entry): The Tkinter Entry widget for the separator.
+                                      Defaults to ", " if empty.
+        space_choice (bool): If True, preserves spaces within lines and only replaces
+                             newlines with the separator. If False, replaces all
+                             whitespace (spaces and newlines) with the separator.
+        output_text (tk.Text): The Tkinter Text widget to display the result.
+    """
+    separator = separator_entry.get() or ", "
+    new_text = join_text(ptext_input.get("1.0", tk.END).split("\n"), separator, space_choice)
+
+    if not new_text:
+        messagebox.showwarning("Atenção", "Nenhum texto inserido")
+        return
+
+    output_text.delete("1.0", tk.END)
+    output_text.insert(tk.END, new_text)
+
+
+def search_orders(search_input: tk.Text, search_output: tk.Text, number_of_lines_label: tk.Label) -> None:
+    """
+    Searches for valid service order numbers within a text widget and displays the
+    results in another widget, along with a count of found orders.
+
+    Args:
+        search_input (tk.Text): The widget containing the text to search through.
+        search_output (tk.Text): The widget where the found orders will be displayed.
+        number_of_lines_label (tk.Label): The label to update with the count of found orders.
+    """
+    found_orders = extract_orders(search_input.get("1.0", tk.END))
+
+    search_output.delete("1.0", tk.END)
+
+    if found_orders:
+        search_output.insert(tk.END, " ".join(found_orders))
+        number_of_lines_label.config(text=f"Quantidade de ordens encontradas: {len(found_orders)}")
+    else:
+        messagebox.showwarning("Atenção", "Nenhuma ordem encontrada")
+        number_of_lines_label.config(text="Quantidade de ordens encontradas: 0")
+
+
+def copy_text(widget: tk.Text, window: tk.Tk) -> None:
+    """
+    Copies the entire content of a Tkinter Text widget to the clipboard.
+
+    Args:
+        widget (tk.Text): The Text widget from which to copy the content.
+        window (tk.Tk): The root Tkinter window, used to access the clipboard.
+    """
+    text = widget.get("1.0", tk.END).strip()
+    if text:
+        window.clipboard_clear()
+        window.clipboard_append(text)
+        window.update()  # Required to make the clipboard content available immediately.
+    else:
+        messagebox.showwarning("Atenção", "Nada a ser copiado")
+
+
+# --- Background Tasks ---
+
+class TaskRunner:
+    """
+    Runs slow jobs on worker threads and hands their results back to the Tk thread.
+
+    Widgets must only be touched from the Tk thread, so jobs receive plain values and
+    their results are queued; the queue is drained with `root.after`, which keeps the
+    mainloop responsive however long a query takes. Each job has a key (e.g. the screen
+    that started it): submitting a new job under the same key makes the older one stale,
+    and stale results are dropped instead of overwriting newer ones.
+
+    Cancelling (or superseding) a job never interrupts it: threads cannot be stopped, so
+    a job that already started runs to the end, keeping its worker busy meanwhile, and
+    only its result is discarded. Jobs that have not started yet are removed from the queue.
+
+    Attributes:
+        poll_ms (int): How often, in milliseconds, finished jobs are checked for.
+    """
+    def __init__(self, root: tk.Misc, max_workers: int = 2, poll_ms: int = 50,
+                 on_busy: Callable[[bool], None] | None = None):
+        """
+        Initializes the runner.
+
+        Args:
+            root (tk.Misc): Any widget; its `after` schedules the polling.
+            max_workers (int, optional): Number of worker threads. Defaults to 2.
+            poll_ms (int, optional): Polling interval in milliseconds. Defaults to 50.
+            on_busy (Callable[[bool], None], optional): Called with True when the first job
+                                                         starts and with False when the last ends.
+        """
+        self.root = root
+        self.poll_ms = poll_ms
+        self.on_busy = on_busy
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="toolkit-task")
+        self._results: queue.Queue = queue.Queue()
+        self._generations: dict[str, int] = {}
+        self._running: dict[str, tuple[int, Future, Callable, Callable]] = {}
+        self._polling = False
+
+    def submit(self, key: str, job: Callable[[], object], on_done: Callable[[object], None],
+               on_error: Callable[[Exception], None] | None = None) -> int:
+        """
+        Starts a job, superseding any job still running under the same key.
+
+        Args:
+            key (str): Identifies the kind of job; only the newest job of a key is delivered.
+            job (Callable[[], object]): The work to run on a worker thread. It must not touch widgets.
+            on_done (Callable[[object], None]): Receives the job's result on the Tk thread.
+            on_error (Callable[[Exception], None], optional): Receives the job's exception on
+                                                              the Tk thread. Without it, errors
+                                                              are shown as warnings.
+
+        Returns:
+            int: The generation number of the job.
+        """
+        self.cancel(key)
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        # The handlers only collect input; the job is where the time goes.
+        job = instrumented(f"task:{key}")(job)
+
+        def run() -> None:
+            try:
+                self._results.put((key, generation, job(), None))
+            except Exception as e:
+                self._results.put((key, generation, None, e))
+
+        self._running[key] = (generation, self._executor.submit(run), on_done, on_error or _show_error)
+        if len(self._running) == 1 and self.on_busy:
+            self.on_busy(True)
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+        return generation
+
+    def cancel(self, key: str) -> None:
+        """
+        Cancels the job of a key.
+
+        A job still waiting for a worker never runs. A job that already started is not
+        interrupted: it keeps running, and holding its worker, until it returns on its
+        own; only its result (or error) is dropped.
+
+        Args:
+            key (str): The key of the job to cancel.
+        """
+        entry = self._running.pop(key, None)
+        if entry is None:
+            return
+        entry[1].cancel()
+        self._generations[key] = self._generations.get(key, 0) + 1
+        if not self._running and self.on_busy:
+            self.on_busy(False)
+
+    def cancel_all(self) -> None:
+        """Cancels every running job."""
+        for key in list(self._running):
+            self.cancel(key)
+
+    def is_busy(self, key: str | None = None) -> bool:
+        """Returns True if a job (of the given key, or any job) is running."""
+        return key in self._running if key is not None else bool(self._running)
+
+    def _poll(self) -> None:
+        while True:
+            try:
+                key, generation, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            entry = self._running.get(key)
+            if entry is None or entry[0] != generation:
+                continue  # Stale: cancelled or superseded by a newer job.
+            del self._running[key]
+            if not self._running and self.on_busy:
+                self.on_busy(False)
+            _, _, on_done, on_error = entry
+            if error is None:
+                on_done(result)
+            else:
+                on_error(error)
+
+        if self._running:
+            self.root.after(self.poll_ms, self._poll)
+        else:
+            self._polling = False
+
+    def shutdown(self) -> None:
+        """Drops every pending job and stops the worker threads without waiting for them."""
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _show_error(error: Exception) -> None:
+    """Shows a job's exception the way the screens show their validation errors."""
+    if isinstance(error, FileNotFoundError):
+        messagebox.showwarning("Atenção", f"Arquivo de dados não encontrado: {error.filename}")
+    else:
+        messagebox.showwarning("Atenção", str(error))
+
+
+# --- Result Tables ---
+
+class TableModel:
+    """
+    The sorted, filtered and paged view of an already fetched DataFrame.
+
+    Sorting and filtering only reorder an array of row positions, so neither re-queries
+    the data nor copies the frame; cells are converted to text one page at a time.
+
+    Attributes:
+        df (pd.DataFrame): The full result, with a 0..n-1 index.
+        columns (list[str]): The column titles.
+        page_size (int): Rows per page.
+        sort_column (str | None): The column the view is sorted by, if any.
+        ascending (bool): The sort direction.
+        filter_text (str): The current (lowercase) filter.
+    """
+    def __init__(self, df, page_size: int = 200):
+        """
+        Initializes a view over every row, in the frame's order.
+
+        Args:
+            df (pd.DataFrame): The result to display.
+            page_size (int, optional): Rows per page. Defaults to 200.
+        """
+        self.df = df.reset_index(drop=True)
+        self.columns = [str(column) for column in self.df.columns]
+        self.page_size = page_size
+        self.sort_column = None
+        self.ascending = True
+        self.filter_text = ""
+        self._order = self.df.index.to_numpy()
+        self._matched = None
+        self._search = None
+        self._view = self._order
+
+    @property
+    def row_count(self) -> int:
+        """The number of rows that pass the filter."""
+        return len(self._view)
+
+    @property
+    def page_count(self) -> int:
+        """The number of pages (at least one, even when empty)."""
+        return max(1, -(-self.row_count // self.page_size))
+
+    def sort_by(self, column: str) -> None:
+        """
+        Sorts the view by a column; sorting by the same column again reverses the order.
+
+        Args:
+            column (str): The column title.
+        """
+        self.ascending = not self.ascending if column == self.sort_column else True
+        self.sort_column = column
+        series = self.df[self.df.columns[self.columns.index(column)]]
+        try:
+            ordered = series.sort_values(ascending=self.ascending, kind="stable", na_position="last")
+        except TypeError:
+            # Mixed types (e.g. numbers and text) sort by their text.
+            ordered = series.astype(str).sort_values(ascending=self.ascending, kind="stable")
+        self._order = ordered.index.to_numpy()
+        self._update_view()
+
+    def set_filter(self, text: str) -> None:
+        """
+        Keeps only the rows whose text contains `text` in any column (case-insensitive).
+
+        Typing more characters only re-checks the rows that matched the shorter text.
+
+        Args:
+            text (str): The filter; empty shows every row.
+        """
+        text = text.strip().lower()
+        if not text:
+            self._matched = None
+        else:
+            if self._search is None:
+                # One lowercase line per row, built once per result.
+                cells = [self.df[column].astype(object).where(self.df[column].notna(), "").astype(str)
+                         for column in self.df.columns]
+                search = cells[0]
+                for cell in cells[1:]:
+                    search = search + "\t" + cell
+                self._search = search.str.lower()
+
+            if self._matched is not None and self.filter_text and text.startswith(self.filter_text):
+                candidates = self._matched.nonzero()[0]
+                matched = self._matched.copy()
+                matched[candidates] = self._search.iloc[candidates].str.contains(text, regex=False).to_numpy()
+            else:
+                matched = self._search.str.contains(text, regex=False).to_numpy()
+            self._matched = matched
+        self.filter_text = text
+        self._update_view()
+
+    def _update_view(self) -> None:
+        self._view = self._order if self._matched is None else self._order[self._matched[self._order]]
+
+    def page_rows(self, page: int) -> list[tuple[str, ...]]:
+        """
+        Returns the rows of one page as text, ready to be shown.
+
+        Args:
+            page (int): The page number, starting at 0.
+
+        Returns:
+            list[tuple[str, ...]]: One tuple of cell texts per row; missing values are empty.
+        """
+        positions = self._view[page * self.page_size:(page + 1) * self.page_size]
+        chunk = self.df.iloc[positions].astype(object)
+        chunk = chunk.where(chunk.notna(), "")
+        return [tuple(str(value) for value in row) for row in chunk.itertuples(index=False, name=None)]
+
+    def view_frame(self):
+        """Returns the filtered and sorted rows as a DataFrame."""
+        return self.df.iloc[self._view]
+
+
+class TableView:
+    """
+    A paged `ttk.Treeview` over a `TableModel`, with a filter box and column sorting.
+
+    Only the rows of the current page exist as widget items, so large results render
+    as fast as small ones.
+
+    Attributes:
+        frame (tk.Frame): The container to pack into a screen.
+    """
+    def __init__(self, parent: tk.Misc, page_size: int = 200, height: int = 20):
+        """
+        Builds the widgets.
+
+        Args:
+            parent (tk.Misc): The parent widget.
+            page_size (int, optional): Rows per page. Defaults to 200.
+            height (int, optional): Visible rows of the tree. Defaults to 20.
+        """
+        self.page_size = page_size
+        self.model: TableModel | None = None
+        self.page = 0
+        self._filter_job = None
+
+        self.frame = tk.Frame(parent, bg="#2b2b2b")
+
+        filter_frame = tk.Frame(self.frame, bg="#2b2b2b")
+        filter_frame.pack(fill="x", pady=5)
+        ttk.Label(filter_frame, text="Filtrar:").pack(side="left", padx=(0, 5))
+        self.filter_entry = ttk.Entry(filter_frame, width=40)
+        self.filter_entry.pack(side="left")
+        self.filter_entry.bind("<KeyRelease>", lambda event: self._schedule_filter())
+
+        tree_frame = tk.Frame(self.frame, bg="#2b2b2b")
+        tree_frame.pack(fill="both", expand=True)
+        self.tree = ttk.Treeview(tree_frame, show="headings", height=height, selectmode="extended")
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.tag_configure("odd_row", background="#3c3f41", foreground="#ffffff")
+        self.tree.tag_configure("even_row", background="#2b2b2b", foreground="#ffffff")
+
+        pager = tk.Frame(self.frame, bg="#2b2b2b")
+        pager.pack(fill="x", pady=5)
+        ttk.Button(pager, text="◀ Anterior", command=lambda: self.show_page(self.page - 1)).pack(side="left")
+        self.page_label = ttk.Label(pager, text="")
+        self.page_label.pack(side="left", expand=True)
+        ttk.Button(pager, text="📋 Copiar", command=self.copy).pack(side="left", padx=10)
+        ttk.Button(pager, text="Próxima ▶", command=lambda: self.show_page(self.page + 1)).pack(side="left")
+
+    def set_frame(self, df) -> None:
+        """
+        Displays a new result, keeping the current filter text.
+
+        Args:
+            df (pd.DataFrame | None): The result, or None to clear the table.
+        """
+        if df is None:
+            self.model = None
+            self.tree.configure(columns=())
+            self.tree.delete(*self.tree.get_children())
+            self.page_label.config(text="")
+            return
+
+        self.model = TableModel(df, self.page_size)
+        self.tree.configure(columns=self.model.columns)
+        for column in self.model.columns:
+            self.tree.heading(column, text=column, command=lambda c=column: self.sort_by(c))
+            self.tree.column(column, width=120, stretch=True, anchor="w")
+        if self.filter_entry.get():
+            self.model.set_filter(self.filter_entry.get())
+        self.show_page(0)
+
+    def sort_by(self, column: str) -> None:
+        """Sorts by a column (toggling the direction) and returns to the first page."""
+        if self.model is None:
+            return
+        self.model.sort_by(column)
+        for title in self.model.columns:
+            arrow = (" ▲" if self.model.ascending else " ▼") if title == column else ""
+            self.tree.heading(title, text=title + arrow)
+        self.show_page(0)
+
+    def _schedule_filter(self) -> None:
+        # Wait for a pause in typing instead of filtering on every key.
+        if self._filter_job is not None:
+            self.frame.after_cancel(self._filter_job)
+        self._filter_job = self.frame.after(150, self._apply_filter)
+
+    def _apply_filter(self) -> None:
+        self._filter_job = None
+        if self.model is not None:
+            self.model.set_filter(self.filter_entry.get())
+            self.show_page(0)
+
+    def show_page(self, page: int) -> None:
+        """
+        Replaces the tree items with the rows of one page.
+
+        Args:
+            page (int): The page number; clamped to the existing pages.
+        """
+        if self.model is None:
+            return
+        self.page = min(max(page, 0), self.model.page_count - 1)
+        self.tree.delete(*self.tree.get_children())
+        for i, row in enumerate(self.model.page_rows(self.page)):
+            self.tree.insert("", tk.END, values=row, tags=("odd_row" if i % 2 else "even_row",))
+
+        first = self.page * self.page_size
+        last = min(first + self.page_size, self.model.row_count)
+        self.page_label.config(
+            text=f"Linhas {first + 1 if last else 0}–{last} de {self.model.row_count} "
+                 f"(página {self.page + 1} de {self.model.page_count})"
+        )
+
+    def copy(self) -> None:
+        """Copies the filtered and sorted rows, with headers, as tab-separated text."""
+        if self.model is None or not self.model.row_count:
+            messagebox.showwarning("Atenção", "Nada a ser copiado")
+            return
+        self.frame.clipboard_clear()
+        self.frame.clipboard_append(self.model.view_frame().to_csv(sep="\t", index=False))
+
+
+# --- Startup Timing ---
+
+class StartupTimer:
+    """
+    Records how long the application takes to become usable, from process start.
+
+    Marks are "imports" (modules loaded), "first_paint" (menu drawn) and "data_ready"
+    (datasets loaded after the first data-backed screen was opened).
+    """
+    def __init__(self, started: float):
+        """
+        Args:
+            started (float): The `time.perf_counter()` value of the process start.
+        """
+        self.started = started
+        self.marks: dict[str, float] = {}
+        self.written = False
+
+    def mark(self, name: str) -> None:
+        """Records the elapsed time of a milestone the first time it is reached."""
+        self.marks.setdefault(name, time.perf_counter() - self.started)
+
+    def report(self) -> str:
+        """
+        Returns the recorded milestones as one line, e.g. "imports 110 ms | first_paint 240 ms".
+        """
+        return " | ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.marks.items())
+
+    def write(self, path: str = STARTUP_LOG) -> None:
+        """
+        Appends the report to the startup log once per launch. Write errors are ignored.
+
+        Args:
+            path (str, optional): The log file. Defaults to `STARTUP_LOG`.
+        """
+        if self.written:
+            return
+        self.written = True
+        try:
+            with open(path, "a", encoding="utf-8") as log:
+                log.write(f"{datetime.datetime.now():%Y-%m-%d %H:%M:%S}\t{self.report()}\n")
+        except OSError:
+            pass
+
+
+startup_timer = StartupTimer(_PROCESS_STARTED)
+startup_timer.mark("imports")
 
 
 class App:
@@ -28,8 +569,13 @@ class App:
     The main application class for the Apprentice Toolkit.
 
     This class is responsible for initializing the main window, setting up styles,
-    creating all UI frames (screens), and handling the navigation between them.
+    creating the UI frames (screens) on first use, and handling the navigation between them.
     """
+
+    # Screens that read matriz.csv, os.csv or planilha.xlsx. Opening one of them (or the
+    # work log menu leading to them) starts loading the data in the background.
+    DATA_SCREENS = frozenset({"apontamentos", "autoWorkLogs", "batchWorkLogs", "filters"})
+
     def __init__(self, root: tk.Tk):
         """
         Initializes the main application window and all its components.
@@ -44,20 +590,44 @@ class App:
 
         self.setup_style()
 
-        # Creating all application frames on initialization.
-        # For larger applications, a lazy-loading approach might be more performant.
-        self.menu_frame = self.create_menu()
-        self.processOrders_frame = self.create_processOrders_frame()
-        self.processText_frame = self.create_processText_frame()
-        self.searchOrders_frame = self.create_searchOrders_frame()
-        self.apontamentos_frame = self.create_apontamentos_frame()
-        self.workLogs_frame = self.create_workLogs_frame()
-        self.autoWorkLogs_frame = self.create_autoWorkLogs_frame()
-        self.filters_frame = self.create_filters_frame()
-        self.updateLogs_frame = self.create_updateLogs_frame()
+        # Data-backed screens query a backend: the local data files (a lazily loaded store,
+        # warmed in the background when the first data-backed screen opens, so text-only
+        # sessions never load pandas; once loaded it follows its files for changes), a
+        # SQLite import of them when TOOLKIT_DATABASE is set, or a shared toolkit server
+        # when TOOLKIT_SERVER is set.
+        self.backend = get_backend()
+        self._data_loading = False
+        self._warm_thread = None
+
+        # Data-backed actions run on worker threads; the window shows a busy cursor and an
+        # indeterminate progress bar meanwhile, and Esc cancels them.
+        self.progress = ttk.Progressbar(self.root, mode="indeterminate")
+        self.tasks = TaskRunner(self.root, on_busy=self.set_busy)
+        self.root.bind("<Escape>", lambda event: self.tasks.cancel_all())
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        # The diagnostics screen is not in the menu; it is opened on request when
+        # investigating a slow screen.
+        self.root.bind("<Control-Shift-D>", lambda event: self.show_diagnostics())
+
+        # Screens are built the first time they are shown, then reused.
+        self.frame_builders = {
+            "menu": self.create_menu,
+            "processOrders": self.create_processOrders_frame,
+            "processText": self.create_processText_frame,
+            "searchOrders": self.create_searchOrders_frame,
+            "apontamentos": self.create_apontamentos_frame,
+            "workLogs": self.create_workLogs_frame,
+            "autoWorkLogs": self.create_autoWorkLogs_frame,
+            "batchWorkLogs": self.create_batchWorkLogs_frame,
+            "filters": self.create_filters_frame,
+            "updateLogs": self.create_updateLogs_frame,
+            "diagnostics": self.create_diagnostics_frame,
+        }
+        self.frames: dict[str, tk.Frame] = {}
 
         # Show the main menu frame on startup.
-        self.show_frame(self.menu_frame)
+        self.show_frame("menu")
+        self.root.after_idle(self._on_first_paint)
 
     def setup_style(self) -> None:
         """
@@ -94,16 +664,78 @@ class App:
             "TButton",
             background=[("active", "#45a049")],
         )
+        style.configure(
+            "Treeview",
+            background="#3c3f41",
+            foreground="#ffffff",
+            fieldbackground="#3c3f41",
+            font=("Consolas", 11),
+            rowheight=22,
+        )
+        style.configure("Treeview.Heading", background="#2b2b2b", foreground="#da46f4", font=("Consolas", 11, "bold"))
+        style.map("Treeview", background=[("selected", "lightblue")], foreground=[("selected", "black")])
 
-    def show_frame(self, frame: tk.Frame) -> None:
+    def show_frame(self, name: str) -> None:
         """
-        Raises a given frame to the top of the stacking order, making it visible.
+        Raises a screen to the top of the stacking order, building it on first use.
 
         Args:
-            frame (tk.Frame): The frame to be displayed.
+            name (str): The screen name, a key of `frame_builders` (e.g. "menu").
         """
+        frame = self.frames.get(name)
+        if frame is None:
+            frame = self.frames[name] = self.frame_builders[name]()
         frame.tkraise()
+        if self.tasks.is_busy():
+            self.progress.lift()
+        if name in self.DATA_SCREENS:
+            self.start_data_loading()
+
+    def start_data_loading(self) -> None:
+        """
+        Starts loading the datasets in the background, once per session.
+        """
+        if self._data_loading:
+            return
+        self._data_loading = True
+        self._warm_thread = self.backend.start()
+        self.root.after(100, self._check_data_ready)
+
+    def _check_data_ready(self) -> None:
+        if self._warm_thread is not None and self._warm_thread.is_alive():
+            self.root.after(100, self._check_data_ready)
+            return
+        startup_timer.mark("data_ready")
+        startup_timer.write()
+
+    def _on_first_paint(self) -> None:
+        self.root.update_idletasks()
+        startup_timer.mark("first_paint")
+
+    def set_busy(self, busy: bool) -> None:
+        """
+        Shows or hides the busy state (cursor and progress bar) of the window.
 
+        Args:
+            busy (bool): True while at least one background task is running.
+        """
+        self.root.config(cursor="watch" if busy else "")
+        if busy:
+            self.progress.place(relx=0, rely=1, relwidth=1, anchor="sw")
+            self.progress.lift()
+            self.progress.start(15)
+        else:
+            self.progress.stop()
+            self.progress.place_forget()
+
+    def close(self) -> None:
+        """Drops pending background tasks, stops watching the data files and closes the window."""
+        self.tasks.shutdown()
+        self.backend.stop()
+        startup_timer.write()
+        self.root.destroy()
+
+    @instrumented()
     def run_work_logs(self, plan_type: str = "") -> None:
         """
         Handles the logic for the manual work log generation screen.
@@ -115,21 +747,24 @@ class App:
                                        Passed directly to the `work_logs` function.
                                        Defaults to "".
         """
-        try:
-            logs = work_logs(
-                self.manual_wlog_order.get(),
-                self.wlog_interval_input.get("1.0", tk.END),
-                self.manual_wlog_date.get(),
-                self.manual_wlog_start.get(),
-                self.manual_wlog_end.get(),
-                plan_type
-            )
+        args = (
+            self.manual_wlog_order.get(),
+            self.wlog_interval_input.get("1.0", tk.END),
+            self.manual_wlog_date.get(),
+            self.manual_wlog_start.get(),
+            self.manual_wlog_end.get(),
+            plan_type,
+            self.manual_wlog_end_date.get(),
+        )
+
+        def show(logs: str) -> None:
             self.manual_wlog_output.delete("1.0", tk.END)
             if logs:
                 self.manual_wlog_output.insert(tk.END, logs)
-        except ValueError as e:
-            messagebox.showwarning("Atenção", str(e))
 
+        self.tasks.submit("work_logs", lambda: work_logs(*args), show)
+
+    @instrumented()
     def run_auto_work_logs(self, plan_type: str = "") -> None:
         """
         Handles the logic for the automatic work log generation screen.
@@ -147,38 +782,99 @@ class App:
         start_time = self.wlog_start.get().strip()
         end_time = self.wlog_end.get().strip()
 
-        # Get equipment and plan details from the service order.
-        equipment, plan = get_equipment_and_plan(os_number)
-        if not equipment or not plan:
-            messagebox.showwarning("Atenção!", "Ordem de serviço não encontrada!")
+        def job() -> str:
+            # Resolve the sequences of the requested service type from the service order.
+            interval_list = self.backend.auto_work_log_sequences(os_number, plan_type)
+            # Convert the list of sequences into a space-separated string for the work_logs function.
+            interval_str = " ".join(str(i) for i in interval_list)
+            return work_logs(os_number, interval_str, date, start_time, end_time)
+
+        def show(logs: str) -> None:
             self.wlog_output.delete("1.0", tk.END)
+            if logs:
+                self.wlog_output.insert(tk.END, logs)
+
+        def fail(error: Exception) -> None:
+            if isinstance(error, ValueError):
+                self.wlog_output.delete("1.0", tk.END)
+            _show_error(error)
+
+        self.tasks.submit("auto_work_logs", job, show, fail)
+
+    def load_batch_table(self) -> None:
+        """
+        Loads a TSV/CSV batch table from disk into the batch input widget.
+        """
+        path = filedialog.askopenfilename(
+            title="Abrir tabela de ordens",
+            filetypes=[("Tabelas", "*.tsv *.csv *.txt"), ("Todos os arquivos", "*.*")],
+        )
+        if not path:
             return
+        with open(path, encoding="utf-8", errors="replace") as file:
+            self.batch_input.delete("1.0", tk.END)
+            self.batch_input.insert(tk.END, file.read())
+
+    @instrumented()
+    def run_batch_work_logs(self) -> None:
+        """
+        Handles the batch work log screen.
 
-        # Fetch the maintenance tasks based on equipment and plan.
-        df_filtered = fetch_plans(equipment, plan)
+        Parses the pasted table (OS, date, start, end, service type), asks where to save
+        the result and streams the logs of every order to that file. Orders that fail are
+        listed in the output widget instead of aborting the batch.
+        """
+        table = self.batch_input.get("1.0", tk.END)
+        orders = list(parse_batch_orders(table.splitlines()))
+        if not orders:
+            messagebox.showwarning("Atenção", "Nenhuma ordem de serviço inserida")
+            return
 
-        # Separate tire service tasks from general mechanical tasks.
-        borracharia_list, mecanica_list = split_auto_tire_service(df_filtered)
+        output_path = filedialog.asksaveasfilename(
+            title="Salvar apontamentos", defaultextension=".txt",
+            filetypes=[("Texto", "*.txt"), ("Todos os arquivos", "*.*")],
+        )
+        if not output_path:
+            return
 
-        if plan_type == "tire_service":
-            interval_list = borracharia_list
-            if not interval_list:
-                messagebox.showwarning("Atenção", "Essa OS não possui nenhuma sequência de borracharia.")
-                return
+        def show(result: tuple[int, list]) -> None:
+            written, errors = result
+            self.batch_output.delete("1.0", tk.END)
+            self.batch_output.insert(tk.END, f"{written} ordens salvas em {output_path}\n")
+            for order, error in errors:
+                self.batch_output.insert(tk.END, f"Linha {order.line} ({order.os_number}): {error}\n")
+
+        self.tasks.submit("batch_work_logs", lambda: self.backend.write_batch_work_logs(orders, output_path), show)
+
+    @instrumented()
+    def run_search_files(self, directory: bool = False) -> None:
+        """
+        Handles the file/directory mode of the "Procurar ordens" screen.
+
+        Files are scanned in chunks by `scan_orders`, so exports of any size can be searched
+        without pasting them into the input widget.
+
+        Args:
+            directory (bool, optional): If True, asks for a folder and scans every file in it.
+                                        Otherwise asks for one or more files.
+        """
+        if directory:
+            selected = filedialog.askdirectory(title="Escolha a pasta")
+            paths = [selected] if selected else []
         else:
-            interval_list = mecanica_list
+            paths = list(filedialog.askopenfilenames(title="Escolha os arquivos"))
+        if not paths:
+            return
 
-        # Convert the list of sequences into a space-separated string for the work_logs function.
-        interval_str = " ".join(str(i) for i in interval_list)
+        def show(found_orders: list[str]) -> None:
+            self.search_output.delete("1.0", tk.END)
+            if found_orders:
+                self.search_output.insert(tk.END, " ".join(found_orders))
+            else:
+                messagebox.showwarning("Atenção", "Nenhuma ordem encontrada")
+            self.number_of_lines.config(text=f"Quantidade de ordens encontradas: {len(found_orders)}")
 
-        # Call the core logic function to generate logs.
-        try:
-            logs = work_logs(os_number, interval_str, date, start_time, end_time)
-            self.wlog_output.delete("1.0", tk.END)
-            if logs:
-                self.wlog_output.insert(tk.END, logs)
-        except ValueError as e:
-            messagebox.showwarning("Atenção", str(e))
+        self.tasks.submit("search_files", lambda: [match.order for match in scan_orders(paths)], show)
 
     def clear_fields(self, *widgets) -> None:
         """
@@ -220,35 +916,35 @@ class App:
             frame,
             text="Unir ordens",
             style="Grande.TButton",
-            command=lambda: self.show_frame(self.processOrders_frame),
+            command=lambda: self.show_frame("processOrders"),
         ).pack(pady=20, ipadx=100, ipady=8)
 
         ttk.Button(
             frame,
             text="Unir texto",
             style="Grande.TButton",
-            command=lambda: self.show_frame(self.processText_frame),
+            command=lambda: self.show_frame("processText"),
         ).pack(pady=20, ipadx=100, ipady=8)
 
         ttk.Button(
             frame,
             text="Gerar apontamentos",
             style="Grande.TButton",
-            command=lambda: self.show_frame(self.apontamentos_frame),
+            command=lambda: self.show_frame("apontamentos"),
         ).pack(pady=20, ipadx=72, ipady=8)
 
         ttk.Button(
             frame,
             text="Procurar ordens",
             style="Grande.TButton",
-            command=lambda: self.show_frame(self.searchOrders_frame),
+            command=lambda: self.show_frame("searchOrders"),
         ).pack(pady=20, ipadx=92, ipady=8)
 
         ttk.Button(
             frame,
             text="Consulta filtros x frota",
             style="Grande.TButton",
-            command=lambda: self.show_frame(self.filters_frame),
+            command=lambda: self.show_frame("filters"),
         ).pack(pady=20, ipadx=66, ipady=8)
 
         tk.Button(
@@ -257,7 +953,7 @@ class App:
             bg="#800080",
             fg="white",
             font=("Segoe UI", 10, "bold"),
-            command=lambda: self.show_frame(self.updateLogs_frame)
+            command=lambda: self.show_frame("updateLogs")
         ).pack(pady=20, ipadx=30, ipady=10)
 
         return frame
@@ -302,7 +998,7 @@ class App:
         ).pack(pady=20)
         ttk.Button(
             frame, text="⬅ Voltar ao menu",
-            command=lambda: (self.clear_fields(self.input_text, self.separator_entry), self.show_frame(self.menu_frame))
+            command=lambda: (self.clear_fields(self.input_text, self.separator_entry), self.show_frame("menu"))
         ).pack(pady=10)
 
         return frame
@@ -353,7 +1049,7 @@ class App:
         ).pack(pady=10)
         ttk.Button(
             frame, text="⬅ Voltar ao menu",
-            command=lambda: (self.clear_fields(self.ptext_input, self.ptext_separator, self.space_choice), self.show_frame(self.menu_frame))
+            command=lambda: (self.clear_fields(self.ptext_input, self.ptext_separator, self.space_choice), self.show_frame("menu"))
         ).pack(pady=10)
 
         return frame
@@ -373,9 +1069,10 @@ class App:
 
         ttk.Label(frame, text="Escolha o modo de geração de apontamentos:", font=("Arial", 20)).pack(pady=50)
 
-        ttk.Button(frame, text="Manual", style="Grande.TButton", command=lambda: self.show_frame(self.workLogs_frame)).pack(pady=20, ipadx=100, ipady=10)
-        ttk.Button(frame, text="Automático", style="Grande.TButton", command=lambda: self.show_frame(self.autoWorkLogs_frame)).pack(pady=20, ipadx=100, ipady=10)
-        ttk.Button(frame, text="⬅ Voltar ao menu", command=lambda: self.show_frame(self.menu_frame)).pack(pady=40)
+        ttk.Button(frame, text="Manual", style="Grande.TButton", command=lambda: self.show_frame("workLogs")).pack(pady=20, ipadx=100, ipady=10)
+        ttk.Button(frame, text="Automático", style="Grande.TButton", command=lambda: self.show_frame("autoWorkLogs")).pack(pady=20, ipadx=100, ipady=10)
+        ttk.Button(frame, text="Em lote", style="Grande.TButton", command=lambda: self.show_frame("batchWorkLogs")).pack(pady=20, ipadx=100, ipady=10)
+        ttk.Button(frame, text="⬅ Voltar ao menu", command=lambda: self.show_frame("menu")).pack(pady=40)
 
         return frame
 
@@ -418,6 +1115,10 @@ class App:
         self.manual_wlog_end = ttk.Entry(frame, width=30)
         self.manual_wlog_end.pack(padx=10, pady=5)
 
+        ttk.Label(frame, text="Data final (opcional, para intervalos de vários dias):").pack(padx=10, pady=5)
+        self.manual_wlog_end_date = ttk.Entry(frame, width=30)
+        self.manual_wlog_end_date.pack(padx=10, pady=5)
+
         # Action buttons for different service types.
         button_frame = tk.Frame(frame, bg="#2b2b2b")
         button_frame.pack(pady=10, fill="x")
@@ -432,7 +1133,7 @@ class App:
         ttk.Button(frame, text="📋 Copiar apontamentos", command=lambda: copy_text(self.manual_wlog_output, self.root), style="Grande.TButton").pack(pady=5)
         ttk.Button(
             frame, text="⬅ Voltar ao menu",
-            command=lambda: (self.clear_fields(self.manual_wlog_order, self.wlog_interval_input, self.manual_wlog_date, self.manual_wlog_start, self.manual_wlog_end), self.show_frame(self.menu_frame))
+            command=lambda: (self.clear_fields(self.manual_wlog_order, self.wlog_interval_input, self.manual_wlog_date, self.manual_wlog_start, self.manual_wlog_end, self.manual_wlog_end_date), self.show_frame("menu"))
         ).pack(pady=10)
 
         return frame
@@ -481,7 +1182,43 @@ class App:
         ttk.Button(frame, text="📋 Copiar apontamentos", command=lambda: copy_text(self.wlog_output, self.root), style="Grande.TButton").pack(pady=5)
         ttk.Button(
             frame, text="⬅ Voltar ao menu",
-            command=lambda: (self.clear_fields(self.wlog_order, self.wlog_date, self.wlog_start, self.wlog_end), self.show_frame(self.menu_frame))
+            command=lambda: (self.clear_fields(self.wlog_order, self.wlog_date, self.wlog_start, self.wlog_end), self.show_frame("menu"))
+        ).pack(pady=10)
+
+        return frame
+
+    def create_batchWorkLogs_frame(self) -> tk.Frame:
+        """
+        Builds and returns the frame for BATCH work log generation.
+
+        This UI takes a table of service orders (one per line: OS, date, starting time,
+        ending time and optionally "borracharia") and saves the logs of all of them to a file.
+
+        Returns:
+            tk.Frame: The configured batch work logs frame.
+        """
+        frame = tk.Frame(self.root, bg="#2b2b2b")
+        frame.place(relwidth=1, relheight=1)
+
+        # Input
+        ttk.Label(frame, text="Cole a tabela (OS, data, hora inicial, hora final, tipo de serviço):").pack(padx=10, pady=10)
+        self.batch_input = tk.Text(frame, height=14, width=100, bg="#3c3f41", fg="#ffffff", font=("Consolas", 12))
+        self.batch_input.pack(padx=10, pady=10)
+
+        # Action buttons
+        button_frame = tk.Frame(frame, bg="#2b2b2b")
+        button_frame.pack(pady=10)
+        ttk.Button(button_frame, text="📂 Abrir tabela", command=self.load_batch_table).pack(side="left", padx=10)
+        ttk.Button(button_frame, text="💾 Gerar e salvar", command=self.run_batch_work_logs, style="Grande.TButton").pack(side="left", padx=10)
+
+        # Output and navigation
+        ttk.Label(frame, text="Resultado:").pack(padx=10, pady=5)
+        self.batch_output = tk.Text(frame, height=8, width=100, bg="#3c3f41", fg="#00ff00", font=("Consolas", 12))
+        self.batch_output.pack(padx=10, pady=10)
+
+        ttk.Button(
+            frame, text="⬅ Voltar ao menu",
+            command=lambda: (self.clear_fields(self.batch_input, self.batch_output), self.show_frame("menu"))
         ).pack(pady=10)
 
         return frame
@@ -510,6 +1247,12 @@ class App:
             command=lambda: search_orders(self.search_input, self.search_output, self.number_of_lines)
         ).pack(pady=10)
 
+        # File and directory mode for inputs too large to paste.
+        files_frame = tk.Frame(frame, bg="#2b2b2b")
+        files_frame.pack(pady=5)
+        ttk.Button(files_frame, text="📄 Procurar em arquivos", command=lambda: self.run_search_files(directory=False)).pack(side="left", padx=10)
+        ttk.Button(files_frame, text="📁 Procurar em pasta", command=lambda: self.run_search_files(directory=True)).pack(side="left", padx=10)
+
         # Output and results count
         ttk.Label(frame, text="Ordens encontradas:").pack(padx=10, pady=10)
         self.search_output = tk.Text(frame, height=10, width=100, bg="#3c3f41", fg="#00ff00", font=("Consolas", 12))
@@ -525,7 +1268,7 @@ class App:
         ).pack(pady=10)
         ttk.Button(
             frame, text="⬅ Voltar ao menu",
-            command=lambda: (self.clear_fields(self.search_input), self.show_frame(self.menu_frame))
+            command=lambda: (self.clear_fields(self.search_input), self.show_frame("menu"))
         ).pack(pady=10)
 
         return frame
@@ -555,17 +1298,90 @@ class App:
         update_output = tk.Message(frame, text=changelog_text, width=800, bg="#2b2b2b", fg="#da9ad3", font=("Consolas", 15))
         update_output.pack(padx=20, pady=40)
 
-        ttk.Button(frame, text="⬅ Voltar ao menu", command=lambda: self.show_frame(self.menu_frame)).pack(pady=10, ipady=15, ipadx=30)
+        ttk.Button(frame, text="⬅ Voltar ao menu", command=lambda: self.show_frame("menu")).pack(pady=10, ipady=15, ipadx=30)
 
         return frame
 
+    def show_diagnostics(self) -> None:
+        """
+        Opens the hidden diagnostics screen with up-to-date statistics.
+        """
+        self.show_frame("diagnostics")
+        self.refresh_diagnostics()
+
+    def refresh_diagnostics(self) -> None:
+        """
+        Redraws the instrumentation report on the diagnostics screen.
+        """
+        self.diagnostics_output.delete("1.0", tk.END)
+        self.diagnostics_output.insert(tk.END, instrumentation.format_report())
+        self.diagnostics_toggle.config(
+            text="⏸ Desativar coleta" if instrumentation.is_enabled() else "▶ Ativar coleta"
+        )
+
+    def toggle_instrumentation(self) -> None:
+        """
+        Turns the collection of call statistics on or off.
+        """
+        if instrumentation.is_enabled():
+            instrumentation.disable()
+        else:
+            instrumentation.enable()
+        self.refresh_diagnostics()
+
+    def save_diagnostics(self) -> None:
+        """
+        Saves the collected statistics as a JSON file chosen by the user.
+        """
+        path = filedialog.asksaveasfilename(
+            title="Salvar diagnóstico", defaultextension=".json",
+            filetypes=[("JSON", "*.json"), ("Todos os arquivos", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            instrumentation.dump_json(path)
+        except OSError as e:
+            messagebox.showwarning("Atenção", f"Não foi possível salvar o arquivo: {e}")
+
+    def create_diagnostics_frame(self) -> tk.Frame:
+        """
+        Builds and returns the hidden diagnostics frame (Ctrl+Shift+D).
+
+        It shows the call statistics of the core functions and screen actions (counts,
+        percentiles, input sizes), the cache hit rates and the slowest recent calls.
+
+        Returns:
+            tk.Frame: The configured diagnostics frame.
+        """
+        frame = tk.Frame(self.root, bg="#2b2b2b")
+        frame.place(relwidth=1, relheight=1)
+
+        ttk.Label(frame, text="Diagnóstico de desempenho", font=("Arial", 20)).pack(pady=20)
+        self.diagnostics_output = tk.Text(frame, height=30, width=120, bg="#3c3f41", fg="#ffffff", font=("Consolas", 9), wrap="none")
+        self.diagnostics_output.pack(padx=10, pady=10, fill="both", expand=True)
+
+        buttons = tk.Frame(frame, bg="#2b2b2b")
+        buttons.pack(pady=10)
+        ttk.Button(buttons, text="🔄 Atualizar", command=self.refresh_diagnostics).pack(side="left", padx=5)
+        self.diagnostics_toggle = ttk.Button(buttons, command=self.toggle_instrumentation)
+        self.diagnostics_toggle.pack(side="left", padx=5)
+        ttk.Button(
+            buttons, text="🧹 Limpar", command=lambda: (instrumentation.reset(), self.refresh_diagnostics())
+        ).pack(side="left", padx=5)
+        ttk.Button(buttons, text="💾 Salvar JSON", command=self.save_diagnostics).pack(side="left", padx=5)
+        ttk.Button(frame, text="⬅ Voltar ao menu", command=lambda: self.show_frame("menu")).pack(pady=10)
+
+        return frame
+
+    @instrumented()
     def run_filters_search(self) -> None:
         """
         Handles the logic for the "Consulta filtros x frota" screen.
 
         It gets the equipment fleet number from the user, validates it,
-        fetches the corresponding items using an external function,
-        and displays the results in a formatted Text widget with alternating row colors.
+        fetches the corresponding items in the background and displays them
+        with `show_filters_result`.
         """
         choice = self.equipment_to_use.get()
 
@@ -576,42 +1392,34 @@ class App:
             messagebox.showwarning("Atenção", "Por favor, insira apenas valores numéricos.")
             return
 
-        # Fetch data using the logic function.
-        itens_result_df = get_equipment_items(choice)
+        def fail(error: Exception) -> None:
+            _show_error(error)
+            if isinstance(error, ValueError):
+                self.show_filters_result(None)
+
+        # Fetch data using the logic function on a worker thread.
+        self.tasks.submit("filters", lambda: self.backend.get_equipment_items(choice), self.show_filters_result, fail)
 
+    def show_filters_result(self, itens_result_df) -> None:
+        """
+        Displays the items of a fleet in the filters table.
+
+        Args:
+            itens_result_df (pd.DataFrame | None): The items, or None to clear the table.
+        """
         # Check if the function returned a valid DataFrame.
         if itens_result_df is None or itens_result_df.empty:
-            self.filters_output.config(state="normal")
-            self.filters_output.delete("1.0", tk.END)
-            self.filters_output.config(state="disabled")
+            self.filters_table.set_frame(None)
             return
-
-        itens_result_str = itens_result_df.to_string(index=False)
-        itens_rows = itens_result_str.strip().split("\n")
-
-        # Enable widget for update, clear it, and then repopulate.
-        self.filters_output.config(state="normal")
-        self.filters_output.delete("1.0", tk.END)
-
-        # Insert rows with alternating color tags for readability.
-        for i, row in enumerate(itens_rows):
-            if i == 0:
-                tag_to_use = "first_row"  # Header
-            elif i % 2 == 0:
-                tag_to_use = "even_row"   # Even data rows
-            else:
-                tag_to_use = "odd_row"    # Odd data rows
-            self.filters_output.insert(tk.END, row + "\n", tag_to_use)
-
-        # Disable the widget again to make it read-only.
-        self.filters_output.config(state="disabled")
+        self.filters_table.set_frame(itens_result_df)
 
     def create_filters_frame(self) -> tk.Frame:
         """
         Builds and returns the frame for querying equipment filters by fleet number.
 
         This UI allows the user to input a fleet number, search for associated
-        parts/filters, and view the results in a color-coded, read-only text area.
+        parts/filters, and browse the results in a paged table that can be sorted
+        by clicking a column header and filtered by typing.
 
         Returns:
             tk.Frame: The configured filters query frame.
@@ -625,24 +1433,13 @@ class App:
         self.equipment_to_use = ttk.Entry(frame, width=25)
         self.equipment_to_use.pack(pady=0)
 
-        # Output widget
-        self.filters_output = tk.Text(
-            frame, height=27, width=120, bg="#3c3f41", font=("Consolas", 12),
-            state="disabled", selectbackground="lightblue", selectforeground="black"
-        )
-        # Allow user to focus and select text for manual copying.
-        self.filters_output.bind("<1>", lambda event: self.filters_output.focus_set())
-
-        # Configure tags for alternating row colors in the output.
-        self.filters_output.tag_configure("first_row", background="#2b2b2b", foreground="#da46f4", font=("Consolas", 11))
-        self.filters_output.tag_configure("odd_row", background="#3c3f41", foreground="#ffffff", font=("Consolas", 11))
-        self.filters_output.tag_configure("even_row", background="#2b2b2b", foreground="#ffffff", font=("Consolas", 11))
-        self.filters_output.tag_raise("sel")
+        # Output table
+        self.filters_table = TableView(frame, height=20)
 
         # Action and navigation buttons
         ttk.Button(frame, text="Procurar", command=self.run_filters_search).pack(pady=10)
-        self.filters_output.pack(padx=10, pady=10)
-        ttk.Button(frame, text="⬅ Voltar ao menu", command=lambda: self.show_frame(self.menu_frame)).pack(pady=10)
+        self.filters_table.frame.pack(padx=10, pady=10, fill="both", expand=True)
+        ttk.Button(frame, text="⬅ Voltar ao menu", command=lambda: self.show_frame("menu")).pack(pady=10)
 
         # Bind the Enter key to the search action for better UX.
         self.equipment_to_use.bind("<Return>", lambda event: self.run_filters_search())
@@ -0,0 +1,191 @@
+#
+# schema.py
+#
+# Description:
+# Declared column types of the CSV sources. Without them, `pd.read_csv` keeps every text
+# column as one Python string per row and materializes columns nothing reads. With them,
+# only the declared columns are parsed, text columns with few distinct values (systems,
+# components, maintenance types, models) become categoricals, and integer columns are
+# downcast to the smallest type holding their values.
+#
+# Large sources can be read in chunks (`iter_csv_typed`) and put back together without
+# losing the categories (`concat_typed`). `memory_report` compares the per-column
+# footprint of a frame before and after.
+#
+
+from __future__ import annotations
+
+from typing import Iterator
+
+from lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+CATEGORY = "category"
+# Parsed as usual and downcast (e.g. to int32) when the whole column is integer.
+INTEGER = "integer"
+
+# matriz.csv: the columns read by `fetch_plans` and the tire-service flag.
+MATRIX_SCHEMA = {
+    "Chave": CATEGORY,
+    "no_ref_prog": CATEGORY,
+    "no_seq": INTEGER,
+    "de_operacao": CATEGORY,
+    "de_tarefa": CATEGORY,
+    "de_sist_veic": CATEGORY,
+    "de_sub_sist": CATEGORY,
+    "de_compo": CATEGORY,
+    "de_tp_manut": CATEGORY,
+    "fg_garantia": CATEGORY,
+}
+
+# os.csv: the columns of the O.S index.
+OS_SCHEMA = {
+    "O.S": INTEGER,
+    "MODELO": CATEGORY,
+    "PLANO": CATEGORY,
+}
+
+
+def read_csv_typed(path, schema: dict[str, str], **read_kwargs) -> pd.DataFrame:
+    """
+    Reads a CSV file with a declared schema.
+
+    Columns missing from the file are skipped rather than reported, like a plain read
+    of an older export would.
+
+    Args:
+        path: The CSV file, or a file-like object.
+        schema (dict[str, str]): Column -> CATEGORY or INTEGER. Other columns are not read.
+        **read_kwargs: Options forwarded to `pd.read_csv`.
+
+    Returns:
+        pd.DataFrame: The parsed columns, in file order.
+    """
+    df = pd.read_csv(path, **_typed_options(schema), **read_kwargs)
+    return downcast_integers(df, _integer_columns(schema))
+
+
+def iter_csv_typed(path, schema: dict[str, str], chunk_rows: int, **read_kwargs) -> Iterator[pd.DataFrame]:
+    """
+    Reads a CSV file with a declared schema, `chunk_rows` rows at a time.
+
+    Each chunk has its own categories; see `concat_typed` to combine them.
+
+    Args:
+        path: The CSV file, or a file-like object.
+        schema (dict[str, str]): Column -> CATEGORY or INTEGER. Other columns are not read.
+        chunk_rows (int): Rows per chunk.
+        **read_kwargs: Options forwarded to `pd.read_csv`.
+
+    Yields:
+        pd.DataFrame: The parsed columns of each chunk, labelled by row number in the file.
+    """
+    with pd.read_csv(path, chunksize=chunk_rows, **_typed_options(schema), **read_kwargs) as reader:
+        for chunk in reader:
+            yield downcast_integers(chunk, _integer_columns(schema))
+
+
+def _typed_options(schema: dict[str, str]) -> dict:
+    return {
+        "usecols": lambda column: column in schema,
+        "dtype": {column: kind for column, kind in schema.items() if kind != INTEGER},
+    }
+
+
+def _integer_columns(schema: dict[str, str]) -> list[str]:
+    return [column for column, kind in schema.items() if kind == INTEGER]
+
+
+def downcast_integers(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    """
+    Stores integer columns in the smallest integer type that holds their values.
+
+    Columns that are not integer (e.g. with missing values or text) are left as they are.
+
+    Args:
+        df (pd.DataFrame): The frame. It is modified in place.
+        columns (list[str]): The columns to downcast.
+
+    Returns:
+        pd.DataFrame: The same frame.
+    """
+    for column in columns:
+        if column in df.columns and pd.api.types.is_integer_dtype(df[column].dtype):
+            df[column] = pd.to_numeric(df[column], downcast="integer")
+    return df
+
+
+def concat_typed(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenates frames with the same columns, e.g. chunks of one file, merging the
+    categories of categorical columns instead of turning them back into strings.
+
+    Args:
+        frames (list[pd.DataFrame]): At least one frame.
+
+    Returns:
+        pd.DataFrame: The rows of all frames, in order, indexed from 0.
+    """
+    result = pd.concat(frames, ignore_index=True)
+    for column, dtype in frames[0].dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype) and not isinstance(result[column].dtype, pd.CategoricalDtype):
+            result[column] = pd.api.types.union_categoricals([frame[column].array for frame in frames])
+    return result
+
+
+def append_typed(frame: pd.DataFrame, rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Appends rows to a frame, keeping the frame's categorical and downcast columns.
+
+    A plain `pd.concat` turns a categorical column back into strings as soon as the new
+    rows bring a value it has not seen, and widens downcast integers to int64.
+
+    Args:
+        frame (pd.DataFrame): The current rows.
+        rows (pd.DataFrame): The new rows, with the same columns.
+
+    Returns:
+        pd.DataFrame: A new frame with both, indexed from 0.
+    """
+    result = pd.concat([frame, rows], ignore_index=True)
+    for column, dtype in frame.dtypes.items():
+        if column not in rows.columns or result[column].dtype == dtype:
+            continue
+        if isinstance(dtype, pd.CategoricalDtype):
+            try:
+                result[column] = pd.api.types.union_categoricals([frame[column].array, pd.Categorical(rows[column])])
+            except TypeError:
+                # New values of another type (e.g. numbers in a text column): keep them as read.
+                pass
+        elif pd.api.types.is_integer_dtype(dtype) and pd.api.types.is_integer_dtype(result[column].dtype):
+            result[column] = pd.to_numeric(result[column], downcast="integer")
+    return result
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compares the memory taken by each column of two versions of the same data.
+
+    Args:
+        before (pd.DataFrame): The data as read without a schema.
+        after (pd.DataFrame): The data as read with it. Columns it lacks count as 0 bytes.
+
+    Returns:
+        pd.DataFrame: One row per column of `before` (then any new column of `after`), and
+                      a "total" row, with the columns "dtype_before", "bytes_before",
+                      "dtype_after", "bytes_after" and "ratio" (before / after).
+    """
+    bytes_before = before.memory_usage(deep=True, index=False)
+    bytes_after = after.memory_usage(deep=True, index=False)
+    columns = list(before.columns) + [column for column in after.columns if column not in before.columns]
+
+    report = pd.DataFrame({
+        "dtype_before": [str(before[c].dtype) if c in before.columns else "-" for c in columns],
+        "bytes_before": [int(bytes_before.get(c, 0)) for c in columns],
+        "dtype_after": [str(after[c].dtype) if c in after.columns else "-" for c in columns],
+        "bytes_after": [int(bytes_after.get(c, 0)) for c in columns],
+    }, index=pd.Index(columns, name="column"))
+    report.loc["total"] = ["", report["bytes_before"].sum(), "", report["bytes_after"].sum()]
+    report["ratio"] = report["bytes_before"] / report["bytes_after"].where(report["bytes_after"] > 0)
+    return report
@@ -0,0 +1,286 @@
+#
+# server.py
+#
+# Description:
+# Local HTTP service that loads the data sources once and answers the toolkit's queries
+# as JSON, so several desktops share one parsed copy of matriz.csv, os.csv and
+# planilha.xlsx instead of each holding its own. Built on `http.server` only; requests
+# are handled by a fixed pool of threads, all reading the same DataStore (whose loads,
+# indexes and caches are thread-safe). The data files are watched like in the GUI.
+#
+# Usage:
+#     python -m server [--host 127.0.0.1] [--port 8765] [--workers 8] [--data-dir .]
+#
+# Endpoints (POST bodies and responses are JSON objects):
+#     GET  /health            {"status", "loaded"}
+#     POST /orders            {"text"} -> {"orders"}
+#     POST /work_logs         {"service_order", "interval", "date", "start", "end",
+#                              "plan_type"?, "end_date"?} -> {"logs"}
+#     POST /plan              {"os_number"} -> {"equipment", "plans", "tasks",
+#                                               "tire_service", "general_service"}
+#     POST /sequences         {"os_number", "plan_type"?} -> {"sequences"}
+#     POST /batch_work_logs   {"orders": [{"os_number", "date", "start", "end",
+#                                          "plan_type"?}]} -> {"results": [{"logs", "error"}]}
+#     POST /equipment_items   {"fleet"} -> {"columns", "rows"}
+#
+# Validation errors answer 400 with {"error": message}, in the same words the GUI shows.
+#
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Callable
+
+import functions
+from datastore import DataStore
+from watcher import SourceWatcher
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Largest accepted request body; pasted reports are a few MB at most.
+MAX_BODY_BYTES = 64 << 20
+
+# Seconds a connection may stay silent (idle keep-alive, stalled body) before it is
+# closed. Each connection holds a worker, so idle clients must not keep them forever.
+IDLE_TIMEOUT = 15.0
+
+
+def _field(payload: dict, name: str, default: object = None) -> object:
+    value = payload.get(name, default)
+    if value is None:
+        raise ValueError(f"Campo obrigatório ausente: {name}")
+    return value
+
+
+def frame_to_json(df) -> dict:
+    """
+    Converts a DataFrame to {"columns": [...], "rows": [[...], ...]} with plain JSON values.
+
+    Args:
+        df (pd.DataFrame): The frame to convert.
+
+    Returns:
+        dict: The columns and the rows; missing values become None.
+    """
+    values = df.astype(object).where(df.notna(), None)
+    return {"columns": [str(column) for column in df.columns], "rows": values.values.tolist()}
+
+
+def handle_orders(store: DataStore, payload: dict) -> dict:
+    return {"orders": functions.extract_orders(str(_field(payload, "text")))}
+
+
+def handle_work_logs(store: DataStore, payload: dict) -> dict:
+    return {"logs": functions.work_logs(
+        str(_field(payload, "service_order")), str(_field(payload, "interval")), str(_field(payload, "date")),
+        str(_field(payload, "start")), str(_field(payload, "end")),
+        str(payload.get("plan_type") or ""), str(payload.get("end_date") or ""),
+    )}
+
+
+def handle_plan(store: DataStore, payload: dict) -> dict:
+    equipment, plans = functions.get_equipment_and_plan(str(_field(payload, "os_number")), store)
+    if not equipment or not plans:
+        raise ValueError("Ordem de serviço não encontrada!")
+    tasks = functions.fetch_plans(equipment, plans, store)
+    tire_service, general_service = functions.split_auto_tire_service(tasks)
+    return {
+        "equipment": equipment,
+        "plans": plans,
+        "tasks": frame_to_json(tasks),
+        "tire_service": tire_service,
+        "general_service": general_service,
+    }
+
+
+def handle_sequences(store: DataStore, payload: dict) -> dict:
+    return {"sequences": functions.auto_work_log_sequences(
+        str(_field(payload, "os_number")), str(payload.get("plan_type") or ""), store
+    )}
+
+
+def handle_batch_work_logs(store: DataStore, payload: dict) -> dict:
+    orders = [
+        functions.BatchOrder(
+            line, str(_field(order, "os_number")), str(_field(order, "date")), str(_field(order, "start")),
+            str(_field(order, "end")), str(order.get("plan_type") or ""),
+        )
+        for line, order in enumerate(_field(payload, "orders"), start=1)
+    ]
+    return {"results": [
+        {"logs": logs, "error": error} for _, logs, error in functions.batch_work_logs(orders, store)
+    ]}
+
+
+def handle_equipment_items(store: DataStore, payload: dict) -> dict:
+    try:
+        fleet = int(_field(payload, "fleet"))
+    except (TypeError, ValueError):
+        raise ValueError("Por favor, insira apenas valores numéricos.")
+    return frame_to_json(functions.get_equipment_items(fleet, store))
+
+
+# Path -> handler(store, payload) for POST requests.
+ROUTES: dict[str, Callable[[DataStore, dict], dict]] = {
+    "/orders": handle_orders,
+    "/work_logs": handle_work_logs,
+    "/plan": handle_plan,
+    "/sequences": handle_sequences,
+    "/batch_work_logs": handle_batch_work_logs,
+    "/equipment_items": handle_equipment_items,
+}
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server: ToolkitServer
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, keep-alive clients wait on
+    # delayed ACKs for every response.
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        # Applied to the socket by `StreamRequestHandler.setup`; a timed-out wait for the
+        # next request closes the connection and frees the worker.
+        self.timeout = self.server.idle_timeout
+        super().setup()
+
+    def _send_json(self, status: int, body: dict) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._send_json(404, {"error": f"Endereço desconhecido: {self.path}"})
+            return
+        store = self.server.store
+        loaded = [name for name in ("matrix", "os", "bd_filters", "stock", "itens_prices") if store.is_loaded(name)]
+        self._send_json(200, {"status": "ok", "loaded": loaded})
+
+    def do_POST(self) -> None:
+        handler = ROUTES.get(self.path)
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._send_json(400, {"error": "Cabeçalho Content-Length inválido."})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413, {"error": "Requisição grande demais."})
+            return
+        body = self.rfile.read(length)
+        if handler is None:
+            self._send_json(404, {"error": f"Endereço desconhecido: {self.path}"})
+            return
+
+        try:
+            payload = json.loads(body or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("O corpo da requisição deve ser um objeto JSON.")
+            status, response = 200, handler(self.server.store, payload)
+        except FileNotFoundError as e:
+            status, response = 503, {"error": f"Arquivo de dados não encontrado: {e.filename}"}
+        except ValueError as e:
+            # json.JSONDecodeError is a ValueError too.
+            status, response = 400, {"error": str(e)}
+        except Exception as e:
+            self.log_error("%s failed: %r", self.path, e)
+            status, response = 500, {"error": "Erro interno do servidor."}
+        self._send_json(status, response)
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ToolkitServer(HTTPServer):
+    """
+    An HTTP server answering on a fixed pool of worker threads, sharing one DataStore.
+
+    Attributes:
+        store (DataStore): The data every request reads.
+        verbose (bool): Whether each request is logged to stderr.
+        idle_timeout (float): Seconds a connection may stay silent before it is closed.
+    """
+    def __init__(self, address: tuple[str, int], store: DataStore, workers: int = 8, verbose: bool = False,
+                 idle_timeout: float = IDLE_TIMEOUT):
+        """
+        Binds the server. Call `serve_forever` to start answering.
+
+        Args:
+            address (tuple[str, int]): Host and port; port 0 picks a free one.
+            store (DataStore): The data source shared by all requests.
+            workers (int, optional): Number of request threads. Defaults to 8.
+            verbose (bool, optional): Log each request to stderr. Defaults to False.
+            idle_timeout (float, optional): Seconds a connection may stay silent, between
+                                            requests or within one, before it is closed.
+                                            Defaults to 15.
+        """
+        super().__init__(address, _RequestHandler)
+        self.store = store
+        self.verbose = verbose
+        self.idle_timeout = idle_timeout
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="toolkit-http")
+
+    def process_request(self, request, client_address) -> None:
+        self._pool.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server, e.g. "http://127.0.0.1:8765"."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m server", description="Serviço HTTP do Apprentice Toolkit.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="endereço de escuta (0.0.0.0 para a rede local)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=8, help="requisições atendidas ao mesmo tempo")
+    parser.add_argument("--data-dir", default=".", help="pasta com matriz.csv, os.csv e planilha.xlsx")
+    parser.add_argument("--verbose", action="store_true", help="registra cada requisição em stderr")
+    args = parser.parse_args(argv)
+
+    store = DataStore(args.data_dir)
+    print("Carregando dados...", file=sys.stderr)
+    store.warm(background=False)
+    watcher = SourceWatcher(store)
+    watcher.start()
+
+    server = ToolkitServer((args.host, args.port), store, args.workers, args.verbose)
+    print(f"Servindo em {server.url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
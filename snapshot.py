@@ -0,0 +1,288 @@
+#
+# snapshot.py
+#
+# Description:
+# Binary snapshot cache for the toolkit's data sources (matriz.csv, os.csv and the
+# sheets of planilha.xlsx). The first load of a source parses it normally and writes a
+# columnar copy next to a small JSON manifest. Later loads reuse that copy and only
+# re-parse the source when its size, modification time or content hash changed.
+# Snapshots are kept in a `.snapshots` folder next to their source, so each data
+# directory has its own cache.
+#
+# Feather (memory-mapped) is used when pyarrow is installed, pickle otherwise.
+#
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+import tempfile
+from typing import Callable
+
+from lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+# Checked without importing pyarrow, which is only loaded when a snapshot is read or written.
+_HAS_FEATHER = importlib.util.find_spec("pyarrow") is not None
+
+
+# Folder of the snapshots, inside the directory of their source.
+SNAPSHOT_DIR = ".snapshots"
+
+# Bump whenever the snapshot layout changes so old copies are ignored.
+SNAPSHOT_VERSION = 1
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def content_hash(path: str) -> str:
+    """
+    Computes the SHA-1 hash of a file's content, reading it in 1 MiB chunks.
+
+    Args:
+        path (str): The file to hash.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    digest = hashlib.sha1()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: str) -> dict:
+    """
+    Returns the cheap part of a source's identity: absolute path, size and mtime.
+
+    Args:
+        path (str): The source file.
+
+    Returns:
+        dict: A dictionary with the keys "path", "size" and "mtime_ns".
+    """
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def default_snapshot_dir(path: str) -> str:
+    """Returns the snapshot folder of a source: `.snapshots` in the source's directory."""
+    return os.path.join(os.path.dirname(os.path.abspath(path)), SNAPSHOT_DIR)
+
+
+def _snapshot_paths(path: str, variant: str, snapshot_dir: str) -> tuple[str, str]:
+    """Returns the (data, manifest) file paths of the snapshot for a source and variant."""
+    key = hashlib.sha1(f"{os.path.abspath(path)}|{variant}".encode("utf-8")).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    extension = "feather" if _HAS_FEATHER else "pkl"
+    base = os.path.join(snapshot_dir, f"{stem}-{key}")
+    return f"{base}.{extension}", f"{base}.json"
+
+
+def _read_manifest(manifest_path: str) -> dict | None:
+    try:
+        with open(manifest_path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path: str, writer: Callable[[str], None]) -> None:
+    """
+    Writes a file through a temporary path so readers never see a partial snapshot.
+
+    The temporary name is unique, so processes rebuilding the same snapshot at once each
+    write their own copy and the last rename wins.
+    """
+    descriptor, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp",
+                                            dir=os.path.dirname(path) or ".")
+    os.close(descriptor)
+    try:
+        writer(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _write_frame(df: pd.DataFrame, data_path: str) -> None:
+    if _HAS_FEATHER:
+        import pyarrow
+
+        try:
+            _write_atomic(data_path, lambda p: df.reset_index(drop=True).to_feather(p))
+            return
+        except (TypeError, ValueError, ImportError, pyarrow.ArrowException):
+            # Mixed-type object columns cannot be stored as Arrow; fall back to pickle.
+            pass
+    _write_atomic(data_path, lambda p: df.to_pickle(p, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _read_frame(data_path: str) -> pd.DataFrame:
+    if _HAS_FEATHER:
+        import pyarrow
+        from pyarrow import feather
+
+        try:
+            return feather.read_table(data_path, memory_map=True).to_pandas()
+        except pyarrow.ArrowException:
+            # The file may be a pickle written by the fallback above.
+            pass
+    return pd.read_pickle(data_path)
+
+
+def _is_current(manifest: dict | None, fingerprint: dict, variant: str, path: str) -> tuple[bool, str | None]:
+    """
+    Checks whether a manifest still describes the source on disk.
+
+    Returns a (current, content_hash) tuple. The hash is only computed when the cheap
+    fingerprint differs, so unchanged sources are validated with a single `stat` call.
+    """
+    if not manifest:
+        return False, None
+    if (
+        manifest.get("version") != SNAPSHOT_VERSION
+        or manifest.get("pandas") != pd.__version__
+        or manifest.get("variant") != variant
+        or manifest.get("path") != fingerprint["path"]
+    ):
+        return False, None
+    if manifest.get("size") == fingerprint["size"] and manifest.get("mtime_ns") == fingerprint["mtime_ns"]:
+        return True, manifest.get("sha1")
+
+    # The file was touched or copied: only a different content invalidates the snapshot.
+    if manifest.get("size") != fingerprint["size"]:
+        return False, None
+    digest = content_hash(path)
+    return digest == manifest.get("sha1"), digest
+
+
+def load_snapshot(path: str, reader: Callable[[], pd.DataFrame], variant: str = "",
+                  snapshot_dir: str | None = None, refresh: bool = False,
+                  fingerprint: dict | None = None) -> pd.DataFrame:
+    """
+    Loads a source through its binary snapshot, re-parsing it only when it changed.
+
+    Args:
+        path (str): The source file the snapshot represents.
+        reader (Callable[[], pd.DataFrame]): Parses the source when the snapshot is stale.
+        variant (str, optional): Distinguishes several snapshots of the same file,
+                                 e.g. one per Excel sheet or per set of read options.
+        snapshot_dir (str, optional): Directory where snapshots are stored. Defaults to
+                                      `default_snapshot_dir(path)`.
+        refresh (bool, optional): If True, ignores any existing snapshot and rebuilds it.
+        fingerprint (dict, optional): The source's `file_fingerprint`, when the caller
+                                      took it first, e.g. so that `reader` parses exactly
+                                      the bytes it describes.
+
+    Returns:
+        pd.DataFrame: The loaded data.
+
+    Raises:
+        FileNotFoundError: If the source file does not exist.
+    """
+    fingerprint = fingerprint or file_fingerprint(path)
+    snapshot_dir = snapshot_dir or default_snapshot_dir(path)
+    data_path, manifest_path = _snapshot_paths(path, variant, snapshot_dir)
+    manifest = None if refresh else _read_manifest(manifest_path)
+
+    current, digest = _is_current(manifest, fingerprint, variant, path)
+    if current and os.path.exists(data_path):
+        try:
+            df = _read_frame(data_path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            # A truncated or unreadable copy is rebuilt from the source below.
+            df = None
+        if df is not None:
+            if manifest.get("mtime_ns") != fingerprint["mtime_ns"]:
+                # Same content under a new mtime: refresh the manifest to skip hashing next time.
+                manifest.update(fingerprint)
+                _write_atomic(manifest_path, lambda p: _dump_manifest(manifest, p))
+            return df
+
+    df = reader()
+    try:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        _write_frame(df, data_path)
+        manifest = {
+            **fingerprint,
+            "sha1": digest or content_hash(path),
+            "variant": variant,
+            "version": SNAPSHOT_VERSION,
+            "pandas": pd.__version__,
+        }
+        _write_atomic(manifest_path, lambda p: _dump_manifest(manifest, p))
+    except OSError:
+        # A read-only or full disk must never prevent the data from being used.
+        pass
+    return df
+
+
+def _dump_manifest(manifest: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file)
+
+
+def load_csv(path: str, snapshot_dir: str | None = None, refresh: bool = False, **read_kwargs) -> pd.DataFrame:
+    """
+    Reads a CSV file through the snapshot cache.
+
+    Args:
+        path (str): The CSV file.
+        snapshot_dir (str, optional): Directory where snapshots are stored. Defaults to
+                                      `default_snapshot_dir(path)`.
+        refresh (bool, optional): If True, forces the CSV to be parsed again.
+        **read_kwargs: Options forwarded to `pd.read_csv`. They are part of the snapshot key.
+
+    Returns:
+        pd.DataFrame: The parsed CSV.
+    """
+    variant = f"csv|{sorted(read_kwargs.items())!r}"
+    return load_snapshot(path, lambda: pd.read_csv(path, **read_kwargs), variant, snapshot_dir, refresh)
+
+
+def load_excel(path: str, sheet_name: str, snapshot_dir: str | None = None, refresh: bool = False, **read_kwargs) -> pd.DataFrame:
+    """
+    Reads one sheet of an Excel workbook through the snapshot cache.
+
+    Args:
+        path (str): The workbook.
+        sheet_name (str): The sheet to read.
+        snapshot_dir (str, optional): Directory where snapshots are stored. Defaults to
+                                      `default_snapshot_dir(path)`.
+        refresh (bool, optional): If True, forces the sheet to be parsed again.
+        **read_kwargs: Options forwarded to `pd.read_excel`. They are part of the snapshot key.
+
+    Returns:
+        pd.DataFrame: The parsed sheet.
+    """
+    variant = f"excel|{sheet_name}|{sorted(read_kwargs.items())!r}"
+    return load_snapshot(
+        path, lambda: pd.read_excel(path, sheet_name=sheet_name, **read_kwargs), variant, snapshot_dir, refresh
+    )
+
+
+def clear_snapshots(snapshot_dir: str) -> int:
+    """
+    Deletes every snapshot in a directory.
+
+    Args:
+        snapshot_dir (str): Directory where snapshots are stored, e.g. the `SNAPSHOT_DIR`
+                            folder of a data directory.
+
+    Returns:
+        int: The number of files removed.
+    """
+    if not os.path.isdir(snapshot_dir):
+        return 0
+    removed = 0
+    for name in os.listdir(snapshot_dir):
+        if name.endswith((".feather", ".pkl", ".json", ".tmp")):
+            os.remove(os.path.join(snapshot_dir, name))
+            removed += 1
+    return removed
@@ -0,0 +1,143 @@
+#
+# sqlstore.py
+#
+# Description:
+# Read access to a local SQLite copy of the toolkit's data, as an alternative to holding
+# the parsed sources in memory. The file is written once by an import step
+# (`functions.import_database`, or `python -m cli import-db`) with the lookup tables the
+# queries need and an index on each lookup key; afterwards each query reads only the
+# rows it returns, so the process keeps almost nothing resident.
+#
+# Only the standard library's sqlite3 is used. Connections are opened read-only, one per
+# thread, so a `SQLiteStore` can be shared by the GUI's workers or the server's threads.
+#
+
+from __future__ import annotations
+
+import errno
+import os
+import pathlib
+import sqlite3
+import tempfile
+import threading
+
+from lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+DATABASE_FILE = "toolkit.db"
+
+# Bump whenever the tables written by the import change, so old files are rejected.
+SCHEMA_VERSION = 1
+
+
+def quote(name: str) -> str:
+    """Quotes a table or column name for SQL, e.g. `Cod. Sap` -> `"Cod. Sap"`."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def write_database(path: str, tables: dict[str, pd.DataFrame], indexes: dict[str, list[tuple[str, ...]]]) -> None:
+    """
+    Writes tables and their indexes to a new SQLite file.
+
+    The file is built under a unique temporary name and renamed at the end, so readers
+    never open a half-written import, a failed import leaves the previous file in place
+    and concurrent imports do not write into each other's file (the last rename wins).
+
+    Args:
+        path (str): The database file.
+        tables (dict[str, pd.DataFrame]): Table name -> rows. The frame index is not stored.
+        indexes (dict[str, list[tuple[str, ...]]]): Table name -> indexed column groups.
+    """
+    descriptor, temporary = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp",
+                                             dir=os.path.dirname(path) or ".")
+    os.close(descriptor)
+    try:
+        connection = sqlite3.connect(temporary)
+        try:
+            for name, frame in tables.items():
+                frame.to_sql(name, connection, index=False, chunksize=50_000)
+                for number, columns in enumerate(indexes.get(name, ())):
+                    connection.execute(
+                        f"CREATE INDEX {quote(f'{name}_{number}')} ON {quote(name)} ({', '.join(map(quote, columns))})"
+                    )
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            connection.commit()
+            connection.execute("ANALYZE")
+        finally:
+            connection.close()
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+class SQLiteStore:
+    """
+    Runs queries against a database written by `write_database`.
+
+    Attributes:
+        path (str): The database file.
+    """
+    def __init__(self, path: str = DATABASE_FILE):
+        """
+        Checks the database file. Connections are opened on first use, per thread.
+
+        Args:
+            path (str, optional): The database file. Defaults to "toolkit.db".
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the file was written by an incompatible import.
+        """
+        if not os.path.isfile(path):
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+        self.path = path
+        self._local = threading.local()
+
+        version = self.query("PRAGMA user_version")[0][0]
+        if version != SCHEMA_VERSION:
+            raise ValueError(f"Banco de dados {path} desatualizado; importe os dados novamente.")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            uri = pathlib.Path(self.path).resolve().as_uri() + "?mode=ro"
+            connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            self._local.connection = connection
+        return connection
+
+    def query(self, sql: str, parameters: tuple = ()) -> list[tuple]:
+        """
+        Runs a query and returns all its rows.
+
+        Args:
+            sql (str): The query, with `?` placeholders.
+            parameters (tuple, optional): The placeholder values.
+
+        Returns:
+            list[tuple]: The rows.
+        """
+        return self._connection().execute(sql, parameters).fetchall()
+
+    def read_frame(self, sql: str, parameters: tuple = ()) -> pd.DataFrame:
+        """
+        Runs a query and returns its rows as a DataFrame, with the query's column names.
+
+        Args:
+            sql (str): The query, with `?` placeholders.
+            parameters (tuple, optional): The placeholder values.
+
+        Returns:
+            pd.DataFrame: The rows.
+        """
+        cursor = self._connection().execute(sql, parameters)
+        columns = [description[0] for description in cursor.description]
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+    def close(self) -> None:
+        """Closes the calling thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
@@ -0,0 +1,18 @@
+from cache import LRUCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+
+
+def test_lru_counts_hits_and_misses():
+    cache = LRUCache(maxsize=4)
+    assert cache.get_or_compute("k", lambda: 10) == 10
+    assert cache.get_or_compute("k", lambda: 20) == 10
+    assert cache.info() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 4}
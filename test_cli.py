@@ -0,0 +1,35 @@
+import io
+
+from cli import main
+
+
+def test_orders_command_reads_files(tmp_path, capsys):
+    path = tmp_path / "export.txt"
+    path.write_text("OS 62112345; OS 62199999; 6211234", encoding="utf-8")
+    assert main(["orders", str(path), "--separator", ","]) == 0
+    assert capsys.readouterr().out == "62112345,62199999\n"
+
+
+def test_join_command(tmp_path, capsys):
+    path = tmp_path / "lista.txt"
+    path.write_text("TRATOR 8800\nCOLHEDORA\n", encoding="utf-8")
+    assert main(["join", str(path), "--separator", ";"]) == 0
+    assert capsys.readouterr().out == "TRATOR;8800;COLHEDORA\n"
+
+    assert main(["join", str(path), "--separator", " · "]) == 0
+    assert capsys.readouterr().out == "TRATOR · 8800 · COLHEDORA\n"
+    assert main(["join", str(path), "--separator", "\\t"]) == 0
+    assert capsys.readouterr().out == "TRATOR\t8800\tCOLHEDORA\n"
+
+
+def test_invalid_input_returns_error_code(capsys):
+    assert main(["worklogs", "62112345", "1-5", "data", "08:00", "09:00"]) == 1
+    assert "data válida" in capsys.readouterr().err
+
+
+def test_batch_command_reads_stdin_without_closing_it(tmp_path, monkeypatch, capsys):
+    stdin = io.StringIO("OS;Data;Inicio;Fim\n62100001;01/01/2025\n")
+    monkeypatch.setattr("sys.stdin", stdin)
+    assert main(["--data-dir", str(tmp_path), "batch", "-", "--output", str(tmp_path / "logs.txt")]) == 1
+    assert "Linha 2 (62100001)" in capsys.readouterr().err
+    assert not stdin.closed
@@ -0,0 +1,93 @@
+import pandas as pd
+import pytest
+from datastore import MATRIX_COLUMNS, DataStore
+from functions import fetch_plans
+
+
+def test_datasets_load_on_first_access_only():
+    calls = []
+
+    def load_os(data_dir, refresh):
+        calls.append(data_dir)
+        return pd.DataFrame({"O.S": [62100001], "MODELO": ["M1"], "PLANO": ["1"]})
+
+    store = DataStore(data_dir="data", loaders={"os": load_os})
+    assert not store.is_loaded("os")
+    assert store.os is store.os
+    assert calls == ["data"]
+
+
+def test_injected_frames_skip_loading():
+    frame = pd.DataFrame({"FROTA": [1]})
+    store = DataStore(loaders={"bd_filters": lambda *_: pytest.fail("should not load")}, bd_filters=frame)
+    assert store.bd_filters is frame
+
+
+def test_unknown_dataset_is_rejected():
+    with pytest.raises(ValueError):
+        DataStore(unknown=pd.DataFrame())
+
+
+def test_derived_is_rebuilt_after_replace():
+    store = DataStore(os=pd.DataFrame({"O.S": [1, 2]}))
+    builds = []
+
+    def build(s):
+        builds.append(1)
+        return len(s.os)
+
+    assert store.derived("count", build, ("os",)) == 2
+    assert store.derived("count", build, ("os",)) == 2
+    store.replace(os=pd.DataFrame({"O.S": [1, 2, 3]}))
+    assert store.derived("count", build, ("os",)) == 3
+    assert len(builds) == 2
+
+
+def test_warm_ignores_missing_files(tmp_path):
+    store = DataStore(data_dir=str(tmp_path))
+    store.warm(background=False)
+    assert not store.is_loaded("matrix")
+    with pytest.raises(FileNotFoundError):
+        store.matrix
+
+
+def test_matrix_load_adds_persisted_tire_service_flag(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "matriz.csv").write_text(
+        "Chave;de_tarefa;de_sub_sist\nA1N;Calibrar pneus;Geral\nA1N;Trocar óleo;Motor\nA1N;Trocar válvula;Roda\n",
+        encoding="latin1",
+    )
+    matrix = DataStore(".").matrix
+    assert matrix["fg_borracharia"].tolist() == [True, False, True]
+    assert matrix["fg_borracharia"].dtype == bool
+
+    # The second store reads the snapshot, flag included.
+    monkeypatch.setattr("tire_rules.RuleSet.classify_many", lambda *_: pytest.fail("should use the snapshot"))
+    assert DataStore(".").matrix["fg_borracharia"].tolist() == [True, False, True]
+
+
+def test_matrix_load_keeps_only_usable_rows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("datastore.MATRIX_CHUNK_ROWS", 2)
+    header = "Chave;no_ref_prog;no_seq;de_operacao;de_tarefa;de_sist_veic;de_sub_sist;de_compo;de_tp_manut;fg_garantia;obs\n"
+    rows = [
+        "T250N;250;1;Trocar;Trocar óleo;Motor;Lubrificação;Óleo;PREVENTIVA;N;x",
+        "T250N;250;2;Inspecionar;Inspecionar correia;Motor;Transmissão;Correia;INSPEÇÃO;N;x",
+        "T250S;250;1;Trocar;Trocar óleo;Motor;Lubrificação;Óleo;PREVENTIVA;S;x",
+        "T250N;250;3;Calibrar;Calibrar pneus;Rodado;Geral;Pneu;PREVENTIVA;N;x",
+        "TXN;X;1;Trocar;Trocar filtro;Motor;Lubrificação;Filtro;PREVENTIVA;N;x",
+        "C365N;365;1;Hibernar;Hibernar motor;Motor;Geral;Motor;HIBERNAÇÃO;N;x",
+    ]
+    (tmp_path / "matriz.csv").write_text(header + "\n".join(rows) + "\n", encoding="latin1")
+
+    store = DataStore(".")
+    matrix = store.matrix
+    assert matrix.columns.tolist() == MATRIX_COLUMNS + ["fg_borracharia"]
+    assert matrix["no_seq"].tolist() == [1, 3]
+    assert matrix["no_ref_prog"].tolist() == [250, 250]
+    assert matrix["fg_borracharia"].tolist() == [False, True]
+
+    # Keys whose rows were all filtered out are still known, unlike missing keys.
+    assert fetch_plans("T", ["250"], store)["de_tarefa"].tolist() == ["Trocar óleo", "Calibrar pneus"]
+    assert fetch_plans("C", ["365"], store).columns.tolist() != []
+    assert fetch_plans("Z", ["250"], store).empty
@@ -1,6 +1,10 @@
 import pandas as pd
 from io import StringIO
-from functions import split_tire_service, work_logs
+from datastore import DataStore
+from functions import (
+    split_tire_service, split_auto_tire_service, split_pasted_tire_service, work_logs, get_equipment_and_plan, fetch_plans, fetch_plans_cache_info, get_equipment_items,
+    parse_batch_orders, batch_work_logs, write_batch_work_logs, classify_task_files, write_task_classification,
+)
 from unittest.mock import MagicMock
 
 # Test data provided by the user
@@ -83,6 +87,56 @@ def test_split_tire_service_data3():
     assert sorted(tire_services) == sorted(expected_tire_services)
 
 
+def test_split_pasted_tire_service_matches_dataframe_path():
+    assert sorted(split_pasted_tire_service(data1)[0]) == [2, 3, 4, 5, 6, 11, 12, 13]
+    assert sorted(split_pasted_tire_service(data2)[0]) == [2, 3, 4, 5]
+    assert split_pasted_tire_service(data3)[0] == []
+    for data in (data1, data2, data3):
+        df = pd.read_csv(StringIO(data), sep='\t', header=None, engine='python').reset_index()
+        df["index"] = df["index"] + 1
+        assert split_pasted_tire_service(data) == split_tire_service(df)
+
+
+def test_split_pasted_tire_service_sparse_layout_and_blank_lines():
+    def row(status, description, component):
+        fields = [""] * 14
+        fields[0], fields[8], fields[12] = status, description, component
+        return "\t".join(fields)
+
+    text = "\r\n".join([
+        row("N", "Calibrar pneus", "Pneu"), "   ", row("S", "Calibrar pneus", "Pneu"),
+        "", row("N", "Trocar óleo", "Motor"),
+    ])
+    assert split_pasted_tire_service(text) == ([1], [3])
+    assert split_pasted_tire_service("\n  \n") == ([], [])
+
+
+def test_classify_task_files_in_parallel_matches_serial(tmp_path):
+    for number, data in enumerate([data1, data2, data3] * 3):
+        (tmp_path / f"OS_6210000{number}.txt").write_text(data, encoding="utf-8")
+    (tmp_path / "sem_numero.txt").write_text(data2, encoding="utf-8")
+
+    serial = list(classify_task_files([str(tmp_path)]))
+    assert serial == list(classify_task_files([str(tmp_path)], workers=2, batch_size=2))
+    assert [result.os_number for result in serial][:2] == ["62100000", "62100001"]
+    assert serial[-1].os_number == "sem_numero"
+    assert sorted(serial[0].tire_service) == [2, 3, 4, 5, 6, 11, 12, 13]
+    assert all(result.error is None for result in serial)
+
+
+def test_write_task_classification_reports_unreadable_files(tmp_path):
+    (tmp_path / "62100001.txt").write_text(data2, encoding="utf-8")
+    output = tmp_path / "classes.tsv"
+    files, lines, errors = write_task_classification(
+        [str(tmp_path / "62100001.txt"), str(tmp_path / "62100002.txt")], str(output)
+    )
+    rows = output.read_text(encoding="utf-8").splitlines()
+    assert (files, lines, len(rows)) == (1, len(rows) - 1, len(rows))
+    assert [error.os_number for error in errors] == ["62100002"]
+    assert rows[0] == "OS\tsequencia\tclasse"
+    assert rows[2] == "62100001\t2\tborracharia"
+
+
 def test_work_logs_success():
     expected_output = (
         "62112345\t\t\t1\t\t\t\t\t\t\t\t\t\t01/01/2025\t08:00\t01/01/2025\t08:12\t0,20\n"
@@ -105,6 +159,174 @@ def test_work_logs_invalid_date():
     with pytest.raises(ValueError, match="Por favor, insira uma data válida."):
         work_logs("62112345", "1-5", "invalid-date", "08:00", "09:00")
 
+def test_work_logs_crosses_midnight():
+    result = work_logs("62112345", "1-2", "31/12/2025", "23:30", "00:30")
+    assert result == (
+        "62112345\t\t\t1\t\t\t\t\t\t\t\t\t\t31/12/2025\t23:30\t01/01/2026\t00:00\t0,50\n"
+        "62112345\t\t\t2\t\t\t\t\t\t\t\t\t\t01/01/2026\t00:00\t01/01/2026\t00:30\t0,50\n"
+    )
+
+def test_work_logs_spans_several_days_and_ends_on_time():
+    lines = work_logs("62112345", "1-48", "01/01/2025", "00:58", "07:30", end_date="03/01/2025").splitlines()
+    assert len(lines) == 48
+    assert lines[0].split("\t")[-5:-3] == ["01/01/2025", "00:58"]
+    assert lines[-1].split("\t")[-3:-1] == ["03/01/2025", "07:30"]
+
+def test_work_logs_end_date_before_start():
+    with pytest.raises(ValueError, match="Conserte o horário"):
+        work_logs("62112345", "1-5", "02/01/2025", "08:00", "09:00", end_date="01/01/2025")
+
 def test_work_logs_invalid_time():
     with pytest.raises(ValueError, match="Por favor, insira um intervalo de tempo válido."):
         work_logs("62112345", "1-5", "01/01/2025", "invalid-time", "09:00")
+
+
+def make_store():
+    df_os = pd.DataFrame({
+        "O.S": [62100001, 62100002],
+        "MODELO": ["TRATOR ", "COLHEDORA"],
+        "PLANO": ["250/500", "365"],
+    })
+    df_matrix = pd.DataFrame({
+        "Chave": ["TRATOR250N", "TRATOR250N", "TRATOR500N", "TRATOR500N", "TRATOR250N", "COLHEDORA365N"],
+        "no_ref_prog": ["250", "250", "500", "500", "250", "365"],
+        "no_seq": [1, 2, 1, 2, 3, 1],
+        "de_operacao": ["Calibrar", "Trocar", "Calibrar", "Inspecionar", "Lavar", "Lavar"],
+        "de_tarefa": ["Calibrar pneus", "Trocar filtro", "Calibrar pneus", "Inspeção geral", "Lavar", "Lavar"],
+        "de_sist_veic": ["Rodante", "Motor", "Rodante", "Geral", "Geral", "Geral"],
+        "de_sub_sist": ["Pneu", "Filtro", "Pneu", "Geral", "Geral", "Geral"],
+        "de_compo": ["Pneu", "Filtro", "Pneu", "Geral", "Geral", "Geral"],
+        "de_tp_manut": ["PREVENTIVA", "PREVENTIVA", "PREVENTIVA", "INSPEÇÃO", "PREVENTIVA", "PREVENTIVA"],
+        "fg_garantia": ["N", "N", "N", "N", "S", "N"],
+    })
+    return DataStore(os=df_os, matrix=df_matrix)
+
+
+def test_get_equipment_and_plan_with_store():
+    store = make_store()
+    assert get_equipment_and_plan("62100001", store) == ("TRATOR", ["250", "500"])
+    assert get_equipment_and_plan(" 62100002 ", store) == ("COLHEDORA", ["365"])
+    assert get_equipment_and_plan("62199999", store) == (False, False)
+
+
+def test_fetch_plans_with_store():
+    store = make_store()
+    tasks = fetch_plans("TRATOR", ["250", "500"], store)
+    # Duplicated operations, warranty rows and blacklisted maintenance types are dropped.
+    assert tasks["de_tarefa"].tolist() == ["Calibrar pneus", "Trocar filtro"]
+    assert tasks["no_seq"].tolist() == [1, 2]
+    assert tasks["fg_borracharia"].tolist() == [True, False]
+    assert fetch_plans("TRATOR", ["999"], store).empty
+
+
+def test_split_auto_tire_service_uses_precomputed_flag():
+    tasks = pd.DataFrame({
+        "no_seq": [1, 2, 3],
+        "de_tarefa": ["Calibrar pneus", "Trocar filtro", "Trocar válvula"],
+        "de_sub_sist": ["Geral", "Motor", "Roda"],
+    })
+    assert split_auto_tire_service(tasks) == ([1, 3], [2])
+    # With the flag present the split is a plain partition.
+    assert split_auto_tire_service(tasks.assign(fg_borracharia=[False, True, False])) == ([2], [1, 3])
+
+
+def test_get_equipment_and_plan_first_row_wins():
+    store = DataStore(os=pd.DataFrame({
+        "O.S": [62100001, 62100001], "MODELO": ["A", "B"], "PLANO": ["1/2", "3"],
+    }))
+    equipment, plans = get_equipment_and_plan(62100001, store)
+    assert (equipment, plans) == ("A", ["1", "2"])
+    plans.append("9")
+    assert get_equipment_and_plan(62100001, store) == ("A", ["1", "2"])
+
+
+def test_fetch_plans_is_memoized_and_returns_copies():
+    store = make_store()
+    first = fetch_plans("TRATOR", ["250", "500"], store)
+    first["de_sub_sist"] = "changed"
+    second = fetch_plans("TRATOR", ["250", "500"], store)
+    assert second["de_sub_sist"].tolist() == ["Pneu", "Filtro"]
+    assert fetch_plans_cache_info(store)["hits"] == 1
+    # The shared matrix is no longer modified in place.
+    assert store.matrix["no_ref_prog"].tolist()[0] == "250"
+
+
+def make_workbook_store():
+    bd_filters = pd.DataFrame({
+        "FROTA": [10, 20, 10],
+        "PLANO REAL": ["250", "500", "500"],
+        "Tipo da peça": ["Filtro\nde ar", "Óleo", "Filtro"],
+        "Cod. Sap": [1, 2, 3],
+        "QNTD.": [1, None, 2],
+    })
+    prices = pd.DataFrame({"Material": [1, 2, 3], "Texto breve material": ["A", "B", "C"], "Tipo de MRP": ["ZB", "ZB", "PD"]})
+    stock = pd.DataFrame({"Material": [1, 3], "Utilização livre": [5, 0]})
+    return DataStore(bd_filters=bd_filters, itens_prices=prices, stock=stock)
+
+
+def test_get_equipment_items_slices_fleet_table():
+    store = make_workbook_store()
+    items = get_equipment_items(10, store)
+    assert items["Cod. Sap"].tolist() == [1, 3]
+    assert items["Tipo da peça"].tolist() == ["Filtrode ar", "Filtro"]
+    assert items["Texto breve material"].tolist() == ["A", "C"]
+    assert get_equipment_items(20, store)["QNTD."].tolist() == [0]
+
+
+def test_get_equipment_items_unknown_fleet():
+    with pytest.raises(ValueError, match="frota válida"):
+        get_equipment_items(99, make_workbook_store())
+
+
+def test_parse_batch_orders_detects_delimiters_and_header():
+    table = [
+        "OS;Data;Inicio;Fim;Tipo\n",
+        "62100001;01/01/2025;08:00;09:00;borracharia\n",
+        "\n",
+        "62100002\t02/01/2025\t10:00\t11:00\n",
+    ]
+    orders = list(parse_batch_orders(table))
+    assert [o.os_number for o in orders] == ["62100001", "62100002"]
+    assert [o.plan_type for o in orders] == ["tire_service", ""]
+    assert orders[1].line == 4
+
+
+def test_parse_batch_orders_reports_malformed_rows_and_late_header():
+    table = ["\n", "# exportado em 01/01/2025\n", "OS;Data;Inicio;Fim\n", "62100001;01/01/2025\n", "62100002;01/01/2025;08:00;09:00\n"]
+    orders = list(parse_batch_orders(table))
+    assert [(o.line, o.os_number, o.error) for o in orders] == [
+        (4, "62100001", "Esperado OS, data, hora inicial e hora final."), (5, "62100002", ""),
+    ]
+    results = list(batch_work_logs(orders, make_store()))
+    assert results[0][2] == orders[0].error
+    assert results[1][1].startswith("62100002\t")
+
+
+def test_batch_work_logs_reports_errors_per_order(tmp_path):
+    store = make_store()
+    orders = list(parse_batch_orders([
+        "62100001,01/01/2025,08:00,09:00,borracharia",
+        "62100001,01/01/2025,09:00,10:00,geral",
+        "62199999,01/01/2025,08:00,09:00",
+        "62100002,01/01/2025,08:00,09:00,borracharia",
+    ]))
+    results = list(batch_work_logs(orders, store))
+    assert results[0][1].startswith("62100001\t\t\t1\t")
+    assert results[1][1].startswith("62100001\t\t\t2\t")
+    assert results[2][2] == "Ordem de serviço não encontrada!"
+    assert results[3][2] == "Essa OS não possui nenhuma sequência de borracharia."
+
+    output_path = tmp_path / "logs.txt"
+    written, errors = write_batch_work_logs(orders, str(output_path), store)
+    assert written == 2 and len(errors) == 2
+    assert output_path.read_text(encoding="utf-8") == results[0][1] + results[1][1]
+
+
+def test_batch_work_logs_reports_equipment_missing_from_matrix():
+    store = make_store()
+    store.replace(os=pd.DataFrame({"O.S": [62100001, 62100003], "MODELO": ["TRATOR", "DESCONHECIDO"], "PLANO": ["250", "250"]}))
+    assert split_auto_tire_service(pd.DataFrame()) == ([], [])
+    orders = list(parse_batch_orders(["62100003,01/01/2025,08:00,09:00", "62100001,01/01/2025,08:00,09:00"]))
+    results = list(batch_work_logs(orders, store))
+    assert results[0][2] == "Ordem de serviço não encontrada!"
+    assert results[1][1].startswith("62100001\t") and not results[1][2]
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+import instrumentation
+from instrumentation import instrumented
+
+
+@pytest.fixture
+def collecting(monkeypatch):
+    monkeypatch.setattr(instrumentation, "_enabled", True)
+    instrumentation.reset()
+    yield
+    instrumentation.reset()
+
+
+@instrumented(size="text", unit="chars")
+def shout(text, times=1):
+    return text.upper() * times
+
+
+@instrumented(unit="orders")
+def numbers(count):
+    yield from range(count)
+
+
+def test_disabled_records_nothing(monkeypatch):
+    monkeypatch.setattr(instrumentation, "_enabled", False)
+    instrumentation.reset()
+    assert shout("abc") == "ABC"
+    assert list(numbers(3)) == [0, 1, 2]
+    assert instrumentation.snapshot()["functions"] == {}
+
+
+def test_counts_sizes_errors_and_slow_calls(collecting, monkeypatch):
+    monkeypatch.setattr(instrumentation, "SLOW_CALL_SECONDS", 0.0)
+    shout("abcd")
+    shout(text="ab", times=2)
+    with pytest.raises(AttributeError):
+        shout(None)
+
+    stats = instrumentation.snapshot()["functions"]["shout"]
+    assert stats["count"] == 3
+    assert stats["errors"] == 1
+    assert stats["size_total"] == 6 and stats["size_max"] == 4 and stats["size_unit"] == "chars"
+    assert stats["p50_s"] <= stats["p99_s"] <= stats["max_s"]
+
+    calls = instrumentation.snapshot()["slow_calls"]
+    assert len(calls) == 3
+    assert ["text='ab'", "times=2"] in [call["args"] for call in calls]
+
+
+def test_generators_count_produced_items_and_dump_json(collecting, tmp_path):
+    assert sum(numbers(5)) == 10
+    instrumentation.register_cache("test", lambda: {"hits": 3, "misses": 1, "size": 4, "maxsize": 8})
+    path = tmp_path / "stats.json"
+    instrumentation.dump_json(str(path))
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["functions"]["numbers"]["size_total"] == 5
+    assert data["caches"]["test"]["hit_rate"] == 0.75
+    assert "numbers" in instrumentation.format_report()
+    instrumentation._caches.pop("test")
@@ -0,0 +1,29 @@
+import sys
+import threading
+from lazy import LazyModule, lazy_import
+
+
+def test_lazy_import_returns_loaded_modules_directly():
+    assert lazy_import("os") is sys.modules["os"]
+
+
+def test_lazy_module_loads_on_first_attribute(monkeypatch):
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    proxy = lazy_import("colorsys")
+    assert isinstance(proxy, LazyModule)
+    assert not proxy.is_loaded
+    assert proxy.rgb_to_hsv(1, 0, 0) == (0.0, 1.0, 1)
+    assert proxy.is_loaded
+    assert "rgb_to_hsv" in vars(proxy)
+
+
+def test_lazy_module_concurrent_first_access(monkeypatch):
+    monkeypatch.delitem(sys.modules, "fractions", raising=False)
+    proxy = lazy_import("fractions")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(proxy.Fraction)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(results)) == 1
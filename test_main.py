@@ -1,5 +1,8 @@
-from functions import process_orders, process_text, search_orders
+from main import process_orders, process_text, search_orders, TaskRunner, TableModel
+from functions import iter_orders_in_file, scan_orders, join_text, join_orders
 import pandas as pd
+import pytest
+import threading
 from unittest.mock import MagicMock
 
 class FakeText:
@@ -47,6 +50,11 @@ def test_process_orders_empty(monkeypatch):
     process_orders(input_text, separator_entry, output_text)
     fake_showwarning.assert_called_once()
 
+def test_join_orders_raises_without_orders():
+    assert join_orders("62134598 x 62130089", ";") == "62134598;62130089"
+    with pytest.raises(ValueError, match="Não existe nenhuma ordem"):
+        join_orders("sem ordens")
+
 def test_process_text_remove_spaces():
     ptext_input = FakeText("olá mundo teste")
     separator_entry = FakeEntry(",")
@@ -89,3 +97,112 @@ def test_search_orders_not_found(monkeypatch):
     assert search_output.content == ""
     fake_showwarning.assert_called_once()
 
+
+def test_iter_orders_in_file_handles_chunk_boundaries(tmp_path):
+    text = "x62112345 962112346 62112347_ 62112348\n62112349"
+    path = tmp_path / "export.txt"
+    path.write_text(text, encoding="utf-8")
+    for chunk_size in (1, 3, 8, 9, 1024):
+        assert list(iter_orders_in_file(str(path), chunk_size)) == ["62112348", "62112349"]
+
+def test_scan_orders_walks_directories_with_running_count(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.txt").write_text("62100001 62100002", encoding="utf-8")
+    (tmp_path / "sub" / "b.txt").write_text("ordem 62100003", encoding="utf-8")
+    matches = list(scan_orders([str(tmp_path)], chunk_size=4))
+    assert [(m.count, m.order) for m in matches] == [(1, "62100001"), (2, "62100002"), (3, "62100003")]
+
+def test_join_text_keeps_blank_line_separators():
+    lines = ["", "  TRATOR  8800 ", "", "COLHEDORA", "   ", ""]
+    assert join_text(lines, ";", space_choice=False) == "TRATOR;8800;;COLHEDORA"
+    assert join_text(lines, ";", space_choice=True) == "TRATOR  8800;;COLHEDORA"
+    assert join_text(["", " "], ";") == ""
+
+def test_join_text_reads_files(tmp_path):
+    path = tmp_path / "lista.txt"
+    path.write_text("a b\nc\n", encoding="utf-8")
+    with open(path, encoding="utf-8") as source:
+        assert join_text(source, ",") == "a,b,c"
+
+
+class FakeRoot:
+    """Collects `after` callbacks so tests can run the Tk polling by hand."""
+    def __init__(self):
+        self.callbacks = []
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+    def run_pending(self, runner):
+        while self.callbacks:
+            runner._executor.shutdown(wait=True)  # let workers finish before polling
+            self.callbacks.pop(0)()
+
+def test_task_runner_delivers_results_and_busy_state():
+    root = FakeRoot()
+    busy = []
+    runner = TaskRunner(root, on_busy=busy.append)
+    results, errors = [], []
+    runner.submit("a", lambda: 21 * 2, results.append)
+    runner.submit("b", lambda: int("x"), results.append, errors.append)
+    assert runner.is_busy("a")
+    root.run_pending(runner)
+    assert results == [42]
+    assert isinstance(errors[0], ValueError)
+    assert busy == [True, False]
+    assert not runner.is_busy()
+
+def test_task_runner_drops_stale_and_cancelled_results():
+    root = FakeRoot()
+    runner = TaskRunner(root)
+    release = threading.Event()
+    results = []
+    runner.submit("search", lambda: release.wait() and "old", results.append)
+    runner.submit("search", lambda: "new", results.append)
+    runner.submit("other", lambda: "cancelled", results.append)
+    runner.cancel("other")
+    release.set()
+    root.run_pending(runner)
+    assert results == ["new"]
+
+
+def test_table_model_pages_sorts_and_filters():
+    df = pd.DataFrame({
+        "Tipo da peça": ["Filtro de ar", "Óleo", "Filtro de óleo", None, "Correia"],
+        "QNTD.": [1, 2, None, 4, 5],
+    }, index=[10, 11, 12, 13, 14])
+    model = TableModel(df, page_size=2)
+    assert model.row_count == 5 and model.page_count == 3
+    assert model.page_rows(0) == [("Filtro de ar", "1.0"), ("Óleo", "2.0")]
+    assert model.page_rows(2) == [("Correia", "5.0")]
+
+    model.sort_by("QNTD.")
+    model.sort_by("QNTD.")  # descending; missing values stay last
+    assert [row[1] for row in model.page_rows(0) + model.page_rows(1) + model.page_rows(2)] == ["5.0", "4.0", "2.0", "1.0", ""]
+
+    model.set_filter("FILTRO")
+    assert model.row_count == 2
+    model.set_filter("filtro de ó")  # narrows the previous matches
+    assert model.page_rows(0) == [("Filtro de óleo", "")]
+    model.set_filter("")
+    assert model.row_count == 5
+    assert model.page_count == 3
+
+
+def test_importing_the_gui_does_not_load_pandas():
+    import subprocess, sys
+    code = "import sys, main; print('pandas.core.frame' in sys.modules, 'numpy.linalg' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["False", "False"]
+
+
+def test_startup_timer_writes_one_line(tmp_path):
+    from main import StartupTimer
+    timer = StartupTimer(0.0)
+    timer.mark("imports")
+    timer.mark("imports")
+    timer.mark("first_paint")
+    log = tmp_path / "startup.log"
+    timer.write(str(log))
+    timer.write(str(log))
+    lines = log.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    assert "imports" in lines[0] and "first_paint" in lines[0]
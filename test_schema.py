@@ -0,0 +1,37 @@
+from io import StringIO
+
+import pandas as pd
+
+from schema import CATEGORY, INTEGER, append_typed, memory_report, read_csv_typed
+
+CSV = """O.S;MODELO;PLANO;OBSERVACAO
+62100001;TRATOR;250/500;primeira
+62100002;TRATOR;365;segunda
+62100003;COLHEDORA;250/500;terceira
+"""
+SCHEMA = {"O.S": INTEGER, "MODELO": CATEGORY, "PLANO": CATEGORY, "AUSENTE": CATEGORY}
+
+
+def test_read_csv_typed_projects_and_types_columns():
+    df = read_csv_typed(StringIO(CSV), SCHEMA, sep=";")
+    assert df.columns.tolist() == ["O.S", "MODELO", "PLANO"]
+    assert df["O.S"].dtype == "int32"
+    assert isinstance(df["MODELO"].dtype, pd.CategoricalDtype)
+    assert df["PLANO"].tolist() == ["250/500", "365", "250/500"]
+
+    # Enough repeated rows for categories to pay off, whatever the string storage.
+    many = CSV + "".join(CSV.splitlines(keepends=True)[1:]) * 200
+    report = memory_report(pd.read_csv(StringIO(many), sep=";"), read_csv_typed(StringIO(many), SCHEMA, sep=";"))
+    assert report.loc["OBSERVACAO", "bytes_after"] == 0
+    assert report.loc["total", "bytes_before"] > report.loc["total", "bytes_after"]
+    assert report.loc["O.S", "ratio"] == 2
+
+
+def test_append_typed_keeps_categories_and_downcast_integers():
+    frame = read_csv_typed(StringIO(CSV), SCHEMA, sep=";")
+    rows = pd.DataFrame({"O.S": [62100004], "MODELO": ["PULVERIZADOR"], "PLANO": ["365"]})
+    result = append_typed(frame, rows)
+    assert result["O.S"].dtype == "int32"
+    assert isinstance(result["MODELO"].dtype, pd.CategoricalDtype)
+    assert result["MODELO"].tolist() == ["TRATOR", "TRATOR", "COLHEDORA", "PULVERIZADOR"]
+    assert result.index.tolist() == [0, 1, 2, 3]
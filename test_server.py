@@ -0,0 +1,97 @@
+import http.client
+import json
+import socket
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend import RemoteBackend
+from functions import BatchOrder
+from server import ToolkitServer
+from test_functions import make_store, make_workbook_store
+
+
+@pytest.fixture
+def server(request):
+    store = make_store()
+    workbook = make_workbook_store()
+    store.replace(**{name: workbook.get(name) for name in ("bd_filters", "stock", "itens_prices")})
+    instance = ToolkitServer(("127.0.0.1", 0), store, **getattr(request, "param", {"workers": 4}))
+    thread = threading.Thread(target=instance.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield instance
+    instance.shutdown()
+    instance.server_close()
+
+
+def post(server, path, payload):
+    request = urllib.request.Request(server.url + path, data=json.dumps(payload).encode("utf-8"), method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def test_text_endpoints_and_errors(server):
+    assert post(server, "/orders", {"text": "OS 62112345 e 62199999"}) == (200, {"orders": ["62112345", "62199999"]})
+    status, body = post(server, "/work_logs", {
+        "service_order": "62112345", "interval": "1-2", "date": "01/01/2025", "start": "08:00", "end": "08:20",
+    })
+    assert status == 200 and body["logs"].count("\n") == 2
+    assert post(server, "/work_logs", {"service_order": "62112345"}) == (400, {"error": "Campo obrigatório ausente: interval"})
+    assert post(server, "/nothing", {})[0] == 404
+    with urllib.request.urlopen(server.url + "/health", timeout=10) as response:
+        assert json.load(response)["status"] == "ok"
+
+
+def test_plan_endpoint_and_remote_backend(server):
+    status, plan = post(server, "/plan", {"os_number": "62100001"})
+    assert status == 200
+    assert (plan["equipment"], plan["plans"]) == ("TRATOR", ["250", "500"])
+    assert (plan["tire_service"], plan["general_service"]) == ([1], [2])
+    assert plan["tasks"]["columns"][0] == "no_seq"
+
+    backend = RemoteBackend(server.url)
+    assert backend.auto_work_log_sequences("62100001", "tire_service") == [1]
+    with pytest.raises(ValueError, match="não encontrada"):
+        backend.auto_work_log_sequences("62199999")
+    assert backend.get_equipment_items(10)["Cod. Sap"].tolist() == [1, 3]
+    with pytest.raises(ValueError, match="frota válida"):
+        backend.get_equipment_items(99)
+
+
+def test_remote_batch_and_concurrent_requests(server, tmp_path):
+    backend = RemoteBackend(server.url)
+    orders = [BatchOrder(1, "62100001", "01/01/2025", "08:00", "09:00", ""), BatchOrder(2, "62199999", "01/01/2025", "08:00", "09:00", "")]
+    written, errors = backend.write_batch_work_logs(orders, str(tmp_path / "out.txt"))
+    assert written == 1 and errors == [(orders[1], "Ordem de serviço não encontrada!")]
+    assert (tmp_path / "out.txt").read_text(encoding="utf-8").startswith("62100001")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: backend.auto_work_log_sequences("62100002"), range(40)))
+    assert results == [[1]] * 40
+
+
+def test_unreachable_server_is_a_value_error():
+    with pytest.raises(ValueError, match="indisponível"):
+        RemoteBackend("http://127.0.0.1:9", timeout=1).auto_work_log_sequences("62100001")
+
+
+@pytest.mark.parametrize("server", [{"workers": 1, "idle_timeout": 0.2}], indirect=True)
+def test_idle_connections_and_bad_lengths_release_the_worker(server):
+    # A client that connects and never sends anything holds the only worker until it times out.
+    with socket.create_connection(server.server_address[:2]):
+        assert post(server, "/orders", {"text": "62112345"}) == (200, {"orders": ["62112345"]})
+
+    for length in ["-5", "abc"]:
+        connection = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+        connection.putrequest("POST", "/orders")
+        connection.putheader("Content-Length", length)
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 400 and "Content-Length" in json.load(response)["error"]
+        connection.close()
@@ -0,0 +1,97 @@
+import os
+import pandas as pd
+import pytest
+from snapshot import SNAPSHOT_DIR, load_csv, load_snapshot, clear_snapshots
+
+
+def write_csv(path, rows):
+    path.write_text("O.S;MODELO;PLANO\n" + "".join(f"{r};M{r};1/2\n" for r in rows), encoding="latin1")
+
+
+def test_snapshot_is_reused_until_source_changes(tmp_path):
+    source = tmp_path / "os.csv"
+    snapshot_dir = str(tmp_path / "snap")
+    write_csv(source, [62100001, 62100002])
+    calls = []
+
+    def reader():
+        calls.append(1)
+        return pd.read_csv(source, sep=";", encoding="latin1")
+
+    first = load_snapshot(str(source), reader, "os", snapshot_dir)
+    second = load_snapshot(str(source), reader, "os", snapshot_dir)
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+    write_csv(source, [62100001, 62100002, 62100003])
+    third = load_snapshot(str(source), reader, "os", snapshot_dir)
+    assert len(calls) == 2
+    assert len(third) == 3
+
+
+def test_snapshot_survives_touch_with_same_content(tmp_path):
+    source = tmp_path / "os.csv"
+    snapshot_dir = str(tmp_path / "snap")
+    write_csv(source, [62100001])
+    calls = []
+
+    def reader():
+        calls.append(1)
+        return pd.read_csv(source, sep=";")
+
+    load_snapshot(str(source), reader, "os", snapshot_dir)
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+    load_snapshot(str(source), reader, "os", snapshot_dir)
+    assert len(calls) == 1
+
+
+def test_refresh_and_clear(tmp_path):
+    source = tmp_path / "os.csv"
+    snapshot_dir = str(tmp_path / "snap")
+    write_csv(source, [62100001])
+    df = load_csv(str(source), snapshot_dir=snapshot_dir, sep=";")
+    refreshed = load_csv(str(source), snapshot_dir=snapshot_dir, refresh=True, sep=";")
+    pd.testing.assert_frame_equal(df, refreshed)
+    assert clear_snapshots(snapshot_dir) == 2
+
+
+def test_snapshots_default_to_the_source_directory(tmp_path, monkeypatch):
+    data_dir, other = tmp_path / "data", tmp_path / "other"
+    data_dir.mkdir()
+    other.mkdir()
+    monkeypatch.chdir(other)
+    write_csv(data_dir / "os.csv", [62100001])
+    load_csv(str(data_dir / "os.csv"), sep=";")
+    assert clear_snapshots(str(data_dir / SNAPSHOT_DIR)) == 2
+    assert os.listdir(other) == []
+
+
+def test_unreadable_snapshot_is_rebuilt(tmp_path):
+    source = tmp_path / "os.csv"
+    snapshot_dir = tmp_path / "snap"
+    write_csv(source, [62100001])
+    load_csv(str(source), snapshot_dir=str(snapshot_dir), sep=";")
+    for name in os.listdir(snapshot_dir):
+        if not name.endswith(".json"):
+            (snapshot_dir / name).write_bytes(b"\x80\x05truncated")
+
+    assert load_csv(str(source), snapshot_dir=str(snapshot_dir), sep=";")["O.S"].tolist() == [62100001]
+    assert not [name for name in os.listdir(snapshot_dir) if name.endswith(".tmp")]
+
+
+def test_feather_snapshot_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    source = tmp_path / "os.csv"
+    snapshot_dir = tmp_path / "snap"
+    write_csv(source, [62100001, 62100002])
+
+    def reader():
+        return pd.read_csv(source, sep=";", dtype={"MODELO": "category"})
+
+    first = load_snapshot(str(source), reader, "os", str(snapshot_dir))
+    assert any(name.endswith(".feather") for name in os.listdir(snapshot_dir))
+
+    second = load_snapshot(str(source), lambda: pytest.fail("should read the snapshot"), "os", str(snapshot_dir))
+    pd.testing.assert_frame_equal(first, second)
+    assert isinstance(second["MODELO"].dtype, pd.CategoricalDtype)
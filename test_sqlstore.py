@@ -0,0 +1,62 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from backend import DatabaseBackend, get_backend
+from datastore import DataStore
+from functions import fetch_plans, get_equipment_and_plan, get_equipment_items, import_database
+from sqlstore import SQLiteStore, write_database
+from test_functions import make_store, make_workbook_store
+
+
+@pytest.fixture
+def stores(tmp_path):
+    orders, workbook = make_store(), make_workbook_store()
+    store = DataStore(
+        os=orders.os, matrix=orders.matrix,
+        bd_filters=workbook.bd_filters, stock=workbook.stock, itens_prices=workbook.itens_prices,
+    )
+    path = str(tmp_path / "toolkit.db")
+    counts = import_database(path, store)
+    assert counts["os_index"] == 2 and counts["fleet_items"] == 3
+    return store, SQLiteStore(path)
+
+
+def test_database_queries_return_the_same_frames(stores):
+    store, database = stores
+    for order in ["62100001", " 62100002 ", "62199999"]:
+        assert get_equipment_and_plan(order, database) == get_equipment_and_plan(order, store)
+    for equipment, plans in [("TRATOR", ["250", "500"]), ("COLHEDORA", ["365"]), ("TRATOR", ["999"])]:
+        pd.testing.assert_frame_equal(fetch_plans(equipment, plans, database), fetch_plans(equipment, plans, store))
+    for fleet in [10, 20]:
+        pd.testing.assert_frame_equal(get_equipment_items(fleet, database), get_equipment_items(fleet, store))
+    with pytest.raises(ValueError, match="frota válida"):
+        get_equipment_items(99, database)
+
+
+def test_database_backend(stores, tmp_path):
+    backend = get_backend(database=stores[1].path)
+    assert isinstance(backend, DatabaseBackend)
+    assert backend.auto_work_log_sequences("62100001", "tire_service") == [1]
+    with pytest.raises(ValueError, match="não encontrada"):
+        backend.auto_work_log_sequences("62199999")
+
+    # A missing file is only reported by the first query.
+    with pytest.raises(FileNotFoundError):
+        DatabaseBackend(str(tmp_path / "missing.db")).get_equipment_items(10)
+
+
+def test_outdated_database_is_rejected(tmp_path):
+    path = str(tmp_path / "old.db")
+    sqlite3.connect(path).close()
+    with pytest.raises(ValueError, match="importe os dados novamente"):
+        SQLiteStore(path)
+
+
+def test_failed_import_keeps_the_previous_file(stores, tmp_path):
+    path = stores[1].path
+    with pytest.raises(pd.errors.DatabaseError):
+        write_database(path, {"bad": pd.DataFrame({"a": [{"not": "storable"}]})}, {})
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["toolkit.db"]
+    assert get_equipment_and_plan("62100001", SQLiteStore(path)) == ("TRATOR", ["250", "500"])
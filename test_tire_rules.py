@@ -0,0 +1,61 @@
+from tire_rules import MANUAL_RULES, AUTO_RULES, Rule, RuleSet, classification_cache_info
+
+
+def test_scan_sees_overlapping_and_nested_phrases():
+    assert MANUAL_RULES.scan("PNEUMÁTICO") == {"pneu", "pneumatic"}
+    assert MANUAL_RULES.scan("Verificar a integridade (trincas) dos pneus") == {
+        "specific_integrity", "generic_integrity", "pneu",
+    }
+    # "pneus" ends where "suspensões" begins; both must be found.
+    assert MANUAL_RULES.scan("pneususpensões") == {"pneu", "general_exclusion"}
+    assert MANUAL_RULES.scan("Trocar óleo") == frozenset()
+
+
+def test_manual_rules_precedence():
+    assert MANUAL_RULES.classify("Serviço de borracharia", "Motor")
+    assert not MANUAL_RULES.classify("Verificar sistema pneumático do pneu", "Pneu")
+    assert MANUAL_RULES.classify("Calibrar pneus", " Roda ")
+    assert not MANUAL_RULES.classify("Calibrar pneus", "Motor")
+    assert not MANUAL_RULES.classify("Verificar a integridade das suspensões", "Roda")
+    assert MANUAL_RULES.classify("Verificar a integridade (trincas) das suspensões", "Roda")
+    assert MANUAL_RULES.classify("Trocar válvula", "Pneu")
+
+
+def test_auto_rules():
+    assert AUTO_RULES.classify("Trocar válvula", "Roda")
+    assert not AUTO_RULES.classify("Verificar integridade", "Roda")
+    assert AUTO_RULES.classify("Verificar integridade (trincas, desgastes acentuados, danos críticos) "
+                               "dos espelhos da roda", "Chassi")
+    assert not AUTO_RULES.classify("Borracharia: verificar a integridade", "Chassi")
+    assert not AUTO_RULES.classify("Trocar óleo", "Motor")
+
+
+def test_classify_many_treats_missing_values_as_empty():
+    rules = RuleSet("test", {"x": ("abc",)}, [Rule(True, any_of=frozenset({"x"}))], default=False)
+    assert rules.classify_many(["ABC", float("nan"), "abc", "zz"], ["", "", None, ""]) == [True, False, True, False]
+
+
+def test_classify_many_shares_verdicts_across_calls():
+    # A phrase of its own keeps the verdicts of the other tests' rule sets out of the counts.
+    rules = RuleSet("test-cache", {"x": ("abc", "cache")}, [Rule(True, any_of=frozenset({"x"}))], default=False)
+    before = classification_cache_info()
+    assert rules.classify_many(["abc", " abc ", "abc", "zz"], ["Roda", "Roda ", "Roda", ""]) == [True, True, True, False]
+    after = classification_cache_info()
+    # Only the two distinct normalized pairs are classified.
+    assert after["misses"] - before["misses"] == 2
+    assert rules.classify_many(["zz", "abc"], ["", "Roda"]) == [False, True]
+    assert classification_cache_info()["hits"] - after["hits"] == 2
+
+
+def test_classify_many_keys_verdicts_by_rules_not_name():
+    tire = RuleSet("same", {"x": ("abc",)}, [Rule(True, any_of=frozenset({"x"}))], default=False)
+    general = RuleSet("same", {"x": ("abc",)}, [Rule(False, any_of=frozenset({"x"}))], default=False)
+    assert tire.classify_many(["abc"], [""]) == [True]
+    assert general.classify_many(["abc"], [""]) == [general.classify("abc", "")] == [False]
+
+
+def test_classify_many_can_bypass_the_shared_cache():
+    rules = RuleSet("test-bulk", {"x": ("abc", "bulk")}, [Rule(True, any_of=frozenset({"x"}))], default=False)
+    before = classification_cache_info()
+    assert rules.classify_many(["abc", "zz", "abc"], ["", "", ""], shared_cache=False) == [True, False, True]
+    assert classification_cache_info() == before
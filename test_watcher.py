@@ -0,0 +1,96 @@
+import os
+
+import pandas as pd
+
+from datastore import DataStore
+from functions import fetch_plans, get_equipment_and_plan
+from watcher import SourceWatcher
+
+
+def write_sources(directory, os_lines, matrix_rows):
+    (directory / "os.csv").write_bytes(("O.S;MODELO;PLANO\n" + "".join(os_lines)).encode("latin1"))
+    pd.DataFrame(matrix_rows).to_csv(directory / "matriz.csv", sep=";", encoding="latin1", index=False)
+
+
+def matrix_row(task, seq=1):
+    return {
+        "Chave": "TRATOR250N", "no_ref_prog": 250, "no_seq": seq, "de_operacao": "Trocar", "de_tarefa": task,
+        "de_sist_veic": "Motor", "de_sub_sist": "Motor", "de_compo": task, "de_tp_manut": "PREVENTIVA",
+        "fg_garantia": "N",
+    }
+
+
+def test_appended_orders_are_merged_into_frame_and_index(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_sources(tmp_path, ["62100001;TRATOR;250\n"], [matrix_row("Trocar óleo")])
+    store = DataStore(str(tmp_path))
+    changes = []
+    watcher = SourceWatcher(store, on_change=changes.append)
+
+    assert get_equipment_and_plan("62100001", store) == ("TRATOR", ["250"])
+    os_index = store.peek("os_index")
+    assert watcher.check() == []
+
+    # A new order and half of the next one: only the complete line is merged.
+    with open(tmp_path / "os.csv", "ab") as file:
+        file.write("62100002;COLHEDORA;500/750\n62100003;TRA".encode("latin1"))
+    assert watcher.check() == ["os"]
+    assert len(store.os) == 2
+    assert isinstance(store.os["MODELO"].dtype, pd.CategoricalDtype)
+    assert get_equipment_and_plan("62100002", store) == ("COLHEDORA", ["500", "750"])
+    assert store.peek("os_index") is os_index
+    assert get_equipment_and_plan("62100003", store) == (False, False)
+
+    with open(tmp_path / "os.csv", "ab") as file:
+        file.write("TOR;1000\n".encode("latin1"))
+    assert watcher.check() == ["os"]
+    assert get_equipment_and_plan("62100003", store) == ("TRATOR", ["1000"])
+    assert changes == [["os"], ["os"]]
+
+
+def test_rewritten_sources_are_reloaded_and_swapped(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_sources(tmp_path, ["62100001;TRATOR;250\n", "62100002;TRATOR;250\n"], [matrix_row("Trocar óleo")])
+    store = DataStore(str(tmp_path))
+    watcher = SourceWatcher(store)
+    assert fetch_plans("TRATOR", ["250"], store)["de_tarefa"].tolist() == ["Trocar óleo"]
+    assert get_equipment_and_plan("62100002", store) == ("TRATOR", ["250"])
+    watcher.check()
+
+    # The matrix is replaced and os.csv loses a line: both are read again from scratch.
+    write_sources(tmp_path, ["62100001;COLHEDORA;500\n"], [matrix_row("Trocar óleo"), matrix_row("Trocar filtro", 2)])
+    stat = os.stat(tmp_path / "matriz.csv")
+    os.utime(tmp_path / "matriz.csv", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert sorted(watcher.check()) == ["matrix", "os"]
+    assert fetch_plans("TRATOR", ["250"], store)["de_tarefa"].tolist() == ["Trocar óleo", "Trocar filtro"]
+    assert get_equipment_and_plan("62100001", store) == ("COLHEDORA", ["500"])
+    assert get_equipment_and_plan("62100002", store) == (False, False)
+
+
+def test_orders_appended_before_the_first_poll_are_merged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_sources(tmp_path, ["62100001;TRATOR;250\n"], [matrix_row("Trocar óleo")])
+    store = DataStore(str(tmp_path))
+    watcher = SourceWatcher(store)
+    assert get_equipment_and_plan("62100001", store) == ("TRATOR", ["250"])
+
+    with open(tmp_path / "os.csv", "ab") as file:
+        file.write("62100002;COLHEDORA;500\n".encode("latin1"))
+    assert watcher.check() == ["os"]
+    assert get_equipment_and_plan("62100002", store) == ("COLHEDORA", ["500"])
+    assert watcher.check() == []
+
+
+def test_half_written_last_line_is_left_to_the_watcher(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_sources(tmp_path, ["62100001;TRATOR;250\n", "62100002;COLH"], [matrix_row("Trocar óleo")])
+    store = DataStore(str(tmp_path))
+    watcher = SourceWatcher(store)
+    assert store.os["O.S"].tolist() == [62100001]
+    assert watcher.check() == []
+
+    with open(tmp_path / "os.csv", "ab") as file:
+        file.write("EDORA;500\n".encode("latin1"))
+    assert watcher.check() == ["os"]
+    assert store.os["O.S"].tolist() == [62100001, 62100002]
+    assert get_equipment_and_plan("62100002", store) == ("COLHEDORA", ["500"])
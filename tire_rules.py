@@ -0,0 +1,277 @@
+#
+# tire_rules.py
+#
+# Description:
+# Declarative rules that decide whether a maintenance task is a tire service
+# ("borracharia") or a general service, and the engine that evaluates them.
+#
+# Each rule set declares named keyword flags (literal phrases, matched case-insensitively)
+# and an ordered list of rules. All phrases are compiled into a single prefix-tree regex,
+# so a task description is scanned once; the first rule whose conditions hold gives the
+# verdict.
+#
+
+import hashlib
+import re
+from typing import Iterable, NamedTuple
+
+from cache import LRUCache
+
+# Components that identify tire work, compared after stripping whitespace.
+TIRE_COMPONENTS = frozenset({"Roda", "Pneu"})
+
+# Matrix column holding the precomputed `AUTO_RULES` verdict of each row.
+TIRE_SERVICE_COLUMN = "fg_borracharia"
+
+# Distinct (rule set signature, description, component) verdicts kept across calls. Task texts come
+# from a fixed catalog, so a few thousand entries cover a whole day of orders.
+CLASSIFICATION_CACHE_SIZE = 8192
+
+_classification_cache = LRUCache(CLASSIFICATION_CACHE_SIZE)
+
+
+def classification_cache_info() -> dict:
+    """
+    Returns the hit/miss statistics of the shared classification cache.
+
+    Returns:
+        dict: The keys "hits", "misses", "size" and "maxsize".
+    """
+    return _classification_cache.info()
+
+
+def _normalize(text: object) -> str:
+    # Missing values (NaN) never match a keyword, like `str.contains(..., na=False)`. Keywords
+    # never start or end with whitespace, so stripping cannot change a verdict.
+    return text.strip() if isinstance(text, str) else ""
+
+
+class Rule(NamedTuple):
+    """
+    One classification rule. All of its conditions must hold for the rule to apply.
+
+    Attributes:
+        verdict (bool): True for tire service, False for general service.
+        any_of (frozenset): Description flags of which at least one must be present.
+                            Empty means no requirement.
+        none_of (frozenset): Description flags that must all be absent.
+        component (bool | None): True requires a tire component, False requires any
+                                 other component, None ignores the component.
+        component_any_of (frozenset): Flags of which at least one must be present in the
+                                      component text. Empty means no requirement.
+    """
+    verdict: bool
+    any_of: frozenset = frozenset()
+    none_of: frozenset = frozenset()
+    component: bool | None = None
+    component_any_of: frozenset = frozenset()
+
+
+class RuleSet:
+    """
+    A compiled set of keyword flags and precedence-ordered rules.
+
+    Attributes:
+        name (str): A short name used in reports.
+        rules (tuple[Rule, ...]): The rules, in order of precedence.
+        default (bool): The verdict when no rule applies.
+        signature (str): A short, stable hash of the keywords and rules. Cached and stored
+                         verdicts (e.g. the matrix flag column in a snapshot) are keyed by
+                         it, so editing a rule invalidates them.
+    """
+    def __init__(self, name: str, keywords: dict[str, tuple[str, ...]], rules: list[Rule], default: bool):
+        """
+        Compiles a rule set.
+
+        Args:
+            name (str): A short name for the rule set.
+            keywords (dict[str, tuple[str, ...]]): Flag name -> literal phrases raising it.
+            rules (list[Rule]): The rules, in order of precedence.
+            default (bool): The verdict when no rule applies.
+        """
+        self.name = name
+        self.keywords = keywords
+        self.rules = tuple(rules)
+        self.default = default
+        self.signature = self._signature()
+
+        # Phrase (lowercase) -> flags it raises directly.
+        phrase_flags: dict[str, set] = {}
+        for flag, flag_phrases in keywords.items():
+            for phrase in flag_phrases:
+                phrase_flags.setdefault(phrase.lower(), set()).add(flag)
+
+        # The phrases are merged into a prefix tree and emitted as one regex, so at each
+        # position the engine follows a single branch instead of trying every phrase. An
+        # empty named group marks the end of each phrase; since the deepest match wins and
+        # every shorter phrase matching at that position is one of its prefixes, each marker
+        # carries the flags of all phrases that end on its path.
+        trie: dict = {}
+        for phrase in phrase_flags:
+            node = trie
+            for char in phrase:
+                node = node.setdefault(char, {})
+            node[""] = phrase
+
+        self._group_flags: dict[str, frozenset] = {}
+
+        def emit(node: dict) -> str:
+            branches = [re.escape(char) + emit(child) for char, child in node.items() if char]
+            if "" in node:
+                group = f"p{len(self._group_flags)}"
+                self._group_flags[group] = frozenset().union(
+                    *(flags for phrase, flags in phrase_flags.items() if node[""].startswith(phrase))
+                )
+                branches.append(f"(?P<{group}>)")
+            return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+        first_chars = "".join(sorted(trie))
+        # The leading character class lets the engine skip most positions cheaply; the
+        # zero-width lookahead then tries the tree at every remaining position, so
+        # overlapping phrases are all seen.
+        self._pattern = re.compile(f"(?=[{re.escape(first_chars)}])(?={emit(trie)})", re.IGNORECASE)
+        self._uses_component_text = any(rule.component_any_of for rule in self.rules)
+
+    def _signature(self) -> str:
+        canonical = (
+            sorted((flag, sorted(phrases)) for flag, phrases in self.keywords.items()),
+            [
+                (rule.verdict, sorted(rule.any_of), sorted(rule.none_of), rule.component, sorted(rule.component_any_of))
+                for rule in self.rules
+            ],
+            self.default,
+        )
+        return hashlib.sha1(repr(canonical).encode("utf-8")).hexdigest()[:12]
+
+    def scan(self, text: str) -> frozenset:
+        """
+        Returns the flags raised by a text, scanning it once.
+
+        Args:
+            text (str): The text to scan.
+
+        Returns:
+            frozenset: The names of the flags whose phrases occur in the text.
+        """
+        flags = set()
+        for match in self._pattern.finditer(text):
+            flags |= self._group_flags[match.lastgroup]
+        return frozenset(flags)
+
+    def classify(self, description: str, component: str) -> bool:
+        """
+        Classifies one task.
+
+        Args:
+            description (str): The task description.
+            component (str): The task component (or sub-system).
+
+        Returns:
+            bool: True for a tire service, False otherwise.
+        """
+        flags = self.scan(description)
+        component_flags = self.scan(component) if self._uses_component_text else frozenset()
+        is_tire_component = component.strip() in TIRE_COMPONENTS
+
+        for rule in self.rules:
+            if rule.any_of and not (flags & rule.any_of):
+                continue
+            if flags & rule.none_of:
+                continue
+            if rule.component is not None and rule.component != is_tire_component:
+                continue
+            if rule.component_any_of and not (component_flags & rule.component_any_of):
+                continue
+            return rule.verdict
+        return self.default
+
+    def classify_many(self, descriptions: Iterable[str], components: Iterable[str],
+                      shared_cache: bool = True) -> list[bool]:
+        """
+        Classifies many tasks, scanning each distinct (description, component) pair once.
+
+        Verdicts are shared across calls through a bounded LRU cache, so the tasks that
+        repeat in every order are only classified the first time they are seen.
+
+        Args:
+            descriptions (Iterable[str]): The task descriptions.
+            components (Iterable[str]): The matching components, in the same order.
+            shared_cache (bool, optional): Whether to use the shared cache. One-off passes
+                                           over a whole table (e.g. the matrix flag) turn it
+                                           off so they do not evict the per-order entries.
+                                           Defaults to True.
+
+        Returns:
+            list[bool]: One verdict per task.
+        """
+        keys = [(_normalize(d), _normalize(c)) for d, c in zip(descriptions, components)]
+
+        verdicts = {}
+        for key in dict.fromkeys(keys):
+            if shared_cache:
+                verdicts[key] = _classification_cache.get_or_compute(
+                    (self.signature, *key), lambda key=key: self.classify(*key)
+                )
+            else:
+                verdicts[key] = self.classify(*key)
+        return [verdicts[key] for key in keys]
+
+
+# --- Rules for task lists pasted from the external software (`split_tire_service`) ---
+
+MANUAL_RULES = RuleSet(
+    "manual",
+    keywords={
+        "borracharia": ("borracharia",),
+        "specific_integrity": ("verificar a integridade (trincas",),
+        "pneu": ("pneus", "pneu", "verificar torque das porcas das rodas"),
+        "pneumatic": ("pneum",),
+        "general_exclusion": (
+            "suspensões", "Sistema de freio", "Verificar guias",
+            "Verificar porca e parafuso das rodas", "Quando houver espaçador, retirar rodas",
+        ),
+        "generic_integrity": ("Verificar a integridade",),
+    },
+    rules=[
+        # "pneum" (pneumatic) is never a tire service.
+        Rule(False, any_of=frozenset({"pneumatic"})),
+        # "borracharia" is always a tire service.
+        Rule(True, any_of=frozenset({"borracharia"})),
+        # Everything else must be a tire component.
+        Rule(False, component=False),
+        # Tire keywords and the specific "(trincas" integrity check include the task...
+        Rule(True, any_of=frozenset({"specific_integrity", "pneu"})),
+        # ...while other specific tasks and generic integrity checks exclude it.
+        Rule(False, any_of=frozenset({"general_exclusion", "generic_integrity"})),
+    ],
+    # A tire component that no rule excluded is a tire service.
+    default=True,
+)
+
+
+# --- Rules for tasks fetched from the maintenance matrix (`split_auto_tire_service`) ---
+
+_WHEEL_MIRROR_CHECKS = (
+    "Verificar a integridade (trincas, desgastes acentuados, danos críticos) dos espelhos da roda",
+    "Verificar integridade (trincas, desgastes acentuados, danos críticos) dos espelhos da roda",
+)
+
+AUTO_RULES = RuleSet(
+    "auto",
+    keywords={
+        "wheel_mirror": _WHEEL_MIRROR_CHECKS,
+        "integrity": ("Verificar integridade", "Verificar a integridade"),
+        "spacer": ("Quando houver espaçador, retirar rodas",),
+        "pneu": ("pneus", "pneu"),
+        "pneumatic": ("pneum",),
+        "borracharia": ("borracharia",),
+    },
+    rules=[
+        Rule(True, component_any_of=frozenset({"wheel_mirror"})),
+        Rule(True, any_of=frozenset({"wheel_mirror"})),
+        Rule(True, any_of=frozenset({"pneu"}), none_of=frozenset({"pneumatic"})),
+        Rule(True, component=True, none_of=frozenset({"integrity", "spacer"})),
+        Rule(True, any_of=frozenset({"borracharia"}), none_of=frozenset({"integrity"})),
+    ],
+    default=False,
+)
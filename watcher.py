@@ -0,0 +1,164 @@
+#
+# watcher.py
+#
+# Description:
+# Keeps a DataStore in step with its source files while the application runs. The files
+# are polled (a `stat` call each, no extra dependency). When os.csv only grew, just the
+# new lines are parsed and appended to the loaded frame and its O.S index; any other
+# change reloads the affected datasets in the background and swaps them in at once, so
+# queries running meanwhile keep using the previous, complete data.
+#
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Callable, NamedTuple
+
+from datastore import MATRIX_FILE, OS_FILE, SOURCE_OFFSET, WORKBOOK_FILE, DataStore, read_appended_rows
+
+# Source file -> datasets read from it.
+WATCHED_FILES = {
+    MATRIX_FILE: ("matrix",),
+    OS_FILE: ("os",),
+    WORKBOOK_FILE: ("bd_filters", "stock", "itens_prices"),
+}
+
+# Sources that only ever grow at the end, as new lines.
+APPEND_ONLY_FILES = {OS_FILE}
+
+# Bytes before the parsed offset that must be unchanged for a growth to count as an append.
+_TAIL_CHECK_SIZE = 4096
+
+
+class _FileState(NamedTuple):
+    size: int
+    mtime_ns: int
+    offset: int
+    tail: bytes
+
+
+class SourceWatcher:
+    """
+    Polls a store's source files and applies their changes to the store.
+
+    Attributes:
+        store (DataStore): The store kept up to date.
+        interval (float): Seconds between two polls of the background thread.
+    """
+    def __init__(self, store: DataStore, interval: float = 2.0,
+                 on_change: Callable[[list[str]], None] | None = None):
+        """
+        Initializes the watcher. Nothing is polled until `check` or `start` is called.
+
+        Args:
+            store (DataStore): The store to keep up to date.
+            interval (float, optional): Seconds between polls. Defaults to 2.
+            on_change (Callable[[list[str]], None], optional): Called with the names of the
+                datasets that changed, on the watcher's thread.
+        """
+        self.store = store
+        self.interval = interval
+        self.on_change = on_change
+        self._states: dict[str, _FileState] = {}
+        self._check_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _path(self, file_name: str) -> str:
+        return os.path.join(self.store.data_dir, file_name)
+
+    def _state(self, path: str, offset: int) -> _FileState:
+        stat = os.stat(path)
+        with open(path, "rb") as file:
+            file.seek(max(0, offset - _TAIL_CHECK_SIZE))
+            tail = file.read(min(offset, _TAIL_CHECK_SIZE))
+        return _FileState(stat.st_size, stat.st_mtime_ns, offset, tail)
+
+    def _loaded_offset(self, file_name: str, name: str, size: int) -> int:
+        """Returns the bytes of a source the loaded dataset holds, or `size` if unknown."""
+        offset = self.store.get(name).attrs.get(SOURCE_OFFSET) if file_name in APPEND_ONLY_FILES else None
+        return offset if offset is not None and offset <= size else size
+
+    def _is_append(self, path: str, state: _FileState, size: int) -> bool:
+        if size <= state.offset:
+            return False
+        with open(path, "rb") as file:
+            file.seek(state.offset - len(state.tail))
+            return file.read(len(state.tail)) == state.tail
+
+    def check(self) -> list[str]:
+        """
+        Polls every source once and applies the changes found.
+
+        A source is only tracked once one of its datasets is loaded; datasets that were
+        never loaded will read the current file anyway. A reload that fails (e.g. a file
+        caught halfway through a copy) keeps the current data and is retried on the next poll.
+
+        Returns:
+            list[str]: The names of the datasets that were updated.
+        """
+        with self._check_lock:
+            changed = self._check_files()
+        if changed and self.on_change:
+            self.on_change(changed)
+        return changed
+
+    def _check_files(self) -> list[str]:
+        changed = []
+        for file_name, names in WATCHED_FILES.items():
+            loaded = [name for name in names if self.store.is_loaded(name)]
+            path = self._path(file_name)
+            try:
+                stat = os.stat(path)
+                state = self._states.get(file_name)
+                if not loaded:
+                    self._states.pop(file_name, None)
+                    continue
+                if state is None:
+                    # First poll since the data was loaded: continue from the bytes the loader
+                    # parsed, so lines appended since then are merged now.
+                    state = self._state(path, self._loaded_offset(file_name, names[0], stat.st_size))
+                    self._states[file_name] = state
+                    if state.offset == stat.st_size:
+                        continue
+                # A last line that was incomplete when parsed keeps the offset behind the size.
+                if (stat.st_size, stat.st_mtime_ns) == (state.size, state.mtime_ns) and state.offset == stat.st_size:
+                    continue
+
+                if file_name in APPEND_ONLY_FILES and self._is_append(path, state, stat.st_size):
+                    rows, offset = read_appended_rows(path, state.offset, list(self.store.get(names[0]).columns))
+                    if len(rows):
+                        self.store.append(names[0], rows)
+                        changed.append(names[0])
+                    self._states[file_name] = self._state(path, offset)
+                else:
+                    # Load every dataset of the file before swapping any of them in.
+                    frames = {name: self.store.reload(name) for name in loaded}
+                    self.store.replace(**frames)
+                    self._states[file_name] = self._state(path, self._loaded_offset(file_name, names[0], os.path.getsize(path)))
+                    changed.extend(loaded)
+            except (OSError, ValueError):
+                continue
+        return changed
+
+    def start(self) -> threading.Thread:
+        """
+        Starts polling on a daemon thread.
+
+        Returns:
+            threading.Thread: The polling thread.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="source-watcher", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        """Stops the polling thread after its current poll."""
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()